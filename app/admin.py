@@ -1,9 +1,70 @@
-from django.contrib import admin
+from django import forms
+from django.contrib import admin, messages
+from django.shortcuts import redirect, render
+from django.urls import path
+
+from .importers import InstitutionImporter, JobImporter, read_rows
 from .models import User, Institution, Job, JobShortlist, InstitutionApproval
+
+
+# ----------------------------
+# CSV / Excel import
+# ----------------------------
+class ImportFileForm(forms.Form):
+    file = forms.FileField(help_text="CSV or .xlsx with one record per row and a header row.")
+    dry_run = forms.BooleanField(required=False, help_text="Only validate; write nothing.")
+
+
+class ImportMixin:
+    """
+    Adds an "Import" button to the changelist that streams an uploaded file
+    through the matching importer (see app/importers.py).
+    """
+    importer_class = None
+    change_list_template = "admin/import_change_list.html"
+    max_messages = 20
+
+    def get_urls(self):
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            path("import/", self.admin_site.admin_view(self.import_view), name="%s_%s_import" % info),
+        ] + super().get_urls()
+
+    def import_view(self, request):
+        if not self.has_add_permission(request):
+            return redirect("admin:index")
+        form = ImportFileForm(request.POST or None, request.FILES or None)
+        if request.method == "POST" and form.is_valid():
+            upload = form.cleaned_data["file"]
+            importer = self.importer_class(dry_run=form.cleaned_data["dry_run"])
+            result = importer.run(read_rows(upload.file, upload.name))
+            for line, message in result.errors[:self.max_messages]:
+                messages.error(request, f"Line {line}: {message}")
+            if result.failed > self.max_messages:
+                messages.error(request, f"... and {result.failed - self.max_messages} more rejected row(s).")
+            verb = "Validated" if importer.dry_run else "Imported"
+            messages.success(request, f"{verb} {result.created} row(s); {result.failed} rejected.")
+            return redirect(request.path)
+        context = {
+            **self.admin_site.each_context(request),
+            "opts": self.model._meta,
+            "form": form,
+            "title": f"Import {self.model._meta.verbose_name_plural}",
+        }
+        return render(request, "admin/import_records.html", context)
+
+
+@admin.register(Institution)
+class InstitutionAdmin(ImportMixin, admin.ModelAdmin):
+    importer_class = InstitutionImporter
+
+
+@admin.register(Job)
+class JobAdmin(ImportMixin, admin.ModelAdmin):
+    importer_class = JobImporter
+
+
 # Register your models here.
-# Register the Job model with the Django admin site to manage job listings through the admin interface.
 admin.site.register(User)
-admin.site.register(Institution)
-admin.site.register(Job)
 admin.site.register(JobShortlist)
 admin.site.register(InstitutionApproval)
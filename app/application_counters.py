@@ -0,0 +1,98 @@
+# application_counters.py
+
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, Optional, Tuple
+
+from django.db.models import Count, F
+
+from app.models import Job, JobApplication, User
+
+STATUSES = [status for status, _label in JobApplication.STATUS_CHOICES]
+
+
+def counter_field(status: str) -> str:
+    return f"applications_{status}"
+
+
+# ----------------------------
+# Write path
+# ----------------------------
+def adjust_counters(applicant_id: int, job_id: int, deltas: Dict[str, int]) -> None:
+    """
+    Apply per-status deltas to the applicant's and the job's counters with
+    F() expressions, so concurrent writers never overwrite each other.
+    """
+    updates = {
+        counter_field(status): F(counter_field(status)) + delta
+        for status, delta in deltas.items()
+        if delta and status in STATUSES
+    }
+    if not updates:
+        return
+    User.objects.filter(pk=applicant_id).update(**updates)
+    Job.objects.filter(pk=job_id).update(**updates)
+
+
+def status_changed(application: JobApplication, old_status: Optional[str]) -> None:
+    if old_status == application.status:
+        return
+    deltas = {application.status: 1}
+    if old_status is not None:
+        deltas[old_status] = -1
+    adjust_counters(application.applicant_id, application.job_id, deltas)
+
+
+def adjust_counters_bulk(moves: Iterable[Tuple[int, int, str, str]]) -> None:
+    """
+    Apply many (applicant_id, job_id, old_status, new_status) moves with one
+    UPDATE per model and distinct set of deltas, instead of two per move.
+    """
+    deltas = {User: defaultdict(Counter), Job: defaultdict(Counter)}
+    for applicant_id, job_id, old_status, new_status in moves:
+        if old_status == new_status:
+            continue
+        for model, pk in ((User, applicant_id), (Job, job_id)):
+            deltas[model][pk][new_status] += 1
+            deltas[model][pk][old_status] -= 1
+    for model, by_pk in deltas.items():
+        groups = defaultdict(list)
+        for pk, counts in by_pk.items():
+            groups[tuple(sorted((status, delta) for status, delta in counts.items() if delta))].append(pk)
+        for changes, pks in groups.items():
+            updates = {
+                counter_field(status): F(counter_field(status)) + delta
+                for status, delta in changes
+                if status in STATUSES
+            }
+            if updates:
+                model.objects.filter(pk__in=pks).update(**updates)
+
+
+# ----------------------------
+# Reconciliation
+# ----------------------------
+def reconcile_counters(user_model=User, job_model=Job, application_model=JobApplication, dry_run=False) -> Dict[str, int]:
+    """
+    Recompute every counter from JobApplication and fix rows that drifted.
+    Returns the number of corrected rows per model. Model arguments let data
+    migrations pass historical models.
+    """
+    fields = [counter_field(status) for status in STATUSES]
+    fixed = {}
+    for model, key in ((user_model, "applicant"), (job_model, "job")):
+        actual = {}
+        rows = application_model.objects.values(key, "status").annotate(count=Count("id")).order_by()
+        for row in rows:
+            actual.setdefault(row[key], {})[counter_field(row["status"])] = row["count"]
+
+        stale = []
+        for obj in model.objects.only("pk", *fields).iterator(chunk_size=2000):
+            expected = actual.get(obj.pk, {})
+            if any(getattr(obj, field) != expected.get(field, 0) for field in fields):
+                for field in fields:
+                    setattr(obj, field, expected.get(field, 0))
+                stale.append(obj)
+        if stale and not dry_run:
+            model.objects.bulk_update(stale, fields, batch_size=1000)
+        fixed[model.__name__] = len(stale)
+    return fixed
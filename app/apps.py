@@ -0,0 +1,31 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def ensure_search_backend(sender, using, **kwargs):
+    # Repair the full-text index after a migrate, but only when the schema
+    # it indexes is there: not after `migrate app 0004` or `migrate app zero`.
+    from django.db import connections
+    from django.db.migrations.recorder import MigrationRecorder
+    from app.search import install_search_backend
+
+    conn = connections[using]
+    if ("app", "0005_job_search") not in MigrationRecorder(conn).applied_migrations():
+        return
+    with conn.cursor() as cursor:
+        if "app_job" not in conn.introspection.table_names(cursor):
+            return
+        columns = {column.name for column in conn.introspection.get_table_description(cursor, "app_job")}
+    if "search_vector" in columns:
+        install_search_backend(conn)
+
+
+class AppConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'app'
+
+    def ready(self):
+        # Registers the signal handlers and the shared-cache system check.
+        from app import caching, signals  # noqa: F401
+
+        post_migrate.connect(ensure_search_backend, sender=self)
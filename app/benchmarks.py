@@ -0,0 +1,170 @@
+# benchmarks.py
+
+import platform
+import time
+from contextlib import ExitStack
+from typing import Callable, Dict, List, Optional
+
+import django
+from django.db import connection, connections
+from django.test import Client
+from django.urls import reverse
+from django.utils import timezone
+
+from app.metrics import RequestStats
+from app.models import Job, User
+
+BENCH_USERNAME = "bench-user"
+BENCH_PASSWORD = "bench-pass-12345"
+# A scenario regresses when its p95 latency grows by more than this
+# fraction over the baseline, or when it runs more queries per request.
+DEFAULT_TOLERANCE = 0.20
+
+
+# ----------------------------
+# Scenarios
+# ----------------------------
+# Each scenario issues one request per call and returns the response. They
+# run in this order, so `applied_jobs` sees the applications `apply` made.
+
+class BenchmarkContext:
+    def __init__(self, job_ids: List[int], password: str = BENCH_PASSWORD):
+        self.job_ids = job_ids
+        self.anonymous = Client()
+        self.user = User.objects.create_user(BENCH_USERNAME, password=password)
+        self.password = password
+        self.member = Client()
+        self.member.force_login(self.user)
+        self.applied = 0
+
+
+def _home(ctx: BenchmarkContext, i: int):
+    return ctx.anonymous.get(reverse("home"))
+
+
+def _jobs(ctx, i):
+    return ctx.anonymous.get(reverse("jobs"))
+
+
+def _job_detail(ctx, i):
+    return ctx.anonymous.get(reverse("job_detail", args=[ctx.job_ids[i % len(ctx.job_ids)]]))
+
+
+def _login(ctx, i):
+    return Client().post(reverse("login"), {"username": BENCH_USERNAME, "password": ctx.password})
+
+
+def _apply(ctx, i):
+    # Every request applies to a job not applied to yet; warm-up included.
+    job_id = ctx.job_ids[ctx.applied % len(ctx.job_ids)]
+    ctx.applied += 1
+    return ctx.member.post(reverse("apply_job", args=[job_id]))
+
+
+def _applied_jobs(ctx, i):
+    return ctx.member.get(reverse("applied_jobs"))
+
+
+SCENARIOS: Dict[str, Callable] = {
+    "home": _home,
+    "jobs": _jobs,
+    "job_detail": _job_detail,
+    "login": _login,
+    "apply": _apply,
+    "applied_jobs": _applied_jobs,
+}
+
+
+# ----------------------------
+# Measurement
+# ----------------------------
+def percentile(sorted_values: List[float], q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, round(q * len(sorted_values) + 0.5))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+
+def measure(scenario: Callable, ctx: BenchmarkContext, requests: int, warmup: int) -> Dict[str, float]:
+    for i in range(warmup):
+        scenario(ctx, i)
+    latencies, queries = [], []
+    started = time.perf_counter()
+    for i in range(warmup, warmup + requests):
+        stats = RequestStats()
+        with ExitStack() as stack:
+            for conn in connections.all():
+                stack.enter_context(conn.execute_wrapper(stats))
+            request_started = time.perf_counter()
+            response = scenario(ctx, i)
+            latencies.append((time.perf_counter() - request_started) * 1000)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{scenario.__name__} answered {response.status_code}")
+        queries.append(stats.queries)
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "requests": requests,
+        "throughput_rps": round(requests / elapsed, 1),
+        "mean_ms": round(sum(latencies) / len(latencies), 2),
+        "p50_ms": round(percentile(latencies, 0.50), 2),
+        "p95_ms": round(percentile(latencies, 0.95), 2),
+        "p99_ms": round(percentile(latencies, 0.99), 2),
+        "queries_mean": round(sum(queries) / len(queries), 2),
+        "queries_max": max(queries),
+    }
+
+
+def run(requests: int = 100, warmup: int = 5, scenarios: Optional[List[str]] = None) -> Dict:
+    """
+    Run the scenarios against the current database through the Django test
+    client. The caller is expected to roll back (apply and login write rows).
+    """
+    job_ids = list(
+        Job.objects.open().order_by("-timestamp", "-id").values_list("id", flat=True)[:requests + warmup]
+    )
+    if not job_ids:
+        raise ValueError("No open jobs to benchmark against; run `manage.py seed_data` first.")
+    ctx = BenchmarkContext(job_ids)
+    results = {
+        name: measure(SCENARIOS[name], ctx, requests, warmup)
+        for name in (scenarios or SCENARIOS)
+    }
+    return {
+        "meta": {
+            "started_at": timezone.now().isoformat(),
+            "database": connection.vendor,
+            "python": platform.python_version(),
+            "django": django.get_version(),
+            "jobs": Job.objects.count(),
+            "users": User.objects.count(),
+            "requests": requests,
+            "warmup": warmup,
+        },
+        "scenarios": results,
+    }
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = DEFAULT_TOLERANCE) -> Dict:
+    """Per scenario: relative change of the headline numbers and a verdict."""
+    report = {}
+    for name, now in current["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name)
+        if before is None:
+            continue
+        p95_change = now["p95_ms"] / before["p95_ms"] - 1 if before["p95_ms"] else 0.0
+        reasons = []
+        if p95_change > tolerance:
+            reasons.append(f"p95 {before['p95_ms']}ms -> {now['p95_ms']}ms")
+        if now["queries_max"] > before["queries_max"]:
+            reasons.append(f"queries {before['queries_max']} -> {now['queries_max']}")
+        report[name] = {
+            "p95_change": round(p95_change, 3),
+            "throughput_change": round(now["throughput_rps"] / before["throughput_rps"] - 1, 3)
+            if before["throughput_rps"] else 0.0,
+            "queries_change": now["queries_max"] - before["queries_max"],
+            "regressed": bool(reasons),
+            "reasons": reasons,
+        }
+    return report
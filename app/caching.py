@@ -0,0 +1,101 @@
+# caching.py
+
+import hashlib
+from typing import Any, Callable
+
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+from django.utils import timezone
+
+JOBS_VERSION_KEY = "jobs:version"
+LISTING_CACHE_TIMEOUT = 60 * 10
+
+
+# ----------------------------
+# Job-table version
+# ----------------------------
+# Everything derived from the job table (listing pages, card fragments, facet
+# counts) is cached under a key that embeds this counter. Saving or deleting
+# a Job or Institution bumps it (see app/signals.py), which orphans every
+# derived entry at once without having to know their keys; they expire on
+# their own. The date is part of the key too, so jobs drop out of listings
+# the day their deadline passes.
+
+def get_jobs_version() -> int:
+    return cache.get_or_set(JOBS_VERSION_KEY, 1, None)
+
+
+def bump_jobs_version() -> None:
+    try:
+        cache.incr(JOBS_VERSION_KEY)
+    except ValueError:
+        cache.set(JOBS_VERSION_KEY, 1, None)
+
+
+def jobs_cache_key(*parts: Any) -> str:
+    """
+    Build a cache key scoped to the current job-table version and date.
+    Free-form parts (filters, cursors) are hashed to keep keys short and safe
+    for memcached/redis.
+    """
+    raw = "|".join(str(part) for part in parts)
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f"jobs:{timezone.localdate().isoformat()}:{get_jobs_version()}:{digest}"
+
+
+def cached_jobs_value(parts, build: Callable[[], Any], timeout: int = LISTING_CACHE_TIMEOUT) -> Any:
+    """
+    Return the cached value for `parts`, calling `build` on a miss.
+    """
+    key = jobs_cache_key(*parts)
+    value = cache.get(key)
+    if value is None:
+        value = build()
+        cache.set(key, value, timeout)
+    return value
+
+
+# ----------------------------
+# Per-institution version
+# ----------------------------
+# Same idea as the job-table version, scoped to one institution: anything
+# touching its jobs, applications or shortlists bumps it (app/signals.py).
+
+def institution_version_key(institution_id: int) -> str:
+    return f"institution:{institution_id}:version"
+
+
+def bump_institution_version(institution_id: int) -> None:
+    try:
+        cache.incr(institution_version_key(institution_id))
+    except ValueError:
+        cache.set(institution_version_key(institution_id), 1, None)
+
+
+def institution_cache_key(institution_id: int, *parts: Any) -> str:
+    version = cache.get_or_set(institution_version_key(institution_id), 1, None)
+    raw = "|".join(str(part) for part in parts)
+    return f"institution:{institution_id}:{version}:{hashlib.md5(raw.encode()).hexdigest()}"
+
+
+# ----------------------------
+# System check
+# ----------------------------
+# The version counters only invalidate entries in the process that bumped
+# them when the cache is local memory: other workers keep serving stale
+# listings and dashboards until their entries expire.
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES.get("default", {}).get("BACKEND", "")
+    if settings.DEBUG or not backend.endswith("LocMemCache"):
+        return []
+    return [
+        checks.Warning(
+            "The default cache is local memory, so cache invalidation only "
+            "reaches the process that saved the change.",
+            hint="Set CACHE_BACKEND=redis (or file, for a single host) when running more than one worker.",
+            id="app.W001",
+        )
+    ]
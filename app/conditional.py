@@ -0,0 +1,117 @@
+# conditional.py
+
+import hashlib
+from datetime import datetime, time
+from functools import wraps
+from typing import Optional
+
+from django.contrib.messages import get_messages
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition
+
+from app.caching import cached_jobs_value, get_jobs_version
+from app.models import Job
+
+
+# ----------------------------
+# Conditional GET for job pages
+# ----------------------------
+# Job pages answer If-None-Match / If-Modified-Since with a 304 after one
+# cheap query, before any template is rendered. The page also shows who is
+# signed in (navbar name and avatar, unread badge), so the viewer is part of
+# the ETag; a new avatar gets a new thumbnail name, which changes it.
+# Pages with flash messages waiting are never validated: the messages
+# would be lost in a 304.
+
+def viewer_tag(request) -> Optional[str]:
+    if len(get_messages(request)):
+        return None
+    parts = []
+    if request.user.is_authenticated:
+        user = request.user
+        parts.append(f"u{user.pk}.{user.unread_notifications}.{user.profile_picture_thumbnail.name or ''}")
+    if request.session.get("institution_id"):
+        parts.append(f"i{request.session['institution_id']}")
+    return "-".join(parts) or "anon"
+
+
+def _etag(*parts) -> str:
+    return hashlib.md5("|".join(str(part) for part in parts).encode()).hexdigest()
+
+
+def _job_updated_at(request, job_id) -> Optional[datetime]:
+    # condition() asks for the ETag and Last-Modified separately; query once.
+    if not hasattr(request, "_job_updated_at"):
+        request._job_updated_at = (
+            Job.objects.filter(id=job_id, is_active=True).values_list("updated_at", flat=True).first()
+        )
+    return request._job_updated_at
+
+
+def job_detail_etag(request, job_id) -> Optional[str]:
+    viewer = viewer_tag(request)
+    updated_at = _job_updated_at(request, job_id)
+    if viewer is None or updated_at is None:
+        return None
+    return _etag("job", job_id, updated_at.isoformat(), viewer)
+
+
+def job_detail_last_modified(request, job_id) -> Optional[datetime]:
+    if viewer_tag(request) is None:
+        return None
+    return _job_updated_at(request, job_id)
+
+
+def _listing_updated_at(request) -> datetime:
+    """
+    Newest job change, but no earlier than today's start: listings only
+    show open jobs, so they also change when a deadline passes at midnight.
+    Cached per job-table version like the listings themselves, so repeat
+    hits stay query-free. Deletions do not move MAX(updated_at); the ETag's
+    version part covers those.
+    """
+    if not hasattr(request, "_listing_updated_at"):
+        newest = cached_jobs_value(
+            ("listing_updated_at",), lambda: Job.objects.aggregate(newest=Max("updated_at"))["newest"],
+        )
+        midnight = timezone.make_aware(datetime.combine(timezone.localdate(), time.min))
+        request._listing_updated_at = max(newest, midnight) if newest else midnight
+    return request._listing_updated_at
+
+
+def listing_etag(request, *args, **kwargs) -> Optional[str]:
+    viewer = viewer_tag(request)
+    if viewer is None:
+        return None
+    return _etag(
+        request.path, request.GET.urlencode(), get_jobs_version(),
+        _listing_updated_at(request).isoformat(), viewer,
+    )
+
+
+def listing_last_modified(request, *args, **kwargs) -> Optional[datetime]:
+    if viewer_tag(request) is None:
+        return None
+    return _listing_updated_at(request)
+
+
+def conditional_page(etag_func, last_modified_func):
+    """
+    condition() plus Cache-Control telling browsers to revalidate every
+    time, and shared caches to keep pages showing a signed-in viewer private.
+    """
+    def decorator(view):
+        conditional_view = condition(etag_func=etag_func, last_modified_func=last_modified_func)(view)
+
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            response = conditional_view(request, *args, **kwargs)
+            if request.user.is_authenticated or request.session.get("institution_id"):
+                patch_cache_control(response, private=True, no_cache=True)
+            else:
+                patch_cache_control(response, no_cache=True)
+            return response
+        return wrapper
+    return decorator
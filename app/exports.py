@@ -0,0 +1,215 @@
+# exports.py
+
+import csv
+import re
+import zipfile
+from typing import Iterable, Iterator, List, Sequence
+from xml.sax.saxutils import escape
+
+from django.db.models import Prefetch, QuerySet
+
+from app.models import JobApplication, WorkExperience
+
+EXPORT_CHUNK_SIZE = 2000
+
+# (header, attribute on the applicant) in column order.
+APPLICANT_COLUMNS = [
+    ("Username", "username"),
+    ("First name", "first_name"),
+    ("Last name", "last_name"),
+    ("Email", "email"),
+    ("Phone", "phone"),
+    ("Date of birth", "dob"),
+    ("Age", "age"),
+    ("Spouse name", "spouse_name"),
+    ("Mother tongue", "mother_tongue"),
+    ("Address", "address"),
+    ("Qualification", "qualification"),
+    ("Languages known", "languages_known"),
+    ("Schooling", "schooling"),
+    ("Graduation %", "graducation_percentage"),
+    ("Experience (years)", "working_experience_years"),
+    ("Experience summary", "describing_experience"),
+    ("Last salary", "last_salary"),
+    ("Expected salary", "expected_salary"),
+    ("Joining availability", "joining_availability"),
+    ("Reference 1", "reference_by_1"),
+    ("Reference 2", "reference_by_2"),
+    ("Profile completion %", "profile_percentage"),
+]
+HEADER = (
+    ["Application id", "Status", "Applied at"]
+    + [header for header, _attr in APPLICANT_COLUMNS]
+    + ["Work experience"]
+)
+
+
+# ----------------------------
+# Rows
+# ----------------------------
+def applications_for_export(job_id: int) -> QuerySet:
+    experiences = WorkExperience.objects.only(
+        "id", "user_id", "name", "post_assigned", "from_date", "to_date",
+    ).order_by("from_date")
+    return (
+        JobApplication.objects.filter(job_id=job_id)
+        .select_related("applicant")
+        .only("id", "status", "applied_at", "applicant_id",
+              *(f"applicant__{attr}" for _header, attr in APPLICANT_COLUMNS))
+        .prefetch_related(Prefetch("applicant__experiences", queryset=experiences))
+        .order_by("id")
+    )
+
+
+def _cell(value) -> str:
+    return "" if value is None else str(value)
+
+
+def application_row(application: JobApplication) -> List[str]:
+    applicant = application.applicant
+    experience = "; ".join(
+        f"{item.post_assigned} at {item.name} ({item.from_date} to {item.to_date})"
+        for item in applicant.experiences.all()
+    )
+    return (
+        [_cell(application.id), application.status, application.applied_at.isoformat()]
+        + [_cell(getattr(applicant, attr)) for _header, attr in APPLICANT_COLUMNS]
+        + [experience]
+    )
+
+
+def iter_application_rows(applications: QuerySet, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[List[str]]:
+    """
+    Yield one row per application. iterator(chunk_size=...) fetches the
+    applications and prefetches their experiences one chunk at a time, so
+    memory does not grow with the number of applicants.
+    """
+    for application in applications.iterator(chunk_size=chunk_size):
+        yield application_row(application)
+
+
+# ----------------------------
+# Encoders
+# ----------------------------
+# Each encoder turns rows into an iterator of bytes chunks suitable for
+# StreamingHttpResponse.
+
+# Spreadsheet apps run cells starting with these as formulas (=HYPERLINK(...)
+# in a profile field would become a live link), so such cells get a leading
+# apostrophe and are shown as text.
+FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+
+def _neutralise(value: str) -> str:
+    return "'" + value if value.startswith(FORMULA_PREFIXES) else value
+
+
+class _Buffer:
+    """Write-only sink that hands back whatever was written since last drain."""
+
+    def __init__(self):
+        self.parts = []
+
+    def write(self, data):
+        self.parts.append(data)
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(part.encode() if isinstance(part, str) else part for part in self.parts)
+        self.parts = []
+        return data
+
+
+def stream_csv(rows: Iterable[Sequence[str]], flush_every: int = 500) -> Iterator[bytes]:
+    buffer = _Buffer()
+    writer = csv.writer(buffer)
+    buffer.write("\ufeff")  # lets Excel detect UTF-8
+    writer.writerow(HEADER)
+    for count, row in enumerate(rows, start=1):
+        writer.writerow([_neutralise(value) for value in row])
+        if count % flush_every == 0:
+            yield buffer.drain()
+    yield buffer.drain()
+
+
+XLSX_STATIC_PARTS = {
+    "[Content_Types].xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+        '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+        '<Default Extension="xml" ContentType="application/xml"/>'
+        '<Override PartName="/xl/workbook.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+        '<Override PartName="/xl/worksheets/sheet1.xml" '
+        'ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"/>'
+        '</Types>'
+    ),
+    "_rels/.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" '
+        'Target="xl/workbook.xml"/>'
+        '</Relationships>'
+    ),
+    "xl/workbook.xml": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+        'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+        '<sheets><sheet name="Applicants" sheetId="1" r:id="rId1"/></sheets>'
+        '</workbook>'
+    ),
+    "xl/_rels/workbook.xml.rels": (
+        '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+        '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+        '<Relationship Id="rId1" '
+        'Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet" '
+        'Target="worksheets/sheet1.xml"/>'
+        '</Relationships>'
+    ),
+}
+
+
+# Control characters other than tab/newline are not allowed in XML.
+_XML_ILLEGAL = re.compile("[\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+def _xlsx_row(row: Sequence[str]) -> str:
+    cells = "".join(
+        f'<c t="inlineStr"><is><t xml:space="preserve">{escape(_XML_ILLEGAL.sub("", _neutralise(value)))}</t></is></c>'
+        for value in row
+    )
+    return f"<row>{cells}</row>"
+
+
+def stream_xlsx(rows: Iterable[Sequence[str]], flush_every: int = 500) -> Iterator[bytes]:
+    """
+    Write a single-sheet workbook as a zip stream: the sheet is deflated as
+    rows arrive, so nothing but the current chunk is held in memory. Cells
+    are inline strings, which every spreadsheet reader understands.
+    """
+    buffer = _Buffer()
+    with zipfile.ZipFile(buffer, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in XLSX_STATIC_PARTS.items():
+            archive.writestr(name, content)
+        with archive.open("xl/worksheets/sheet1.xml", "w", force_zip64=True) as sheet:
+            sheet.write(
+                b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>'
+                b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>'
+            )
+            sheet.write(_xlsx_row(HEADER).encode())
+            for count, row in enumerate(rows, start=1):
+                sheet.write(_xlsx_row(row).encode())
+                if count % flush_every == 0:
+                    yield buffer.drain()
+            sheet.write(b"</sheetData></worksheet>")
+    yield buffer.drain()
+
+
+EXPORT_FORMATS = {
+    "csv": (stream_csv, "text/csv; charset=utf-8"),
+    "xlsx": (stream_xlsx, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"),
+}
@@ -0,0 +1,187 @@
+# facets.py
+
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from django.db.models import Case, CharField, Count, Q, QuerySet, Value, When
+
+from app.caching import cached_jobs_value
+from app.models import Job
+
+# ----------------------------
+# Facet definitions
+# ----------------------------
+# Range facets are bucketed in SQL so every facet is a plain column in the
+# grouped query. Buckets are (key, label, lower bound, upper bound or None)
+# and half-open: a bucket holds values >= its lower bound and < its upper
+# bound, so decimal salaries such as 19999.50 still land in a bucket.
+EXPERIENCE_BUCKETS = [
+    ("0-1", "0-1 years", 0, 2),
+    ("2-4", "2-4 years", 2, 5),
+    ("5-9", "5-9 years", 5, 10),
+    ("10+", "10+ years", 10, None),
+]
+SALARY_BUCKETS = [
+    ("0-20000", "Up to ₹20,000", 0, 20000),
+    ("20000-40000", "₹20,000 - ₹40,000", 20000, 40000),
+    ("40000-60000", "₹40,000 - ₹60,000", 40000, 60000),
+    ("60000+", "₹60,000+", 60000, None),
+]
+RANGE_FACETS = {
+    "experience": ("experience_needed", EXPERIENCE_BUCKETS),
+    "salary": ("salary_min", SALARY_BUCKETS),
+}
+VALUE_FACETS = ["job_type", "category", "subcategory", "location"]
+FACETS = VALUE_FACETS + list(RANGE_FACETS)
+FACET_LABELS = {
+    "job_type": "Job Type",
+    "category": "Category",
+    "subcategory": "Subcategory",
+    "location": "Location",
+    "experience": "Experience",
+    "salary": "Salary",
+}
+
+FACET_CACHE_TIMEOUT = 60 * 60
+
+def _bucket_case(field: str, buckets) -> Case:
+    whens = []
+    for key, _label, low, high in buckets:
+        bounds = {f"{field}__gte": low}
+        if high is not None:
+            bounds[f"{field}__lt"] = high
+        whens.append(When(then=Value(key), **bounds))
+    return Case(*whens, default=Value(""), output_field=CharField())
+
+
+def _range_q(field: str, buckets, keys) -> Q:
+    condition = Q()
+    for key, _label, low, high in buckets:
+        if key in keys:
+            bounds = {f"{field}__gte": low}
+            if high is not None:
+                bounds[f"{field}__lt"] = high
+            condition |= Q(**bounds)
+    return condition
+
+
+# ----------------------------
+# Filters
+# ----------------------------
+def parse_filters(params) -> Dict[str, List[str]]:
+    """
+    Read facet selections from a QueryDict; each facet may repeat. Range
+    values that name no bucket are dropped, so filtering and counting see
+    the same selection.
+    """
+    filters = {}
+    for facet in FACETS:
+        values = params.getlist(facet)
+        if facet in RANGE_FACETS:
+            keys = {key for key, _label, _low, _high in RANGE_FACETS[facet][1]}
+            values = [value for value in values if value in keys]
+        if values:
+            filters[facet] = values
+    return filters
+
+
+def apply_filters(queryset: QuerySet, filters: Dict[str, List[str]]) -> QuerySet:
+    for facet, values in filters.items():
+        if facet in RANGE_FACETS:
+            field, buckets = RANGE_FACETS[facet]
+            queryset = queryset.filter(_range_q(field, buckets, values))
+        else:
+            queryset = queryset.filter(**{f"{facet}__in": values})
+    return queryset
+
+
+# ----------------------------
+# Facet counts
+# ----------------------------
+# All counts come from one GROUP BY over every facet column at once (the
+# "cube"): one row per distinct combination of facet values among open jobs.
+# The cube is small compared to the job table and is cached per job-table
+# version (see app/caching.py). Every facet's counts for any filter set are
+# derived from it in a single pass, then cached per filter set.
+
+def build_cube() -> List[Tuple]:
+    annotations = {facet: _bucket_case(field, buckets) for facet, (field, buckets) in RANGE_FACETS.items()}
+    rows = (
+        Job.objects.open()
+        .annotate(**annotations)
+        .values(*FACETS)
+        .annotate(count=Count("id"))
+        .order_by()
+    )
+    return [tuple(row[facet] for facet in FACETS) + (row["count"],) for row in rows]
+
+
+def get_cube() -> List[Tuple]:
+    return cached_jobs_value(("facets", "cube"), build_cube, FACET_CACHE_TIMEOUT)
+
+
+def _count_cube(cube: List[Tuple], filters: Dict[str, List[str]]) -> Dict[str, Dict[str, int]]:
+    selected = [set(filters.get(facet, ())) for facet in FACETS]
+    active = [i for i, values in enumerate(selected) if values]
+    counts = [dict() for _ in FACETS]
+
+    for row in cube:
+        misses = [i for i in active if row[i] not in selected[i]]
+        if len(misses) > 1:
+            continue
+        count = row[-1]
+        targets = misses if misses else range(len(FACETS))
+        for i in targets:
+            value = row[i]
+            if value != "":
+                counts[i][value] = counts[i].get(value, 0) + count
+
+    return {facet: counts[i] for i, facet in enumerate(FACETS)}
+
+
+def facet_counts(filters: Dict[str, List[str]], cube: Optional[List[Tuple]] = None) -> Dict[str, Dict[str, int]]:
+    """
+    Return {facet: {value: count}}. Each facet is counted with every filter
+    applied except its own, so selecting "Full-time" still shows how many
+    Part-time jobs the other filters leave.
+    """
+    if cube is not None:
+        return _count_cube(cube, filters)
+
+    signature = "&".join(f"{facet}={','.join(sorted(filters[facet]))}" for facet in sorted(filters))
+    return cached_jobs_value(
+        ("facets", "counts", signature),
+        lambda: _count_cube(get_cube(), filters),
+        FACET_CACHE_TIMEOUT,
+    )
+
+
+def facet_groups(filters: Dict[str, List[str]]) -> List[dict]:
+    """
+    Facet counts shaped for templates: ordered groups of options with labels,
+    counts and whether each option is currently selected.
+    """
+    counts = facet_counts(filters)
+    groups = []
+    for facet in FACETS:
+        group_counts = counts[facet]
+        if facet in RANGE_FACETS:
+            options = OrderedDict((key, label) for key, label, _low, _high in RANGE_FACETS[facet][1])
+        else:
+            options = OrderedDict((value, value) for value in sorted(group_counts))
+        selected = filters.get(facet, [])
+        groups.append({
+            "name": facet,
+            "label": FACET_LABELS[facet],
+            "options": [
+                {
+                    "value": value,
+                    "label": label,
+                    "count": group_counts.get(value, 0),
+                    "selected": value in selected,
+                }
+                for value, label in options.items()
+                if group_counts.get(value, 0) or value in selected
+            ],
+        })
+    return groups
@@ -0,0 +1,17 @@
+# hashers.py
+
+from django.conf import settings
+from django.contrib.auth import hashers
+
+
+class PBKDF2PasswordHasher(hashers.PBKDF2PasswordHasher):
+    """
+    Django's PBKDF2 hasher with the work factor taken from
+    PASSWORD_HASH_ITERATIONS. The algorithm name is unchanged, so existing
+    hashes still verify, and a hash stored with another iteration count is
+    re-encoded at the configured one on the next successful login.
+    """
+
+    @property
+    def iterations(self):
+        return getattr(settings, "PASSWORD_HASH_ITERATIONS", hashers.PBKDF2PasswordHasher.iterations)
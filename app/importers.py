@@ -0,0 +1,272 @@
+# importers.py
+
+import csv
+import io
+import os
+from abc import ABC, abstractmethod
+from concurrent.futures import Executor
+from itertools import islice
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from django import forms
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+
+from app.caching import bump_jobs_version
+from app.form import InstitutionRegisterForm, JobForm
+from app.models import Institution, Job, OmeiatZones
+
+IMPORT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 100
+
+
+# ----------------------------
+# Row sources
+# ----------------------------
+# Both readers take a binary stream and yield (line number, {column: value})
+# one row at a time, so a 100k-row file is never held in memory.
+
+def read_csv(stream) -> Iterator[Tuple[int, Dict[str, str]]]:
+    reader = csv.DictReader(io.TextIOWrapper(stream, encoding="utf-8-sig", newline=""))
+    for row in reader:
+        yield reader.line_num, {key.strip(): (value or "").strip() for key, value in row.items() if key}
+
+
+def read_xlsx(stream) -> Iterator[Tuple[int, Dict[str, str]]]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(stream, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = [str(cell).strip() if cell is not None else "" for cell in next(rows, ())]
+        for line, values in enumerate(rows, start=2):
+            if all(value is None for value in values):
+                continue
+            yield line, {
+                key: "" if value is None else str(value).strip()
+                for key, value in zip(header, values) if key
+            }
+    finally:
+        workbook.close()
+
+
+def read_rows(stream, filename: str) -> Iterator[Tuple[int, Dict[str, str]]]:
+    if os.path.splitext(filename)[1].lower() == ".xlsx":
+        return read_xlsx(stream)
+    return read_csv(stream)
+
+
+# ----------------------------
+# Row validation
+# ----------------------------
+# The import forms reuse the registration/job forms' fields and validation.
+# Lookups the forms would do per row (zone by id, e-mail uniqueness) are
+# answered from maps loaded once per import instead.
+
+class InstitutionImportForm(InstitutionRegisterForm):
+    class Meta(InstitutionRegisterForm.Meta):
+        fields = [field for field in InstitutionRegisterForm.Meta.fields if field != "omeiat_zone"]
+
+    def validate_unique(self):
+        pass
+
+
+class FlagField(forms.Field):
+    """
+    A yes/no column. A checkbox would read any non-empty text, "0" and "no"
+    included, as checked, so the accepted spellings are listed instead.
+    """
+    VALUES = {
+        "true": True, "yes": True, "y": True, "1": True,
+        "false": False, "no": False, "n": False, "0": False,
+    }
+
+    def __init__(self, *, empty_value: bool, **kwargs):
+        self.empty_value = empty_value
+        super().__init__(required=False, **kwargs)
+
+    def to_python(self, value):
+        text = str(value or "").strip().lower()
+        if not text:
+            return self.empty_value
+        if text not in self.VALUES:
+            raise ValidationError("Enter yes or no (true/false, 1/0).", code="invalid")
+        return self.VALUES[text]
+
+
+class JobImportForm(JobForm):
+    # A blank or missing is_active column means active.
+    is_active = FlagField(empty_value=True)
+
+
+def _form_errors(form) -> str:
+    return "; ".join(
+        f"{field}: {' '.join(errors)}" if field != "__all__" else " ".join(errors)
+        for field, errors in form.errors.items()
+    )
+
+
+class ImportResult:
+    def __init__(self):
+        self.created = 0
+        self.failed = 0
+        self.errors: List[Tuple[int, str]] = []
+
+    def add_error(self, line: int, message: str) -> None:
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((line, message))
+
+
+class Importer(ABC):
+    """
+    Validate rows one at a time and insert the valid ones with bulk_create,
+    one transaction per batch. Invalid rows are reported, not fatal.
+    CPU-heavy per-batch work (prepare()) runs on `executor` when given.
+    """
+    model = None
+
+    def __init__(self, batch_size: int = IMPORT_BATCH_SIZE, dry_run: bool = False,
+                 on_error: Optional[Callable[[int, str], None]] = None,
+                 executor: Optional[Executor] = None):
+        self.batch_size = batch_size
+        self.dry_run = dry_run
+        self.on_error = on_error
+        self.executor = executor
+        self.result = ImportResult()
+
+    def error(self, line: int, message: str) -> None:
+        self.result.add_error(line, message)
+        if self.on_error:
+            self.on_error(line, message)
+
+    @abstractmethod
+    def build(self, line: int, row: Dict[str, str]):
+        """Return an unsaved model instance for `row`, or None after self.error()."""
+
+    def prepare(self, objs: List) -> None:
+        """Finish a validated batch just before it is inserted."""
+
+    def batch_done(self, objs: List, inserted: bool) -> None:
+        """
+        Called after each batch with its valid objects; `inserted` is False
+        when the database rejected the batch (dry runs count as inserted).
+        """
+
+    def run(self, rows: Iterable[Tuple[int, Dict[str, str]]]) -> ImportResult:
+        rows = iter(rows)
+        while chunk := list(islice(rows, self.batch_size)):
+            built = [(line, self.build(line, row)) for line, row in chunk]
+            batch = [(line, obj) for line, obj in built if obj is not None]
+            if batch and not self.dry_run:
+                self.prepare([obj for _line, obj in batch])
+                try:
+                    with transaction.atomic():
+                        self.model.objects.bulk_create([obj for _line, obj in batch])
+                except IntegrityError as exc:
+                    # e.g. a row inserted concurrently; the whole batch rolls back.
+                    for line, _obj in batch:
+                        self.error(line, f"batch rejected by the database: {exc}")
+                    self.batch_done([obj for _line, obj in batch], inserted=False)
+                    continue
+            self.batch_done([obj for _line, obj in batch], inserted=True)
+            self.result.created += len(batch)
+        if self.result.created and not self.dry_run:
+            self.finish()
+        return self.result
+
+    def finish(self) -> None:
+        # bulk_create sends no post_save, so invalidate listing caches here.
+        bump_jobs_version()
+
+
+class InstitutionImporter(Importer):
+    """
+    Columns are InstitutionRegisterForm's fields; `omeiat_zone` is a zone
+    name. A `password` column is hashed; leave it blank to set it later.
+    Hashing is deliberately slow (PBKDF2), so each batch's passwords are
+    hashed together in prepare(), across the executor's processes, and
+    not at all on a dry run.
+    """
+    model = Institution
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.zones = {name.lower(): pk for pk, name in OmeiatZones.objects.values_list("id", "zone_name")}
+        self.emails = {email.lower() for email in Institution.objects.values_list("email", flat=True).iterator()}
+        # E-mails in the batch being built; they join self.emails only once
+        # the batch is inserted, so rows of a rejected batch can be retried.
+        self.batch_emails = set()
+
+    def build(self, line, row):
+        form = InstitutionImportForm(row)
+        if not form.is_valid():
+            self.error(line, _form_errors(form))
+            return None
+
+        zone_name = row.get("omeiat_zone", "")
+        zone_id = self.zones.get(zone_name.lower()) if zone_name else None
+        if zone_name and zone_id is None:
+            self.error(line, f"omeiat_zone: unknown zone '{zone_name}'.")
+            return None
+
+        institution = form.save(commit=False)
+        institution.email = institution.email.lower()
+        if institution.email in self.emails or institution.email in self.batch_emails:
+            self.error(line, f"email: {institution.email} already exists.")
+            return None
+        self.batch_emails.add(institution.email)
+        institution.omeiat_zone_id = zone_id
+        institution.password = institution.password or None
+        return institution
+
+    def prepare(self, objs):
+        pending = [obj for obj in objs if obj.password]
+        passwords = [obj.password for obj in pending]
+        if self.executor is not None:
+            hashed = self.executor.map(make_password, passwords, chunksize=max(1, len(passwords) // 32))
+        else:
+            hashed = map(make_password, passwords)
+        for obj, password in zip(pending, hashed):
+            obj.password = password
+
+    def batch_done(self, objs, inserted):
+        if inserted:
+            self.emails.update(self.batch_emails)
+        self.batch_emails = set()
+
+
+class JobImporter(Importer):
+    """
+    Columns are JobForm's fields plus `institution_email`, which names the
+    posting institution. `is_active` takes yes/no, true/false or 1/0 and
+    defaults to active.
+    """
+    model = Job
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.institutions = {
+            email.lower(): pk for pk, email in Institution.objects.values_list("id", "email").iterator()
+        }
+
+    def build(self, line, row):
+        institution_id = self.institutions.get(row.get("institution_email", "").lower())
+        if institution_id is None:
+            self.error(line, f"institution_email: no institution with e-mail '{row.get('institution_email', '')}'.")
+            return None
+
+        form = JobImportForm(row)
+        if not form.is_valid():
+            self.error(line, _form_errors(form))
+            return None
+        job = form.save(commit=False)
+        job.posted_by_id = institution_id
+        return job
+
+
+IMPORTERS = {
+    "institutions": InstitutionImporter,
+    "jobs": JobImporter,
+}
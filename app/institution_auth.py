@@ -0,0 +1,117 @@
+# institution_auth.py
+
+import time
+from functools import wraps
+from typing import Optional
+
+from django.conf import settings
+from django.contrib.auth.views import redirect_to_login
+from django.contrib.auth.hashers import check_password, make_password
+from django.urls import reverse
+from django.utils.crypto import constant_time_compare, salted_hmac
+
+from app.models import Institution
+
+SESSION_KEY = "institution_id"
+SNAPSHOT_KEY = "institution"
+# Fields kept in the session; everything else on request.institution is
+# loaded from the database on first access.
+SNAPSHOT_FIELDS = ("id", "name", "email")
+
+
+# ----------------------------
+# Backend
+# ----------------------------
+# Institutions are not Django users, so this backend is not listed in
+# AUTHENTICATION_BACKENDS; institution views call authenticate() and
+# login() below instead of the django.contrib.auth ones.
+
+class InstitutionBackend:
+    def authenticate(self, request, email: Optional[str] = None, password: Optional[str] = None) -> Optional[Institution]:
+        if not email or not password:
+            return None
+        institution = (
+            Institution.objects.only(*SNAPSHOT_FIELDS, "password").filter(email__iexact=email.strip()).first()
+        )
+        if institution is None or not institution.password:
+            # Hash anyway so unknown e-mails take as long as wrong passwords.
+            make_password(password)
+            return None
+
+        def upgrade(raw_password):
+            # Re-encoded at the current hasher settings; update() skips the
+            # post_save handlers that would invalidate every job page.
+            institution.password = make_password(raw_password)
+            Institution.objects.filter(pk=institution.pk).update(password=institution.password)
+
+        return institution if check_password(password, institution.password, upgrade) else None
+
+
+def session_hash(password: Optional[str]) -> str:
+    """Changes whenever the password does, logging out other sessions."""
+    return salted_hmac("app.institution_auth.session_hash", password or "").hexdigest()
+
+
+def authenticate(request, email: str, password: str) -> Optional[Institution]:
+    return InstitutionBackend().authenticate(request, email=email, password=password)
+
+
+# ----------------------------
+# Session
+# ----------------------------
+def _store(request, institution: Institution) -> None:
+    request.session[SESSION_KEY] = institution.pk
+    request.session[SNAPSHOT_KEY] = {
+        **{field: getattr(institution, field) for field in SNAPSHOT_FIELDS},
+        "hash": session_hash(institution.password),
+        "checked": int(time.time()),
+    }
+
+
+def login(request, institution: Institution) -> None:
+    if request.session.get(SESSION_KEY) != institution.pk:
+        request.session.cycle_key()
+    _store(request, institution)
+    request.institution = institution
+
+
+def logout(request) -> None:
+    request.session.flush()
+    request.institution = None
+
+
+def get_institution(request) -> Optional[Institution]:
+    """
+    The signed-in institution, built from the session snapshot with the
+    remaining fields deferred. The snapshot is checked against the database
+    at most every INSTITUTION_SESSION_REVALIDATE seconds; a changed password
+    or a deleted institution ends the session then.
+    """
+    institution_id = request.session.get(SESSION_KEY)
+    if institution_id is None:
+        return None
+    snapshot = request.session.get(SNAPSHOT_KEY) or {}
+    max_age = getattr(settings, "INSTITUTION_SESSION_REVALIDATE", 300)
+    if snapshot.get("id") == institution_id and time.time() - snapshot.get("checked", 0) < max_age:
+        return Institution.from_db(
+            None, list(SNAPSHOT_FIELDS), [snapshot[field] for field in SNAPSHOT_FIELDS],
+        )
+
+    institution = Institution.objects.only(*SNAPSHOT_FIELDS, "password").filter(pk=institution_id).first()
+    if institution is None or (
+        snapshot.get("hash") and not constant_time_compare(snapshot["hash"], session_hash(institution.password))
+    ):
+        request.session.flush()
+        return None
+    _store(request, institution)
+    return institution
+
+
+def institution_required(view):
+    """Like login_required, for views only a signed-in institution may use."""
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if not request.institution:
+            return redirect_to_login(request.get_full_path(), reverse("institution_login"))
+        return view(request, *args, **kwargs)
+    return wrapper
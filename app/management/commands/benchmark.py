@@ -0,0 +1,63 @@
+import json
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.test.utils import override_settings
+
+from app.benchmarks import DEFAULT_TOLERANCE, SCENARIOS, compare, run
+from app.synthetic import Rollback
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / "benchmarks" / "baseline.json"
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the main pages (home, jobs, job detail, login, apply, applied jobs) "
+        "through the test client against the current database and report "
+        "p50/p95/p99 latency, throughput and queries per request as JSON, compared "
+        "with a stored baseline. Seed data first with `manage.py seed_data`. Rows "
+        "written by the run are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=100, help="Measured requests per scenario.")
+        parser.add_argument("--warmup", type=int, default=5)
+        parser.add_argument("--scenario", action="append", choices=list(SCENARIOS), dest="scenarios")
+        parser.add_argument("--output", help="Write the JSON report here instead of stdout.")
+        parser.add_argument("--baseline", default=str(DEFAULT_BASELINE))
+        parser.add_argument("--save-baseline", action="store_true", help="Store this run as the baseline.")
+        parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+        parser.add_argument("--fail-on-regression", action="store_true")
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic(), override_settings(ALLOWED_HOSTS=["*"]):
+                report = run(options["requests"], options["warmup"], options["scenarios"])
+                raise Rollback
+        except Rollback:
+            pass
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        baseline_path = Path(options["baseline"])
+        if baseline_path.exists() and not options["save_baseline"]:
+            report["comparison"] = compare(report, json.loads(baseline_path.read_text()), options["tolerance"])
+
+        output = json.dumps(report, indent=2)
+        if options["output"]:
+            Path(options["output"]).write_text(output + "\n")
+        else:
+            self.stdout.write(output)
+
+        if options["save_baseline"]:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(output + "\n")
+            self.stderr.write(f"Baseline saved to {baseline_path}")
+
+        regressed = {name: row["reasons"] for name, row in report.get("comparison", {}).items() if row["regressed"]}
+        for name, reasons in regressed.items():
+            self.stderr.write(self.style.WARNING(f"{name} regressed: {'; '.join(reasons)}"))
+        if regressed and options["fail_on_regression"]:
+            raise CommandError(f"{len(regressed)} scenario(s) regressed against {baseline_path}.")
@@ -0,0 +1,65 @@
+import random
+import time
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from app.caching import bump_jobs_version
+from app.models import Job
+from app.synthetic import Rollback, bulk_insert, iter_jobs, make_institutions
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic jobs and measure anonymous throughput of the home and job "
+        "listing pages with the listing cache cold on every request versus warm. "
+        "Seeded rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=5000)
+        parser.add_argument("--institutions", type=int, default=50)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        results = {}
+        try:
+            with transaction.atomic(), override_settings(ALLOWED_HOSTS=["*"]):
+                institutions = make_institutions(options["institutions"], rng, prefix="Bench")
+                bulk_insert(Job, iter_jobs(institutions, options["jobs"], rng))
+
+                client = Client()
+                for name in ("home", "jobs"):
+                    url = reverse(name)
+                    results[name] = {
+                        "uncached": self.measure(client, url, options["requests"], cold=True),
+                        "cached": self.measure(client, url, options["requests"], cold=False),
+                    }
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(f"{options['jobs']} jobs, {options['requests']} anonymous requests per run")
+        for name, runs in results.items():
+            gain = runs["cached"] / runs["uncached"]
+            self.stdout.write(
+                f"  {name:<6} uncached={runs['uncached']:8.1f} req/s  "
+                f"cached={runs['cached']:8.1f} req/s  ({gain:.1f}x)"
+            )
+
+    def measure(self, client, url, requests, cold):
+        cache.clear()
+        client.get(url)  # warm templates and connections
+        started = time.perf_counter()
+        for _ in range(requests):
+            if cold:
+                bump_jobs_version()
+            response = client.get(url)
+            assert response.status_code == 200, response.status_code
+        return requests / (time.perf_counter() - started)
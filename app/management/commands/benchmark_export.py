@@ -0,0 +1,79 @@
+import random
+import time
+import tracemalloc
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from app.exports import EXPORT_FORMATS, application_row, applications_for_export, iter_application_rows
+from app.models import Job, JobApplication, User, WorkExperience
+from app.synthetic import (
+    Rollback, bulk_insert, iter_applicants, iter_applications, iter_experiences, iter_jobs, make_institutions,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed one job with many applicants and report time-to-first-byte, total "
+        "time and peak Python memory of the streaming applicant export, against "
+        "building the same file in memory. Seeded rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--applications", type=int, default=50_000)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        batch_size = options["batch_size"]
+        try:
+            with transaction.atomic():
+                institution = make_institutions(1, rng, prefix="Export")[0]
+                job = Job.objects.bulk_create(list(iter_jobs([institution], 1, rng)))[0]
+                # Kept for the experience and application rows; bulk_create sets their ids.
+                users = list(iter_applicants(options["applications"], rng, prefix="export"))
+                bulk_insert(User, users, batch_size)
+                bulk_insert(WorkExperience, iter_experiences(users, rng), batch_size)
+                bulk_insert(JobApplication, iter_applications(users, job, rng), batch_size)
+                del users
+                results = {fmt: self.measure(job.id, fmt) for fmt in EXPORT_FORMATS}
+                results["csv (in memory)"] = self.measure(job.id, "csv", in_memory=True)
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(f"{connection.vendor}: {options['applications']} applications")
+        for name, (ttfb, total, peak, size) in results.items():
+            self.stdout.write(
+                f"  {name:<16} first byte={ttfb:8.1f}ms  total={total:8.1f}ms  "
+                f"peak={peak / 2**20:7.1f}MiB  size={size / 2**20:7.1f}MiB"
+            )
+
+    def measure(self, job_id, fmt, in_memory=False):
+        # Timings come from a plain run; tracemalloc slows Python down a lot,
+        # so peak memory is taken from a second, traced run.
+        ttfb, total, size = self.consume(job_id, fmt, in_memory)
+        tracemalloc.start()
+        self.consume(job_id, fmt, in_memory)
+        _current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return ttfb, total, peak, size
+
+    def consume(self, job_id, fmt, in_memory):
+        encode, _content_type = EXPORT_FORMATS[fmt]
+        started = time.perf_counter()
+        if in_memory:
+            # What a naive view would do: load every application, then build the file.
+            rows = [application_row(application) for application in applications_for_export(job_id)]
+            chunks = [b"".join(encode(rows))]
+        else:
+            chunks = encode(iter_application_rows(applications_for_export(job_id)))
+        first = None
+        size = 0
+        for chunk in chunks:
+            if first is None:
+                first = time.perf_counter()
+            size += len(chunk)
+        finished = time.perf_counter()
+        return (first - started) * 1000, (finished - started) * 1000, size
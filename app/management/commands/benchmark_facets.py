@@ -0,0 +1,105 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+
+from app.facets import (
+    FACETS, RANGE_FACETS, _bucket_case, apply_filters, facet_counts, get_cube,
+)
+from app.caching import bump_jobs_version
+from app.models import Job
+from app.synthetic import CATEGORIES, CITIES, JOB_TYPES, Rollback, bulk_insert, iter_jobs, make_institutions
+
+
+def naive_facet_counts(filters):
+    """
+    The per-request approach this subsystem replaces: one COUNT ... GROUP BY
+    per facet, each with every other filter applied.
+    """
+    counts = {}
+    for facet in FACETS:
+        others = {name: values for name, values in filters.items() if name != facet}
+        queryset = apply_filters(Job.objects.open(), others)
+        if facet in RANGE_FACETS:
+            field, buckets = RANGE_FACETS[facet]
+            queryset = queryset.annotate(**{facet: _bucket_case(field, buckets)})
+        rows = queryset.values(facet).annotate(count=Count("id")).order_by()
+        counts[facet] = {row[facet]: row["count"] for row in rows if row[facet] != ""}
+    return counts
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic jobs and compare facet-count latency of the cached cube "
+        "against one GROUP BY query per facet. Seeded rows are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=100_000)
+        parser.add_argument("--institutions", type=int, default=200)
+        parser.add_argument("--requests", type=int, default=50)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--seed", type=int, default=1)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        try:
+            with transaction.atomic():
+                institutions = make_institutions(options["institutions"], rng, prefix="Bench")
+                bulk_insert(Job, iter_jobs(institutions, options["jobs"], rng), options["batch_size"])
+                filter_sets = [self.random_filters(rng) for _ in range(options["requests"])]
+                results = self.run(filter_sets)
+                raise Rollback
+        except Rollback:
+            pass
+
+        self.stdout.write(f"{connection.vendor}: {options['jobs']} jobs, {options['requests']} filter sets")
+        for name, timings in results.items():
+            self.stdout.write(
+                f"  {name:<12} p50={statistics.median(timings):8.2f}ms  max={max(timings):8.2f}ms"
+            )
+        speedup = statistics.median(results["naive"]) / statistics.median(results["cube-derive"])
+        self.stdout.write(self.style.SUCCESS(f"Deriving from the cached cube is {speedup:.0f}x faster than naive at p50"))
+
+    def random_filters(self, rng):
+        filters = {}
+        if rng.random() < 0.6:
+            filters["job_type"] = [rng.choice(JOB_TYPES)]
+        if rng.random() < 0.4:
+            filters["category"] = [rng.choice(CATEGORIES)]
+        if rng.random() < 0.4:
+            filters["location"] = rng.sample(CITIES, 2)
+        if rng.random() < 0.3:
+            filters["experience"] = [rng.choice(RANGE_FACETS["experience"][1])[0]]
+        return filters
+
+    def run(self, filter_sets):
+        results = {"naive": [], "cube-build": [], "cube-derive": [], "cached": []}
+        for filters in filter_sets:
+            started = time.perf_counter()
+            naive = naive_facet_counts(filters)
+            results["naive"].append((time.perf_counter() - started) * 1000)
+
+            # Right after a job change: the cube itself must be rebuilt.
+            bump_jobs_version()
+            started = time.perf_counter()
+            cube = get_cube()
+            results["cube-build"].append((time.perf_counter() - started) * 1000)
+
+            # Cube cached, first request for this filter set.
+            started = time.perf_counter()
+            facet_counts(filters, cube=cube)
+            results["cube-derive"].append((time.perf_counter() - started) * 1000)
+
+            # Repeat request for the same filter set.
+            facet_counts(filters)
+            started = time.perf_counter()
+            cached = facet_counts(filters)
+            results["cached"].append((time.perf_counter() - started) * 1000)
+
+            if cached != naive:
+                raise AssertionError(f"Facet counts disagree for {filters}")
+        return results
@@ -0,0 +1,72 @@
+import random
+import statistics
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from app.search import search_jobs
+from app.synthetic import Rollback, bulk_insert, iter_jobs, make_institutions, sample_queries
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic jobs, time ranked full-text searches against them and report "
+        "latency percentiles. Seeded rows are rolled back unless --keep is given. "
+        "The latency target is meant for PostgreSQL; the SQLite FTS5 index is for local use."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--jobs", type=int, default=100_000)
+        parser.add_argument("--institutions", type=int, default=200)
+        parser.add_argument("--queries", type=int, default=300)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument("--target-ms", type=float, default=50.0, help="p95 latency budget.")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--keep", action="store_true", help="Commit the seeded rows.")
+        parser.add_argument("--strict", action="store_true", help="Exit non-zero when p95 exceeds the target.")
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        try:
+            with transaction.atomic():
+                self.seed(rng, options)
+                timings = self.run_queries(rng, options)
+                if not options["keep"]:
+                    raise Rollback
+        except Rollback:
+            pass
+
+        timings.sort()
+        p50 = statistics.median(timings)
+        p95 = timings[int(len(timings) * 0.95) - 1]
+        self.stdout.write(
+            f"{connection.vendor}: {options['jobs']} jobs, {len(timings)} queries  "
+            f"p50={p50:.1f}ms  p95={p95:.1f}ms  max={timings[-1]:.1f}ms"
+        )
+        if p95 <= options["target_ms"]:
+            self.stdout.write(self.style.SUCCESS(f"p95 within the {options['target_ms']:.0f}ms target"))
+        elif options["strict"]:
+            raise CommandError(f"p95 {p95:.1f}ms exceeds the {options['target_ms']:.0f}ms target")
+        else:
+            self.stdout.write(self.style.WARNING(f"p95 exceeds the {options['target_ms']:.0f}ms target"))
+
+    def seed(self, rng, options):
+        from app.models import Job
+
+        started = time.perf_counter()
+        institutions = make_institutions(options["institutions"], rng, prefix="Bench")
+        bulk_insert(Job, iter_jobs(institutions, options["jobs"], rng), options["batch_size"])
+        if connection.vendor == "postgresql":
+            with connection.cursor() as cursor:
+                cursor.execute("ANALYZE app_job")
+        self.stdout.write(f"Seeded {options['jobs']} jobs in {time.perf_counter() - started:.1f}s")
+
+    def run_queries(self, rng, options):
+        timings = []
+        for query in sample_queries(rng, options["queries"]):
+            page = rng.choice([1, 1, 1, 2, 3])
+            started = time.perf_counter()
+            list(search_jobs(query, page=page))
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
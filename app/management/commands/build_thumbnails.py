@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from django.db.models import Q
+
+from app.models import User
+from app.uploads import build_thumbnail
+
+
+class Command(BaseCommand):
+    help = (
+        "Create avatar thumbnails for profile pictures uploaded before thumbnails "
+        "existed. New uploads get theirs at upload time; run this once after deploying."
+    )
+
+    def handle(self, *args, **options):
+        users = (
+            User.objects.exclude(profile_picture="").exclude(profile_picture__isnull=True)
+            .filter(Q(profile_picture_thumbnail="") | Q(profile_picture_thumbnail__isnull=True))
+            .only("id", "profile_picture", "profile_picture_thumbnail")
+        )
+        built = failed = 0
+        for user in users.iterator(chunk_size=500):
+            if build_thumbnail(user):
+                built += 1
+            else:
+                failed += 1
+                self.stderr.write(f"Could not read {user.profile_picture.name} (user {user.pk}).")
+        self.stdout.write(self.style.SUCCESS(f"Built {built} thumbnail(s); {failed} picture(s) skipped."))
@@ -0,0 +1,62 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+
+from app.models import Job, JobApplication, Notification, User
+
+
+def full_scan_lines(plan, table):
+    """
+    Return the plan lines that read `table` without an index:
+    "Seq Scan on <table>" on PostgreSQL, a bare "SCAN <table>" on SQLite.
+    """
+    lines = []
+    for line in plan.splitlines():
+        if f"Seq Scan on {table}" in line:
+            lines.append(line)
+        elif f"SCAN {table}" in line and "USING" not in line and "Seq" not in line:
+            lines.append(line)
+    return lines
+
+
+class Command(BaseCommand):
+    help = "Run EXPLAIN on the querysets behind each listing view and report index usage."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", type=int, help="Applicant id to plan per-user queries for (defaults to the first user).")
+        parser.add_argument("--verbose-plans", action="store_true", help="Print the full plan for every query.")
+        parser.add_argument("--strict", action="store_true", help="Exit non-zero if any query does not use an index.")
+
+    def handle(self, *args, **options):
+        user_id = options["user"] or User.objects.values_list("id", flat=True).first() or 0
+        job_id = Job.objects.values_list("id", flat=True).first() or 0
+
+        querysets = {
+            "jobs": Job.objects.open().cards().order_by("-timestamp", "-id")[:21],
+            "home": Job.objects.open().cards().order_by("-timestamp", "-id")[:13],
+            "job_detail": Job.objects.filter(id=job_id, is_active=True),
+            "apply_job": JobApplication.objects.filter(applicant_id=user_id, job_id=job_id),
+            "applied_jobs": JobApplication.objects.listing()
+            .filter(applicant_id=user_id)
+            .order_by("-applied_at"),
+            "applied_jobs?status": JobApplication.objects.listing()
+            .filter(applicant_id=user_id, status="pending")
+            .order_by("-applied_at"),
+            "notifications": Notification.objects.filter(recipient_id=user_id)[:20],
+        }
+
+        self.stdout.write(f"Backend: {connection.vendor}")
+        missing = []
+        for name, queryset in querysets.items():
+            plan = queryset.explain()
+            uses_index = not full_scan_lines(plan, queryset.model._meta.db_table)
+            if uses_index:
+                self.stdout.write(self.style.SUCCESS(f"  [index]    {name}"))
+            else:
+                missing.append(name)
+                self.stdout.write(self.style.WARNING(f"  [no index] {name}"))
+            if options["verbose_plans"] or not uses_index:
+                for line in plan.splitlines():
+                    self.stdout.write(f"      {line}")
+
+        if missing and options["strict"]:
+            raise CommandError(f"Queries without index usage: {', '.join(missing)}")
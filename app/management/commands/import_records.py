@@ -0,0 +1,50 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.importers import IMPORT_BATCH_SIZE, IMPORTERS, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Import institutions or jobs from a CSV or .xlsx file. Rows are validated "
+        "with the registration/job forms and inserted in batches; invalid rows "
+        "are reported and skipped."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(IMPORTERS))
+        parser.add_argument("path", help="CSV or .xlsx file to import.")
+        parser.add_argument("--batch-size", type=int, default=IMPORT_BATCH_SIZE)
+        parser.add_argument("--dry-run", action="store_true", help="Validate every row without writing.")
+        parser.add_argument(
+            "--processes", type=int, default=os.cpu_count() or 1,
+            help="Processes used to hash institution passwords; 0 hashes them in this process.",
+        )
+
+    def handle(self, *args, **options):
+        path = options["path"]
+        if not os.path.exists(path):
+            raise CommandError(f"No such file: {path}")
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        def report(line, message):
+            self.stderr.write(f"line {line}: {message}")
+
+        processes = options["processes"]
+        executor = ProcessPoolExecutor(max_workers=processes) if processes > 0 else None
+        try:
+            importer = IMPORTERS[options["kind"]](
+                batch_size=options["batch_size"], dry_run=options["dry_run"], on_error=report, executor=executor,
+            )
+            with open(path, "rb") as stream:
+                result = importer.run(read_rows(stream, path))
+        finally:
+            if executor is not None:
+                executor.shutdown()
+
+        verb = "Validated" if options["dry_run"] else "Imported"
+        style = self.style.SUCCESS if not result.failed else self.style.WARNING
+        self.stdout.write(style(f"{verb} {result.created} {options['kind']}; {result.failed} row(s) rejected."))
@@ -0,0 +1,63 @@
+import os
+
+from django.conf import settings
+from django.core.files import File
+from django.core.files.storage import default_storage
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from app.models import User
+from app.uploads import UPLOAD_FIELDS
+
+
+class Command(BaseCommand):
+    help = (
+        "Move profile pictures and marksheets stored before MEDIA_ROOT was set "
+        "(they were saved relative to the project directory, e.g. profiles/...) "
+        "into media storage, so existing rows keep working. Run once after deploying."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--source", default=str(settings.BASE_DIR),
+            help="Directory the old relative file names resolve against (default: the project directory).",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Report what would move without moving it.")
+
+    def handle(self, *args, **options):
+        source = options["source"]
+        if not os.path.isdir(source):
+            raise CommandError(f"No such directory: {source}")
+
+        has_file = Q()
+        for field in UPLOAD_FIELDS:
+            has_file |= Q(**{f"{field}__gt": ""})
+        users = User.objects.filter(has_file).only("id", *UPLOAD_FIELDS)
+
+        moved = missing = 0
+        for user in users.iterator(chunk_size=500):
+            changed = []
+            for field in UPLOAD_FIELDS:
+                name = getattr(user, field).name
+                if not name or default_storage.exists(name):
+                    continue
+                path = os.path.join(source, name)
+                if not os.path.isfile(path):
+                    missing += 1
+                    self.stderr.write(f"Missing {name} (user {user.pk}).")
+                    continue
+                moved += 1
+                if options["dry_run"]:
+                    continue
+                with open(path, "rb") as legacy:
+                    stored = default_storage.save(name, File(legacy))
+                os.remove(path)
+                if stored != name:
+                    setattr(user, field, stored)
+                    changed.append(field)
+            if changed:
+                user.save(update_fields=changed)
+
+        verb = "Would move" if options["dry_run"] else "Moved"
+        style = self.style.SUCCESS if not missing else self.style.WARNING
+        self.stdout.write(style(f"{verb} {moved} file(s) into media storage; {missing} missing."))
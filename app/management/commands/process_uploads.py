@@ -0,0 +1,45 @@
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from app.upload_queue import UPLOAD_BATCH_SIZE, process_pending
+
+
+class Command(BaseCommand):
+    help = (
+        "Run the upload worker: validate, checksum and thumbnail profile pictures "
+        "and marksheets queued by profile updates, in a pool of processes. Runs "
+        "until stopped; --once drains the queue a single time (cron, tests)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--processes", type=int, default=settings.UPLOAD_WORKER_PROCESSES,
+            help="Size of the process pool; 0 processes uploads in this process.",
+        )
+        parser.add_argument("--batch-size", type=int, default=UPLOAD_BATCH_SIZE)
+        parser.add_argument("--poll", type=float, default=2.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument("--once", action="store_true", help="Exit once the queue is empty.")
+
+    def handle(self, *args, **options):
+        processes = options["processes"]
+        executor = ProcessPoolExecutor(max_workers=processes) if processes > 0 else None
+        try:
+            while True:
+                close_old_connections()
+                counts = process_pending(executor, options["batch_size"])
+                if counts:
+                    summary = ", ".join(f"{count} {status}" for status, count in sorted(counts.items()))
+                    self.stdout.write(f"Processed uploads: {summary}.")
+                elif options["once"]:
+                    break
+                else:
+                    time.sleep(options["poll"])
+        except KeyboardInterrupt:
+            pass
+        finally:
+            if executor is not None:
+                executor.shutdown()
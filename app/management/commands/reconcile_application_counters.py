@@ -0,0 +1,23 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from app.application_counters import reconcile_counters
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute per-status application counters on users and jobs from "
+        "JobApplication and fix any that drifted (e.g. after raw SQL edits)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Report drift without writing.")
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            fixed = reconcile_counters(dry_run=options["dry_run"])
+        verb = "would fix" if options["dry_run"] else "fixed"
+        for model, count in fixed.items():
+            self.stdout.write(f"{model}: {verb} {count} row(s)")
+        if not any(fixed.values()):
+            self.stdout.write(self.style.SUCCESS("All application counters are consistent."))
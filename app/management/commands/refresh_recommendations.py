@@ -0,0 +1,29 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.recommendations import REFRESH_USER_BATCH, RECOMMENDATIONS_PER_USER, candidates, queue_refresh, refresh
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute job recommendations for users and jobs queued since the last "
+        "run. Schedule it every few minutes; use --full (e.g. nightly) to rebuild "
+        "every user's list, which also drops jobs whose deadline has passed."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--full", action="store_true", help="Queue every candidate before refreshing.")
+        parser.add_argument("--batch-size", type=int, default=REFRESH_USER_BATCH)
+        parser.add_argument("--top", type=int, default=RECOMMENDATIONS_PER_USER)
+
+    def handle(self, *args, **options):
+        if options["full"]:
+            queue_refresh("user", candidates().values_list("id", flat=True))
+        started = time.perf_counter()
+        result = refresh(batch_size=options["batch_size"], top=options["top"])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Refreshed {result['users']} user(s) and {result['jobs']} job(s); "
+            f"wrote {result['rows']} recommendation(s) in {elapsed:.1f}s."
+        ))
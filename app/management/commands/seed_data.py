@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from app.models import OmeiatZones
+from app.synthetic import SCALES, seed_database
+
+
+class Command(BaseCommand):
+    help = (
+        "Fill the database with synthetic zones, institutions, jobs, applicants, "
+        "work experience, applications and notifications for load tests and "
+        "benchmarks. Rows are deterministic for a given --seed and --prefix; use "
+        "a new --prefix to add another set to the same database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=sorted(SCALES), default="small")
+        for name in SCALES["small"]:
+            parser.add_argument(f"--{name.replace('_', '-')}", type=int, help=f"Override the scale's {name}.")
+        parser.add_argument("--seed", type=int, default=1)
+        parser.add_argument("--prefix", default="seed")
+
+    def handle(self, *args, **options):
+        volumes = dict(SCALES[options["scale"]])
+        for name in volumes:
+            if options[name] is not None:
+                volumes[name] = options[name]
+        if OmeiatZones.objects.filter(zone_name__startswith=f"{options['prefix'].title()} Zone ").exists():
+            raise CommandError(f"Data with prefix '{options['prefix']}' already exists; pick another --prefix.")
+
+        started = time.perf_counter()
+        counts = seed_database(
+            **volumes, seed=options["seed"], prefix=options["prefix"],
+            progress=lambda model, count: self.stdout.write(
+                f"  {model._meta.verbose_name_plural}: {count} ({time.perf_counter() - started:.1f}s)"
+            ),
+        )
+        summary = ", ".join(f"{count} {name}" for name, count in counts.items())
+        self.stdout.write(self.style.SUCCESS(f"Seeded {summary} in {time.perf_counter() - started:.1f}s."))
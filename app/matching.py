@@ -0,0 +1,189 @@
+# matching.py
+
+import re
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.models import Job, JobApplication, User
+
+MATCH_WEIGHTS = {
+    "skills": 0.40,
+    "experience": 0.25,
+    "salary": 0.20,
+    "location": 0.15,
+}
+# Score given for a criterion the candidate left blank: below an average
+# match, so empty profiles do not outrank partial ones.
+UNKNOWN_SCORE = 0.25
+CANDIDATE_MATRIX_TTL = 60 * 5
+CANDIDATE_FIELDS = (
+    "id", "working_experience_years", "expected_salary",
+    "qualification", "languages_known", "address",
+)
+
+_TOKEN = re.compile(r"[a-z0-9][a-z0-9.+#]*")
+_STOPWORDS = frozenset({"and", "or", "the", "of", "in", "with", "a", "an", "for", "to", "at"})
+
+
+def tokenize(*texts: Optional[str]) -> List[str]:
+    tokens = []
+    for text in texts:
+        if text:
+            tokens.extend(token.strip(".") for token in _TOKEN.findall(text.lower()))
+    return [token for token in tokens if token and token not in _STOPWORDS]
+
+
+class _TokenMatrix:
+    """
+    Candidate token sets as a sparse 0/1 matrix in CSR form (indptr/indices
+    arrays), so overlap with a job's tokens for every candidate is one
+    gather plus a cumulative sum.
+    """
+
+    def __init__(self, rows: Iterable[Sequence[str]], vocabulary: Dict[str, int]):
+        indptr = [0]
+        indices = []
+        for tokens in rows:
+            ids = {vocabulary.setdefault(token, len(vocabulary)) for token in tokens}
+            indices.extend(ids)
+            indptr.append(len(indices))
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int64)
+        self.vocabulary = vocabulary
+
+    def empty(self) -> np.ndarray:
+        """True for candidates with no tokens at all."""
+        return self.indptr[1:] == self.indptr[:-1]
+
+    def overlap(self, tokens: Iterable[str]) -> np.ndarray:
+        """Number of `tokens` each candidate has."""
+        wanted = np.zeros(len(self.vocabulary) + 1, dtype=np.int32)
+        ids = [self.vocabulary[token] for token in set(tokens) if token in self.vocabulary]
+        if not ids:
+            return np.zeros(len(self.indptr) - 1, dtype=np.int32)
+        wanted[ids] = 1
+        hits = np.concatenate(([0], np.cumsum(wanted[self.indices])))
+        return hits[self.indptr[1:]] - hits[self.indptr[:-1]]
+
+
+class CandidateMatrix:
+    """
+    Every matchable candidate's features as NumPy arrays, built with one
+    query. Scoring a job against all candidates is a handful of vectorized
+    operations, however many candidates there are.
+    """
+
+    def __init__(self, rows: Iterable[Tuple]):
+        ids, experience, salary, skills, places = [], [], [], [], []
+        for user_id, years, expected, qualification, languages, address in rows:
+            ids.append(user_id)
+            experience.append(np.nan if years is None else float(years))
+            salary.append(np.nan if expected is None else float(expected))
+            skills.append(tokenize(qualification, languages))
+            places.append(tokenize(address))
+        self.user_ids = np.asarray(ids, dtype=np.int64)
+        self.experience = np.asarray(experience, dtype=np.float64)
+        self.expected_salary = np.asarray(salary, dtype=np.float64)
+        self.skills = _TokenMatrix(skills, {})
+        self.places = _TokenMatrix(places, {})
+        self.built_at = time.monotonic()
+
+    @classmethod
+    def load(cls, queryset=None) -> "CandidateMatrix":
+        if queryset is None:
+            queryset = User.objects.filter(
+                is_active=True, is_staff=False, is_deleted=False, profile_visibility=True,
+            )
+        return cls(queryset.values_list(*CANDIDATE_FIELDS).iterator(chunk_size=5000))
+
+    def __len__(self):
+        return len(self.user_ids)
+
+    def score(self, job: Job) -> np.ndarray:
+        """Match score in [0, 1] for every candidate, in user_ids order."""
+        needed = float(job.experience_needed or 0)
+        if needed:
+            experience = np.clip(self.experience / needed, 0.0, 1.0)
+        else:
+            experience = np.ones_like(self.experience)
+        experience = np.where(np.isnan(self.experience), UNKNOWN_SCORE, experience)
+
+        salary_max = float(job.salary_max or 0)
+        if salary_max:
+            # Full marks up to the top of the band, falling to 0 at double it.
+            salary = np.clip(1.0 - (self.expected_salary - salary_max) / salary_max, 0.0, 1.0)
+        else:
+            salary = np.ones_like(self.expected_salary)
+        salary = np.where(np.isnan(self.expected_salary), UNKNOWN_SCORE, salary)
+
+        wanted = set(tokenize(job.skills_required, job.qualifications))
+        if wanted:
+            skills = np.minimum(self.skills.overlap(wanted) / len(wanted), 1.0)
+            skills = np.where(self.skills.empty(), UNKNOWN_SCORE, skills)
+        else:
+            skills = np.full(len(self), UNKNOWN_SCORE)
+
+        place = tokenize(job.location)
+        location = (self.places.overlap(place) > 0).astype(np.float64) if place else np.zeros(len(self))
+        location = np.where(self.places.empty(), UNKNOWN_SCORE, location)
+
+        return (
+            MATCH_WEIGHTS["skills"] * skills
+            + MATCH_WEIGHTS["experience"] * experience
+            + MATCH_WEIGHTS["salary"] * salary
+            + MATCH_WEIGHTS["location"] * location
+        )
+
+    def top(self, job: Job, k: int = 20, exclude: Iterable[int] = ()) -> List[Tuple[int, float]]:
+        """The k best (user_id, score) pairs for `job`, best first."""
+        scores = self.score(job)
+        exclude = np.fromiter(exclude, dtype=np.int64)
+        if exclude.size:
+            scores = np.where(np.isin(self.user_ids, exclude), -1.0, scores)
+        k = min(k, int((scores >= 0).sum()))
+        if k <= 0:
+            return []
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.lexsort((self.user_ids[best], -scores[best]))]
+        return [(int(self.user_ids[i]), round(float(scores[i]), 4)) for i in best]
+
+
+# ----------------------------
+# Process-wide matrix
+# ----------------------------
+# Loading 100k profiles takes a moment, so the matrix is shared by requests
+# in a process and rebuilt when it is older than CANDIDATE_MATRIX_TTL. It is
+# built outside the lock, which only guards swapping the reference, so other
+# requests are never held up behind a rebuild.
+
+_matrix = None
+_matrix_lock = threading.Lock()
+
+
+def get_candidate_matrix(max_age: int = CANDIDATE_MATRIX_TTL) -> CandidateMatrix:
+    global _matrix
+    matrix = _matrix
+    if matrix is not None and time.monotonic() - matrix.built_at <= max_age:
+        return matrix
+    fresh = CandidateMatrix.load()
+    with _matrix_lock:
+        if _matrix is None or _matrix.built_at < fresh.built_at:
+            _matrix = fresh
+        return _matrix
+
+
+def rank_candidates(job: Job, k: int = 20, exclude_applicants: bool = False) -> List[Tuple[User, float]]:
+    """
+    Top-k candidates for `job` as (user, score), best first.
+    """
+    exclude = ()
+    if exclude_applicants:
+        exclude = JobApplication.objects.filter(job=job).values_list("applicant_id", flat=True)
+    ranked = get_candidate_matrix().top(job, k, exclude=exclude)
+    users = User.objects.only(
+        "id", "username", "first_name", "last_name", "qualification", "working_experience_years",
+    ).in_bulk([user_id for user_id, _score in ranked])
+    return [(users[user_id], score) for user_id, score in ranked if user_id in users]
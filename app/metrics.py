@@ -0,0 +1,199 @@
+# metrics.py
+
+import bisect
+import contextvars
+import math
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+# ----------------------------
+# Histograms
+# ----------------------------
+# Fixed-bucket histograms, one per (metric, view). Observing a value is a
+# bisect and two additions under a lock, cheap enough to do several times on
+# every request. Buckets are upper bounds; the last one is +Inf.
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 200, 500)
+SIZE_BUCKETS = (1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+METRICS = {
+    # name: (help text, buckets)
+    "request_duration_seconds": ("Wall time spent in the view stack.", DURATION_BUCKETS),
+    "db_queries": ("Database queries run per request.", QUERY_BUCKETS),
+    "db_duration_seconds": ("Time spent waiting on the database per request.", DURATION_BUCKETS),
+    "template_duration_seconds": ("Time spent rendering templates per request.", DURATION_BUCKETS),
+    "response_size_bytes": ("Response body size.", SIZE_BUCKETS),
+}
+METRIC_PREFIX = "omeiat_"
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "count", "total", "maximum")
+
+    def __init__(self, buckets: Sequence[float]):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        if value > self.maximum:
+            self.maximum = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by linear interpolation inside its bucket, the
+        way Prometheus' histogram_quantile() does.
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for index, in_bucket in enumerate(self.counts):
+            upper = self.buckets[index] if index < len(self.buckets) else self.maximum
+            if in_bucket and seen + in_bucket >= rank:
+                return lower + (upper - lower) * (rank - seen) / in_bucket
+            seen += in_bucket
+            lower = upper
+        return self.maximum
+
+    def cumulative(self) -> Iterator[Tuple[str, int]]:
+        running = 0
+        for bound, in_bucket in zip(list(self.buckets) + [math.inf], self.counts):
+            running += in_bucket
+            yield ("+Inf" if bound == math.inf else repr(bound)), running
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._histograms: Dict[Tuple[str, str], Histogram] = {}
+        self._requests: Dict[Tuple[str, str, int], int] = defaultdict(int)
+
+    def observe_request(self, view: str, method: str, status: int, values: Dict[str, float]) -> None:
+        with self._lock:
+            self._requests[(view, method, status)] += 1
+            for name, value in values.items():
+                histogram = self._histograms.get((name, view))
+                if histogram is None:
+                    histogram = self._histograms[(name, view)] = Histogram(METRICS[name][1])
+                histogram.observe(value)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms.clear()
+            self._requests.clear()
+
+    def summary(self) -> Dict[str, Dict]:
+        """Per view: request count plus count/avg/p50/p95/p99/max per metric."""
+        views = defaultdict(lambda: {"requests": 0, "metrics": {}})
+        with self._lock:
+            for (view, _method, _status), count in self._requests.items():
+                views[view]["requests"] += count
+            for (name, view), histogram in self._histograms.items():
+                views[view]["metrics"][name] = {
+                    "count": histogram.count,
+                    "avg": histogram.total / histogram.count if histogram.count else 0.0,
+                    "p50": histogram.quantile(0.50),
+                    "p95": histogram.quantile(0.95),
+                    "p99": histogram.quantile(0.99),
+                    "max": histogram.maximum,
+                }
+        return dict(sorted(views.items()))
+
+    def prometheus(self) -> str:
+        """The registry in the Prometheus text exposition format (0.0.4)."""
+        lines: List[str] = []
+        with self._lock:
+            lines.append(f"# HELP {METRIC_PREFIX}requests_total Requests handled.")
+            lines.append(f"# TYPE {METRIC_PREFIX}requests_total counter")
+            for (view, method, status), count in sorted(self._requests.items()):
+                lines.append(
+                    f'{METRIC_PREFIX}requests_total{{view="{_label(view)}",method="{method}",status="{status}"}} {count}'
+                )
+            for name, (help_text, _buckets) in METRICS.items():
+                metric = METRIC_PREFIX + name
+                lines.append(f"# HELP {metric} {help_text}")
+                lines.append(f"# TYPE {metric} histogram")
+                for (hist_name, view), histogram in sorted(self._histograms.items()):
+                    if hist_name != name:
+                        continue
+                    view = _label(view)
+                    for bound, running in histogram.cumulative():
+                        lines.append(f'{metric}_bucket{{view="{view}",le="{bound}"}} {running}')
+                    lines.append(f'{metric}_sum{{view="{view}"}} {histogram.total!r}')
+                    lines.append(f'{metric}_count{{view="{view}"}} {histogram.count}')
+        return "\n".join(lines) + "\n"
+
+
+def _label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = Registry()
+
+
+# ----------------------------
+# Per-request stats
+# ----------------------------
+# The middleware puts a RequestStats in a context variable for the duration
+# of a request; the query wrapper and the template timer add to it.
+
+class RequestStats:
+    __slots__ = ("queries", "db_time", "template_time", "template_depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.template_time = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper() hook
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_time += time.perf_counter() - started
+            self.queries += 1
+
+
+current_stats: contextvars.ContextVar[Optional[RequestStats]] = contextvars.ContextVar("request_stats", default=None)
+
+_template_timer_installed = False
+
+
+def install_template_timer() -> None:
+    """
+    Time Template.render for the current request. Includes call render too,
+    so only the outermost call is counted.
+    """
+    global _template_timer_installed
+    if _template_timer_installed:
+        return
+    from django.template.base import Template
+
+    original = Template.render
+
+    def timed_render(template, context):
+        stats = current_stats.get()
+        if stats is None or stats.template_depth:
+            return original(template, context)
+        stats.template_depth += 1
+        started = time.perf_counter()
+        try:
+            return original(template, context)
+        finally:
+            stats.template_time += time.perf_counter() - started
+            stats.template_depth -= 1
+
+    Template.render = timed_render
+    _template_timer_installed = True
@@ -0,0 +1,124 @@
+# middleware.py
+
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.utils.functional import SimpleLazyObject
+
+from app.institution_auth import get_institution
+from app.metrics import RequestStats, current_stats, install_template_timer, registry
+from app.query_inspector import installed, new_inspector
+
+logger = logging.getLogger("app.performance")
+
+
+# ----------------------------
+# Request instrumentation
+# ----------------------------
+class PerformanceMiddleware:
+    """
+    Record wall time, query count, DB time, template time and response
+    size per resolved URL name into app.metrics.registry, and log requests
+    slower than PERFORMANCE_SLOW_REQUEST_MS as one JSON line each.
+    Disable with PERFORMANCE_METRICS = False.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "PERFORMANCE_METRICS", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.slow_request = getattr(settings, "PERFORMANCE_SLOW_REQUEST_MS", 500) / 1000
+        install_template_timer()
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = current_stats.set(stats)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            current_stats.reset(token)
+        elapsed = time.perf_counter() - started
+
+        view = request.resolver_match.view_name if request.resolver_match else "<unresolved>"
+        if response.streaming:
+            size = int(response.get("Content-Length") or 0)
+        else:
+            size = len(response.content)
+        registry.observe_request(view, request.method, response.status_code, {
+            "request_duration_seconds": elapsed,
+            "db_queries": stats.queries,
+            "db_duration_seconds": stats.db_time,
+            "template_duration_seconds": stats.template_time,
+            "response_size_bytes": size,
+        })
+
+        if elapsed >= self.slow_request:
+            logger.warning(json.dumps({
+                "event": "slow_request",
+                "view": view,
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "duration_ms": round(elapsed * 1000, 1),
+                "db_queries": stats.queries,
+                "db_ms": round(stats.db_time * 1000, 1),
+                "template_ms": round(stats.template_time * 1000, 1),
+                "response_bytes": size,
+            }))
+        return response
+
+
+# ----------------------------
+# Query inspection
+# ----------------------------
+class QueryInspectorMiddleware:
+    """
+    Log repeated (N+1) and slow queries for a sample of requests; see
+    app/query_inspector.py. QUERY_INSPECTOR_SAMPLE_RATE = 0 removes it.
+    """
+
+    def __init__(self, get_response):
+        self.sample_rate = getattr(settings, "QUERY_INSPECTOR_SAMPLE_RATE", 0)
+        if self.sample_rate <= 0:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return self.get_response(request)
+        with installed(new_inspector()) as inspector:
+            response = self.get_response(request)
+        view = request.resolver_match.view_name if request.resolver_match else "<unresolved>"
+        label = f"{request.method} {request.path} ({view})"
+        inspector.report(label)
+        if settings.QUERY_INSPECTOR_STRICT:
+            inspector.check(label)
+        return response
+
+
+# ----------------------------
+# Institution identity
+# ----------------------------
+class InstitutionMiddleware:
+    """
+    Attach request.institution: the signed-in Institution or None, resolved
+    on first use and then reused for the rest of the request. See
+    app/institution_auth.py. Must come after SessionMiddleware.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        request.institution = SimpleLazyObject(lambda: get_institution(request))
+        return self.get_response(request)
@@ -0,0 +1,35 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:10
+
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def remove_duplicate_applications(apps, schema_editor):
+    # Keep the earliest application for each (applicant, job) pair so the
+    # unique constraint can be created on existing data.
+    JobApplication = apps.get_model('app', 'JobApplication')
+    keep_ids = (
+        JobApplication.objects.values('applicant', 'job')
+        .annotate(keep_id=Min('id'))
+        .values('keep_id')
+    )
+    JobApplication.objects.exclude(id__in=keep_ids).delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0003_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(remove_duplicate_applications, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='jobapplication',
+            name='jobapp_applicant_job_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='jobapplication',
+            constraint=models.UniqueConstraint(fields=('applicant', 'job'), name='jobapp_unique_applicant_job'),
+        ),
+    ]
@@ -0,0 +1,105 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:14
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# The SQL is copied from app/search.py as it was when this migration was
+# written, so later changes there do not alter what this migration does.
+
+PG_INSTALL_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION app_job_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.name, '') || ' ' || coalesce(NEW.post, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.category, '') || ' ' || coalesce(NEW.subcategory, '')
+                                              || ' ' || coalesce(NEW.skills_required, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.location, '') || ' ' || coalesce(NEW.qualifications, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'D');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS app_job_search_vector_trigger ON app_job",
+    """
+    CREATE TRIGGER app_job_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, post, category, subcategory, location,
+                               skills_required, qualifications, description
+    ON app_job FOR EACH ROW EXECUTE FUNCTION app_job_search_vector_update()
+    """,
+    "UPDATE app_job SET name = name WHERE search_vector IS NULL",
+    "CREATE INDEX IF NOT EXISTS app_job_search_vector_gin ON app_job USING gin (search_vector)",
+]
+
+PG_UNINSTALL_SQL = [
+    "DROP INDEX IF EXISTS app_job_search_vector_gin",
+    "DROP TRIGGER IF EXISTS app_job_search_vector_trigger ON app_job",
+    "DROP FUNCTION IF EXISTS app_job_search_vector_update()",
+]
+
+SQLITE_INSTALL_SQL = [
+    """
+    CREATE VIRTUAL TABLE IF NOT EXISTS app_job_fts USING fts5(
+        name, post, category, subcategory, location, skills_required, qualifications, description,
+        content='app_job', content_rowid='id', tokenize='porter unicode61')
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS app_job_fts_ai AFTER INSERT ON app_job BEGIN
+        INSERT INTO app_job_fts(rowid, name, post, category, subcategory, location, skills_required, qualifications, description)
+        VALUES (new.id, new.name, new.post, new.category, new.subcategory, new.location, new.skills_required, new.qualifications, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS app_job_fts_ad AFTER DELETE ON app_job BEGIN
+        INSERT INTO app_job_fts(app_job_fts, rowid, name, post, category, subcategory, location, skills_required, qualifications, description)
+        VALUES ('delete', old.id, old.name, old.post, old.category, old.subcategory, old.location, old.skills_required, old.qualifications, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS app_job_fts_au AFTER UPDATE ON app_job BEGIN
+        INSERT INTO app_job_fts(app_job_fts, rowid, name, post, category, subcategory, location, skills_required, qualifications, description)
+        VALUES ('delete', old.id, old.name, old.post, old.category, old.subcategory, old.location, old.skills_required, old.qualifications, old.description);
+        INSERT INTO app_job_fts(rowid, name, post, category, subcategory, location, skills_required, qualifications, description)
+        VALUES (new.id, new.name, new.post, new.category, new.subcategory, new.location, new.skills_required, new.qualifications, new.description);
+    END
+    """,
+    "INSERT INTO app_job_fts(app_job_fts) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL_SQL = [
+    "DROP TRIGGER IF EXISTS app_job_fts_ai",
+    "DROP TRIGGER IF EXISTS app_job_fts_ad",
+    "DROP TRIGGER IF EXISTS app_job_fts_au",
+    "DROP TABLE IF EXISTS app_job_fts",
+]
+
+
+def _run(schema_editor, statements):
+    statements = statements.get(schema_editor.connection.vendor, [])
+    with schema_editor.connection.cursor() as cursor:
+        for sql in statements:
+            cursor.execute(sql)
+
+
+def install(apps, schema_editor):
+    _run(schema_editor, {"postgresql": PG_INSTALL_SQL, "sqlite": SQLITE_INSTALL_SQL})
+
+
+def uninstall(apps, schema_editor):
+    _run(schema_editor, {"postgresql": PG_UNINSTALL_SQL, "sqlite": SQLITE_UNINSTALL_SQL})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0004_unique_job_application'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(install, uninstall),
+    ]
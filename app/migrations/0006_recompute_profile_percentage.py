@@ -0,0 +1,47 @@
+from django.db import migrations
+
+# Frozen copy of app/profile_completion.py as of this migration, so later
+# changes to which fields count do not change what it computes.
+COMPLETION_FIELDS = (
+    'first_name', 'last_name', 'spouse_name', 'dob', 'age', 'phone',
+    'mother_tongue', 'address', 'qualification', 'languages_known',
+    'schooling', 'working_experience_years', 'describing_experience',
+    'profile_picture', 'last_salary', 'expected_salary', 'reference_by_1',
+    'reference_by_2', 'joining_availability', 'aim_of_life', 'about_family',
+    'consolidated_college_marksheet', 'graducation_percentage',
+    'hss_marksheet', 'sslc_marksheet',
+)
+EMPTY_VALUES = frozenset({None, '', 0})
+
+
+def profile_completion(user):
+    filled = sum(1 for name in COMPLETION_FIELDS if getattr(user, name) not in EMPTY_VALUES)
+    return filled * 100 // len(COMPLETION_FIELDS)
+
+
+def recompute(apps, schema_editor):
+    # The dashboard and update_user used to disagree on which fields count;
+    # bring every stored percentage in line with the single definition.
+    User = apps.get_model('app', 'User')
+    batch = []
+    for user in User.objects.iterator(chunk_size=1000):
+        percentage = profile_completion(user)
+        if percentage != user.profile_percentage:
+            user.profile_percentage = percentage
+            batch.append(user)
+        if len(batch) >= 1000:
+            User.objects.bulk_update(batch, ['profile_percentage'])
+            batch = []
+    if batch:
+        User.objects.bulk_update(batch, ['profile_percentage'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0005_job_search'),
+    ]
+
+    operations = [
+        migrations.RunPython(recompute, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,64 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:27
+
+from django.db import migrations, models
+
+from app.application_counters import reconcile_counters
+
+
+def backfill(apps, schema_editor):
+    reconcile_counters(
+        user_model=apps.get_model('app', 'User'),
+        job_model=apps.get_model('app', 'Job'),
+        application_model=apps.get_model('app', 'JobApplication'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0006_recompute_profile_percentage'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='applications_hired',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='applications_pending',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='applications_rejected',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='job',
+            name='applications_shortlisted',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='applications_hired',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='applications_pending',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='applications_rejected',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='user',
+            name='applications_shortlisted',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:44
+
+from django.db import migrations, models
+
+from app.notifications import recount_unread
+
+
+def backfill(apps, schema_editor):
+    recount_unread(
+        user_model=apps.get_model('app', 'User'),
+        notification_model=apps.get_model('app', 'Notification'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0007_application_status_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='unread_notifications',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-18 13:57
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    # Existing jobs were last changed no later than they were posted as far as
+    # anyone can tell; using the migration time would invalidate every ETag.
+    Job = apps.get_model('app', 'Job')
+    Job.objects.update(updated_at=models.F('timestamp'))
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0009_job_recommendations'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='job',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='job',
+            index=models.Index(fields=['updated_at'], name='job_updated_idx'),
+        ),
+    ]
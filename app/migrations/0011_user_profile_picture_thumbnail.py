@@ -0,0 +1,39 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:18
+
+import app.uploads
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0010_job_updated_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='profile_picture_thumbnail',
+            field=models.ImageField(blank=True, editable=False, null=True, upload_to='profiles/thumbnails/'),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='consolidated_college_marksheet',
+            field=models.FileField(blank=True, null=True, upload_to='consolidated_mark_sheets/', validators=[app.uploads.validate_document_upload]),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='hss_marksheet',
+            field=models.FileField(blank=True, null=True, upload_to='hss_marksheets/', validators=[app.uploads.validate_document_upload]),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='profile_picture',
+            field=models.ImageField(blank=True, null=True, upload_to='profiles/', validators=[app.uploads.validate_image_upload]),
+        ),
+        migrations.AlterField(
+            model_name='user',
+            name='sslc_marksheet',
+            field=models.FileField(blank=True, null=True, upload_to='sslc_marksheets/', validators=[app.uploads.validate_document_upload]),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.6 on 2026-10-18 14:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('app', '0011_user_profile_picture_thumbnail'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UploadTask',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('field', models.CharField(choices=[('profile_picture', 'Profile picture'), ('sslc_marksheet', 'SSLC marksheet'), ('hss_marksheet', 'HSS marksheet'), ('consolidated_college_marksheet', 'College marksheet')], max_length=40)),
+                ('source', models.FileField(max_length=200, upload_to='uploads/pending/')),
+                ('original_name', models.CharField(blank=True, max_length=255)),
+                ('status', models.CharField(choices=[('queued', 'Queued'), ('processing', 'Processing'), ('done', 'Done'), ('failed', 'Failed')], default='queued', max_length=10)),
+                ('claimed_by', models.CharField(blank=True, max_length=64)),
+                ('attempts', models.PositiveSmallIntegerField(default=0)),
+                ('checksum', models.CharField(blank=True, max_length=64)),
+                ('error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='upload_tasks', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'id'], name='uploadtask_status_idx'), models.Index(fields=['user', '-id'], name='uploadtask_user_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.6 on 2026-10-18 16:02
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # Drops columns the OmeiatZones model no longer has. Their data is lost
+    # and cannot be restored by migrating backwards: back up the
+    # app_omeiatzones table's description, from_location and to_location
+    # columns before applying this if they still hold anything you need.
+
+    dependencies = [
+        ('app', '0013_uploadtask_superseded'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='omeiatzones',
+            name='description',
+        ),
+        migrations.RemoveField(
+            model_name='omeiatzones',
+            name='from_location',
+        ),
+        migrations.RemoveField(
+            model_name='omeiatzones',
+            name='to_location',
+        ),
+    ]
@@ -1,6 +1,10 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import AbstractUser
+from django.contrib.postgres.search import SearchVectorField
 from django.conf import settings
+from django.utils import timezone
+from app.profile_completion import completion_fields, profile_completion
+from app.uploads import validate_document_upload, validate_image_upload
 
 # ----------------------------
 # Omeiat Zones Model
@@ -62,10 +66,36 @@ class Institution(models.Model):
     def __str__(self):
         return self.name
         
+# ----------------------------
+# Application Status Counters
+# ----------------------------
+class ApplicationCounters(models.Model):
+    """
+    Per-status JobApplication counts, kept current on write by
+    app/application_counters.py so dashboards read them without aggregating.
+    """
+    applications_pending = models.PositiveIntegerField(default=0, editable=False)
+    applications_shortlisted = models.PositiveIntegerField(default=0, editable=False)
+    applications_hired = models.PositiveIntegerField(default=0, editable=False)
+    applications_rejected = models.PositiveIntegerField(default=0, editable=False)
+
+    class Meta:
+        abstract = True
+
+    @property
+    def application_status_counts(self):
+        return {
+            'pending': self.applications_pending,
+            'shortlisted': self.applications_shortlisted,
+            'hired': self.applications_hired,
+            'rejected': self.applications_rejected,
+        }
+
+
 # ----------------------------
 # Custom User Model
 # ----------------------------
-class User(AbstractUser):
+class User(AbstractUser, ApplicationCounters):
     spouse_name = models.CharField(max_length=100, blank=True)
     dob = models.DateField(null=True, blank=True)
     age = models.PositiveIntegerField(null=True, blank=True)
@@ -78,13 +108,16 @@ class User(AbstractUser):
     working_experience_years = models.PositiveIntegerField(null=True, blank=True)
     describing_experience = models.TextField(blank=True, null=True)
     profile_percentage = models.PositiveIntegerField(default=0)
+    unread_notifications = models.PositiveIntegerField(default=0, editable=False)  # see app/notifications.py
     profile_visibility = models.BooleanField(default=True)
     is_deleted = models.BooleanField(default=False)
-    profile_picture = models.ImageField(upload_to='profiles/', null=True, blank=True)
-    consolidated_college_marksheet = models.FileField(upload_to='consolidated_mark_sheets/', null=True, blank=True)
+    # Uploads go through app/uploads.py, which also fills the thumbnail.
+    profile_picture = models.ImageField(upload_to='profiles/', null=True, blank=True, validators=[validate_image_upload])
+    profile_picture_thumbnail = models.ImageField(upload_to='profiles/thumbnails/', null=True, blank=True, editable=False)
+    consolidated_college_marksheet = models.FileField(upload_to='consolidated_mark_sheets/', null=True, blank=True, validators=[validate_document_upload])
     graducation_percentage = models.PositiveIntegerField(default=0)
-    sslc_marksheet = models.FileField(upload_to='sslc_marksheets/', null=True, blank=True)
-    hss_marksheet = models.FileField(upload_to='hss_marksheets/', null=True, blank=True)
+    sslc_marksheet = models.FileField(upload_to='sslc_marksheets/', null=True, blank=True, validators=[validate_document_upload])
+    hss_marksheet = models.FileField(upload_to='hss_marksheets/', null=True, blank=True, validators=[validate_document_upload])
     last_salary = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     expected_salary = models.DecimalField(max_digits=10, decimal_places=2, null=True, blank=True)
     reference_by_1 = models.CharField(max_length=100, blank=True, null=True)
@@ -94,6 +127,16 @@ class User(AbstractUser):
     about_family = models.TextField(blank=True, null=True)
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    def save(self, *args, **kwargs):
+        # Keep profile_percentage current so pages can read it directly.
+        # Saves that touch no profile field (e.g. last_login) skip the work.
+        update_fields = kwargs.get('update_fields')
+        if update_fields is None or not completion_fields(type(self)).isdisjoint(update_fields):
+            self.profile_percentage = profile_completion(self)
+            if update_fields is not None:
+                kwargs['update_fields'] = {*update_fields, 'profile_percentage'}
+        super().save(*args, **kwargs)
+
     def __str__(self):
         return self.username
 
@@ -114,10 +157,29 @@ class WorkExperience(models.Model):
         return f"{self.user.username} at {self.name}"
 
 
+# ----------------------------
+# Job QuerySet
+# ----------------------------
+class JobQuerySet(models.QuerySet):
+    # Only the columns the job cards render; skips the large TextFields
+    # (description, skills_required, qualifications).
+    CARD_FIELDS = (
+        "id", "name", "post", "job_type", "experience_needed", "category",
+        "location", "salary_min", "salary_max", "application_deadline",
+        "timestamp", "posted_by__id", "posted_by__name",
+    )
+
+    def open(self):
+        return self.filter(is_active=True, application_deadline__gte=timezone.localdate())
+
+    def cards(self):
+        return self.select_related("posted_by").only(*self.CARD_FIELDS)
+
+
 # ----------------------------
 # Job Model
 # ----------------------------
-class Job(models.Model):
+class Job(ApplicationCounters):
     JOB_TYPE_CHOICES = [
         ('Full-time', 'Full-time'),
         ('Part-time', 'Part-time'),
@@ -142,11 +204,48 @@ class Job(models.Model):
     is_verified = models.BooleanField(default=False)
     is_active = models.BooleanField(default=True)
     timestamp = models.DateTimeField(auto_now_add=True)
+    # Drives Last-Modified/ETag on the job pages (app/conditional.py).
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by a database trigger on PostgreSQL; see app/search.py.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    objects = JobQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # Listing pages: open jobs, newest first (keyset on timestamp, id).
+            models.Index(
+                fields=['-timestamp', '-id'],
+                condition=models.Q(is_active=True),
+                name='job_active_recent_idx',
+            ),
+            models.Index(
+                fields=['application_deadline'],
+                condition=models.Q(is_active=True),
+                name='job_active_deadline_idx',
+            ),
+            # MAX(updated_at) for the listing pages' Last-Modified.
+            models.Index(fields=['updated_at'], name='job_updated_idx'),
+        ]
 
     def __str__(self):
         return self.name
 
 
+# ----------------------------
+# Job Application QuerySet
+# ----------------------------
+class JobApplicationQuerySet(models.QuerySet):
+    LISTING_FIELDS = (
+        "id", "status", "applied_at", "applicant_id",
+        "job__id", "job__name", "job__category",
+        "institution__id", "institution__name",
+    )
+
+    def listing(self):
+        return self.select_related("job", "institution").only(*self.LISTING_FIELDS)
+
+
 # ----------------------------
 # Job Application Model
 # ----------------------------
@@ -165,6 +264,35 @@ class JobApplication(models.Model):
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     timestamp = models.DateTimeField(auto_now_add=True)
 
+    objects = JobApplicationQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so a save can tell which counter moved.
+        instance._loaded_status = instance.__dict__.get('status')
+        return instance
+
+    def save(self, *args, **kwargs):
+        # Counters are adjusted by post_save; keep both in one transaction.
+        with transaction.atomic(using=kwargs.get('using')):
+            if not self._state.adding and getattr(self, '_loaded_status', None) is None:
+                # Loaded with status deferred (or built by hand): read it first.
+                self._loaded_status = (
+                    JobApplication.objects.filter(pk=self.pk).values_list('status', flat=True).first()
+                )
+            super().save(*args, **kwargs)
+        self._loaded_status = self.status
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['applicant', 'job'], name='jobapp_unique_applicant_job'),
+        ]
+        indexes = [
+            models.Index(fields=['applicant', '-applied_at'], name='jobapp_applicant_recent_idx'),
+            models.Index(fields=['applicant', 'status', '-applied_at'], name='jobapp_applicant_status_idx'),
+        ]
+
     def __str__(self):
         return f"{self.applicant.username} applied to {self.job.name}"
 
@@ -206,6 +334,9 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['recipient', '-created_at'], name='notif_recipient_recent_idx'),
+        ]
 
     def __str__(self):
         return f"To {self.recipient.username}: {self.message[:50]}"
@@ -227,3 +358,96 @@ class InstitutionApproval(models.Model):
     def __str__(self):
         status = "Approved" if self.is_approved else "Pending"
         return f"{self.institution.name} - {status}"
+
+
+# ----------------------------
+# Job Recommendation Models
+# ----------------------------
+class JobRecommendation(models.Model):
+    """
+    Precomputed top jobs per user (see app/recommendations.py); the
+    dashboard reads them with one indexed query.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='job_recommendations')
+    job = models.ForeignKey(Job, on_delete=models.CASCADE, related_name='recommendations')
+    score = models.FloatField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'job'], name='jobrec_unique_user_job'),
+        ]
+        indexes = [
+            models.Index(fields=['user', '-score'], name='jobrec_user_score_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.job_id} for {self.user_id} ({self.score:.2f})"
+
+
+class RecommendationRefresh(models.Model):
+    """
+    A user or job whose recommendations are stale, queued by signals and
+    drained by `manage.py refresh_recommendations`.
+    """
+    KIND_CHOICES = [
+        ('user', 'User'),
+        ('job', 'Job'),
+    ]
+
+    kind = models.CharField(max_length=4, choices=KIND_CHOICES)
+    object_id = models.PositiveIntegerField()
+    queued_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'object_id'], name='recrefresh_unique_kind_object'),
+        ]
+
+    def __str__(self):
+        return f"{self.kind} {self.object_id}"
+
+
+# ----------------------------
+# Upload processing queue
+# ----------------------------
+class UploadTask(models.Model):
+    """
+    A raw upload waiting for post-processing (see app/upload_queue.py). The
+    request only stores `source`; `manage.py process_uploads` validates it,
+    builds the final files on the user and records the outcome here.
+    """
+    STATUS_CHOICES = [
+        ('queued', 'Queued'),
+        ('processing', 'Processing'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+        ('superseded', 'Superseded'),  # a later upload for the same field won
+    ]
+    FIELD_CHOICES = [
+        ('profile_picture', 'Profile picture'),
+        ('sslc_marksheet', 'SSLC marksheet'),
+        ('hss_marksheet', 'HSS marksheet'),
+        ('consolidated_college_marksheet', 'College marksheet'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='upload_tasks')
+    field = models.CharField(max_length=40, choices=FIELD_CHOICES)
+    source = models.FileField(upload_to='uploads/pending/', max_length=200)
+    original_name = models.CharField(max_length=255, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='queued')
+    claimed_by = models.CharField(max_length=64, blank=True)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    checksum = models.CharField(max_length=64, blank=True)  # sha256 of the upload
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['status', 'id'], name='uploadtask_status_idx'),
+            models.Index(fields=['user', '-id'], name='uploadtask_user_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.field} for {self.user_id} ({self.status})"
@@ -0,0 +1,148 @@
+# notifications.py
+
+from collections import Counter, defaultdict
+from itertools import islice
+from typing import Iterable, Iterator, List
+
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+from django.urls import reverse
+
+from app.models import Job, JobApplication, Notification, User
+from app.tasks import run_in_background
+
+NOTIFICATION_BATCH_SIZE = 1000
+
+# JobApplication status -> Notification type.
+STATUS_NOTIFICATION_TYPES = {
+    "shortlisted": "shortlisted",
+    "hired": "hired",
+    "rejected": "rejected",
+}
+
+
+# ----------------------------
+# Unread counters
+# ----------------------------
+# User.unread_notifications is kept in step with the Notification table so
+# the navbar badge never has to COUNT(*). Inserts and the counter update
+# share a transaction; marking read takes the user row first, so a
+# concurrent fan-out either lands wholly before or wholly after it.
+
+def adjust_unread(recipient_counts: Counter) -> None:
+    """
+    Add recipient_counts[user_id] to each user's unread counter, with one
+    UPDATE per distinct delta (usually just one).
+    """
+    by_delta = defaultdict(list)
+    for user_id, delta in recipient_counts.items():
+        if delta:
+            by_delta[delta].append(user_id)
+    for delta, user_ids in by_delta.items():
+        if delta > 0:
+            User.objects.filter(id__in=user_ids).update(unread_notifications=F("unread_notifications") + delta)
+        else:
+            User.objects.filter(id__in=user_ids).update(
+                unread_notifications=Greatest(F("unread_notifications") + delta, Value(0)),
+            )
+
+
+def mark_all_read(user: User) -> int:
+    """
+    Mark every unread notification of `user` read with a single UPDATE.
+    Returns the number of notifications changed.
+    """
+    with transaction.atomic():
+        User.objects.filter(id=user.id).update(unread_notifications=0)
+        changed = Notification.objects.filter(recipient=user, is_read=False).update(is_read=True)
+    user.unread_notifications = 0
+    return changed
+
+
+def recount_unread(user_model=User, notification_model=Notification) -> None:
+    """
+    Rebuild every unread counter from the Notification table. Model arguments
+    let data migrations pass historical models.
+    """
+    counts = (
+        notification_model.objects.filter(recipient=OuterRef("pk"), is_read=False)
+        .order_by().values("recipient").annotate(count=Count("id")).values("count")
+    )
+    user_model.objects.update(unread_notifications=Coalesce(Subquery(counts), 0))
+
+
+def _bulk_insert(notifications: Iterator[Notification], batch_size: int) -> int:
+    created = 0
+    while batch := list(islice(notifications, batch_size)):
+        with transaction.atomic():
+            Notification.objects.bulk_create(batch)
+            adjust_unread(Counter(notification.recipient_id for notification in batch))
+        created += len(batch)
+    return created
+
+
+# ----------------------------
+# Job posted
+# ----------------------------
+def job_posted_recipients(job: Job):
+    """
+    Ids of applicants a new job is relevant to: active, visible profiles
+    with at least the experience the job asks for.
+    """
+    users = User.objects.filter(is_active=True, is_staff=False, is_deleted=False, profile_visibility=True)
+    if job.experience_needed:
+        users = users.filter(working_experience_years__gte=job.experience_needed)
+    return users.values_list("id", flat=True)
+
+
+def fan_out_job_posted(job_id: int, batch_size: int = NOTIFICATION_BATCH_SIZE) -> int:
+    job = Job.objects.select_related("posted_by").only(
+        "id", "name", "experience_needed", "posted_by__name",
+    ).filter(id=job_id, is_active=True).first()
+    if job is None:
+        return 0
+    message = f"New job: {job.name} at {job.posted_by.name}"
+    url = reverse("job_detail", args=[job.id])
+    notifications = (
+        Notification(recipient_id=user_id, notification_type="job_posted", message=message, url=url)
+        for user_id in job_posted_recipients(job).iterator(chunk_size=batch_size)
+    )
+    return _bulk_insert(notifications, batch_size)
+
+
+# ----------------------------
+# Application status changed
+# ----------------------------
+def fan_out_status_changes(application_ids: List[int], batch_size: int = NOTIFICATION_BATCH_SIZE) -> int:
+    rows = (
+        JobApplication.objects.filter(id__in=application_ids)
+        .values_list("applicant_id", "status", "job_id", "job__name", "job__posted_by__name")
+        .iterator(chunk_size=batch_size)
+    )
+    notifications = (
+        Notification(
+            recipient_id=applicant_id,
+            notification_type=STATUS_NOTIFICATION_TYPES.get(status, "application_status"),
+            message=f"Your application for {job_name} at {institution_name} is now {status}.",
+            url=reverse("job_detail", args=[job_id]),
+        )
+        for applicant_id, status, job_id, job_name, institution_name in rows
+    )
+    return _bulk_insert(notifications, batch_size)
+
+
+# ----------------------------
+# Events
+# ----------------------------
+# Callers publish events; recipients are found and notifications written by
+# a background worker after the caller's transaction commits.
+
+def job_posted(job: Job) -> None:
+    run_in_background(fan_out_job_posted, job.id)
+
+
+def application_status_changed(application_ids: Iterable[int]) -> None:
+    application_ids = list(application_ids)
+    if application_ids:
+        run_in_background(fan_out_status_changes, application_ids)
@@ -0,0 +1,96 @@
+# pagination.py
+
+import base64
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+from rest_framework.pagination import CursorPagination
+
+
+# ----------------------------
+# Keyset (cursor) pagination
+# ----------------------------
+# Pages are keyed on (timestamp, id) instead of OFFSET, so fetching page 500
+# costs the same as page 1: the database seeks straight to the cursor row
+# instead of scanning and discarding every row before it.
+
+class KeysetPage:
+    def __init__(self, object_list: List[Any], next_cursor: Optional[str]):
+        self.object_list = object_list
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+
+def encode_cursor(timestamp: datetime, pk: int) -> str:
+    """
+    Encode a (timestamp, id) pair into an opaque, URL-safe cursor.
+    """
+    raw = f"{timestamp.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Optional[Tuple[datetime, int]]:
+    """
+    Decode a cursor produced by encode_cursor(). Returns None for missing or
+    tampered cursors so callers fall back to the first page.
+    """
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        timestamp, pk = base64.urlsafe_b64decode(padded).decode().split("|", 1)
+        return datetime.fromisoformat(timestamp), int(pk)
+    except (ValueError, UnicodeDecodeError):
+        return None
+
+
+def paginate_keyset(queryset: QuerySet, cursor: Optional[str], per_page: int) -> KeysetPage:
+    """
+    Return the page of `queryset` that follows `cursor`, newest first.
+    The queryset must expose `timestamp` and `id`.
+    """
+    queryset = queryset.order_by("-timestamp", "-id")
+    position = decode_cursor(cursor)
+    if position is not None:
+        timestamp, pk = position
+        queryset = queryset.filter(
+            Q(timestamp__lt=timestamp) | Q(timestamp=timestamp, id__lt=pk)
+        )
+
+    # Fetch one extra row to learn whether a next page exists without a COUNT.
+    rows = list(queryset[: per_page + 1])
+    next_cursor = None
+    if len(rows) > per_page:
+        rows = rows[:per_page]
+        last = rows[-1]
+        next_cursor = encode_cursor(last.timestamp, last.id)
+    return KeysetPage(rows, next_cursor)
+
+
+# ----------------------------
+# API cursor pagination
+# ----------------------------
+# DRF's CursorPagination seeks on the viewset's `ordering` the same way, and
+# never runs a COUNT(*). Each viewset sets an ordering its indexes cover.
+
+class ApiCursorPagination(CursorPagination):
+    page_size = 20
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = "-id"
+
+    def get_ordering(self, request, queryset, view):
+        return getattr(view, "ordering", None) or self.ordering
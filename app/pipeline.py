@@ -0,0 +1,65 @@
+# pipeline.py
+
+from typing import Any, Dict, List
+
+from django.core.cache import cache
+from django.db.models import Count, IntegerField, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+
+from app.application_counters import STATUSES
+from app.caching import LISTING_CACHE_TIMEOUT, institution_cache_key
+from app.models import Job, JobShortlist
+
+JOB_FIELDS = ("id", "name", "post", "application_deadline", "is_active")
+COUNT_FIELDS = ("applicants", *STATUSES, "shortlist_size")
+
+
+# ----------------------------
+# Applicant pipeline per job
+# ----------------------------
+def pipeline_rows(institution_id: int) -> List[Dict[str, Any]]:
+    """
+    One row per job posted by the institution, newest first, with applicant
+    totals per status and the shortlist size. Everything comes from a single
+    query, however many jobs there are.
+    """
+    # Shortlists are counted in a subquery: joining them next to the
+    # applications would multiply the application counts.
+    shortlist_size = (
+        JobShortlist.users.through.objects.filter(jobshortlist__job=OuterRef("pk"))
+        .order_by()
+        .values("jobshortlist__job")
+        .annotate(size=Count("user", distinct=True))
+        .values("size")
+    )
+    statuses = {
+        status: Count("jobapplication", filter=Q(jobapplication__status=status))
+        for status in STATUSES
+    }
+    return list(
+        Job.objects.filter(posted_by_id=institution_id)
+        .annotate(
+            applicants=Count("jobapplication"),
+            shortlist_size=Coalesce(Subquery(shortlist_size, output_field=IntegerField()), 0),
+            **statuses,
+        )
+        .order_by("-timestamp", "-id")
+        .values(*JOB_FIELDS, *COUNT_FIELDS)
+    )
+
+
+def institution_pipeline(institution_id: int) -> Dict[str, Any]:
+    """
+    Cached pipeline rows plus their totals, rebuilt after the institution's
+    jobs, applications or shortlists change.
+    """
+    key = institution_cache_key(institution_id, "pipeline")
+    pipeline = cache.get(key)
+    if pipeline is None:
+        rows = pipeline_rows(institution_id)
+        pipeline = {
+            "jobs": rows,
+            "totals": {field: sum(row[field] for row in rows) for field in COUNT_FIELDS},
+        }
+        cache.set(key, pipeline, LISTING_CACHE_TIMEOUT)
+    return pipeline
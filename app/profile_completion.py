@@ -0,0 +1,40 @@
+# profile_completion.py
+
+from functools import lru_cache
+from typing import FrozenSet
+
+# ----------------------------
+# Profile completion
+# ----------------------------
+# Account bookkeeping fields never count towards completion.
+EXCLUDED_FIELDS = frozenset({
+    'id', 'password', 'last_login', 'is_superuser', 'username', 'email',
+    'is_staff', 'is_active', 'date_joined', 'profile_percentage',
+    'profile_visibility', 'is_deleted', 'timestamp',
+    'applications_pending', 'applications_shortlisted',
+    'applications_hired', 'applications_rejected', 'unread_notifications',
+    'profile_picture_thumbnail',
+})
+EMPTY_VALUES = frozenset({None, '', 0})
+
+
+@lru_cache(maxsize=None)
+def completion_fields(model) -> FrozenSet[str]:
+    """
+    Attribute names that make up a complete profile, computed once per model.
+    """
+    return frozenset(
+        field.attname for field in model._meta.concrete_fields
+        if field.attname not in EXCLUDED_FIELDS
+    )
+
+
+def profile_completion(user) -> int:
+    """
+    Percentage of completion fields that hold a value.
+    """
+    fields = completion_fields(type(user))
+    if not fields:
+        return 0
+    filled = sum(1 for name in fields if getattr(user, name) not in EMPTY_VALUES)
+    return filled * 100 // len(fields)
@@ -0,0 +1,164 @@
+# query_inspector.py
+
+import functools
+import json
+import logging
+import os
+import re
+import sys
+import time
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger("app.queries")
+
+# Statements Django issues around atomic blocks; repeating them is normal.
+_IGNORED = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACE = re.compile(r"\s+")
+_DJANGO_ROOT = os.path.dirname(os.path.dirname(sys.modules["django"].__file__))
+
+
+class NPlusOneError(AssertionError):
+    """Raised in strict mode when a request repeats a query."""
+
+
+# ----------------------------
+# Fingerprints
+# ----------------------------
+@functools.lru_cache(maxsize=4096)
+def fingerprint(sql: str) -> str:
+    """
+    The statement with every value replaced by `?` and IN lists collapsed,
+    so `WHERE id = 3` and `WHERE id = 7` (or IN lists of any length) match.
+    """
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _IN_LIST.sub("(...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+# ----------------------------
+# Call sites
+# ----------------------------
+def _template_frame(frame) -> Optional[str]:
+    # Node.render_annotated() runs every template node; its `self` knows the
+    # template and line that issued the query.
+    if frame.f_code.co_name == "render_annotated":
+        node = frame.f_locals.get("self")
+        origin = getattr(node, "origin", None)
+        token = getattr(node, "token", None)
+        if origin is not None and token is not None:
+            return f"{origin.template_name}:{token.lineno}"
+    return None
+
+
+def call_site(limit: int = 8) -> Dict[str, List[str]]:
+    """Project frames (innermost first) and the template line, if any."""
+    frames, templates = [], []
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        template = _template_frame(frame)
+        if template and template not in templates:
+            templates.append(template)
+        elif (not filename.startswith(_DJANGO_ROOT) and "site-packages" not in filename
+              and filename != __file__ and len(frames) < limit):
+            frames.append(f"{os.path.relpath(filename, settings.BASE_DIR)}:{frame.f_lineno} in {frame.f_code.co_name}")
+        frame = frame.f_back
+    return {"python": frames, "templates": templates}
+
+
+# ----------------------------
+# Inspector
+# ----------------------------
+class QueryInspector:
+    """
+    connection.execute_wrapper() hook that counts fingerprints and times
+    statements. The call site is captured only for the first repeat of a
+    fingerprint and for slow statements, so ordinary queries pay for a
+    regex lookup (cached) and a counter increment.
+    """
+
+    def __init__(self, duplicate_threshold: int = 2, slow_ms: float = 100):
+        self.duplicate_threshold = duplicate_threshold
+        self.slow = slow_ms / 1000
+        self.counts: Counter = Counter()
+        self.samples: Dict[str, Dict] = {}
+        self.slow_queries: List[Dict] = []
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            if not sql.lstrip().upper().startswith(_IGNORED):
+                key = fingerprint(sql)
+                self.counts[key] += 1
+                if self.counts[key] == self.duplicate_threshold:
+                    self.samples[key] = {"sql": sql, "stack": call_site()}
+                if elapsed >= self.slow:
+                    self.slow_queries.append({
+                        "sql": sql, "duration_ms": round(elapsed * 1000, 1), "stack": call_site(),
+                    })
+
+    @property
+    def duplicates(self) -> List[Dict]:
+        return [
+            {"fingerprint": key, "count": count, **self.samples[key]}
+            for key, count in self.counts.most_common()
+            if count >= self.duplicate_threshold
+        ]
+
+    def report(self, label: str) -> None:
+        for duplicate in self.duplicates:
+            logger.warning(json.dumps({"event": "duplicate_query", "where": label, **duplicate}))
+        for query in self.slow_queries:
+            logger.warning(json.dumps({"event": "slow_query", "where": label, **query}))
+
+    def check(self, label: str) -> None:
+        duplicates = self.duplicates
+        if duplicates:
+            lines = [
+                f"{item['count']}x {item['fingerprint']}\n    at {item['stack']['templates'] or item['stack']['python'][:3]}"
+                for item in duplicates
+            ]
+            raise NPlusOneError(f"Repeated queries in {label}:\n" + "\n".join(lines))
+
+
+def new_inspector(**options) -> QueryInspector:
+    options.setdefault("duplicate_threshold", settings.QUERY_INSPECTOR_DUPLICATE_THRESHOLD)
+    options.setdefault("slow_ms", settings.QUERY_INSPECTOR_SLOW_MS)
+    return QueryInspector(**options)
+
+
+@contextmanager
+def installed(inspector: QueryInspector):
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(inspector))
+        yield inspector
+
+
+@contextmanager
+def inspect_queries(label: str = "block", strict: Optional[bool] = None, **options):
+    """
+    Inspect every query run inside the block, log what was found and, in
+    strict mode, raise NPlusOneError on repeated queries.
+    """
+    if strict is None:
+        strict = settings.QUERY_INSPECTOR_STRICT
+    with installed(new_inspector(**options)) as inspector:
+        yield inspector
+    inspector.report(label)
+    if strict:
+        inspector.check(label)
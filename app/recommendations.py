@@ -0,0 +1,205 @@
+# recommendations.py
+
+from collections import defaultdict
+from itertools import islice
+from typing import Dict, Iterable, List, Sequence, Set
+
+import numpy as np
+from django.db import transaction
+from django.db.models import Count, F, Min, QuerySet, Window
+from django.db.models.functions import RowNumber
+from django.utils import timezone
+
+from app.matching import CandidateMatrix
+from app.models import Job, JobApplication, JobRecommendation, RecommendationRefresh, User
+
+RECOMMENDATIONS_PER_USER = 12
+# Added to the match score of jobs in a category the user has applied to.
+HISTORY_BONUS = 0.1
+REFRESH_USER_BATCH = 500
+JOB_BLOCK = 1000
+JOB_FIELDS = (
+    "id", "category", "experience_needed", "salary_max",
+    "skills_required", "qualifications", "location",
+)
+
+
+# ----------------------------
+# Queueing
+# ----------------------------
+# Signals (app/signals.py) queue users whose profile or applications changed
+# and jobs that were saved; refresh() only recomputes what was queued.
+
+def queue_refresh(kind: str, object_ids: Iterable[int]) -> None:
+    # Re-queueing an entry moves its queued_at, which tells a refresh() that
+    # is already running not to drop it.
+    RecommendationRefresh.objects.bulk_create(
+        [RecommendationRefresh(kind=kind, object_id=object_id) for object_id in set(object_ids)],
+        update_conflicts=True, unique_fields=["kind", "object_id"], update_fields=["queued_at"],
+    )
+
+
+def candidates() -> QuerySet:
+    return User.objects.filter(is_active=True, is_staff=False, is_deleted=False, profile_visibility=True)
+
+
+def _applied_categories(user_ids: Sequence[int]) -> Dict[int, Set[str]]:
+    history = defaultdict(set)
+    rows = JobApplication.objects.filter(applicant_id__in=user_ids).values_list("applicant_id", "job__category")
+    for user_id, category in rows:
+        history[user_id].add(category)
+    return history
+
+
+def _save_rows(rows: List[JobRecommendation]) -> None:
+    JobRecommendation.objects.bulk_create(rows, batch_size=1000, ignore_conflicts=True)
+
+
+def _trim(user_ids: Sequence[int], keep: int) -> None:
+    """Delete all but each user's `keep` best rows."""
+    extra = (
+        JobRecommendation.objects.filter(user_id__in=user_ids)
+        .annotate(position=Window(RowNumber(), partition_by=F("user_id"), order_by=[F("score").desc(), F("job_id")]))
+        .filter(position__gt=keep)
+        .values_list("id", flat=True)
+    )
+    JobRecommendation.objects.filter(id__in=list(extra)).delete()
+
+
+# ----------------------------
+# Per-user refresh
+# ----------------------------
+def refresh_users(user_ids: Sequence[int], top: int = RECOMMENDATIONS_PER_USER) -> int:
+    """
+    Recompute the full top-`top` list for these users against every open
+    job. Jobs are scored in blocks, keeping a running top list per user, so
+    memory is bounded by the block size rather than the number of jobs.
+    """
+    matrix = CandidateMatrix.load(candidates().filter(id__in=user_ids))
+    written = 0
+    with transaction.atomic():
+        JobRecommendation.objects.filter(user_id__in=user_ids).delete()
+        if not len(matrix):
+            return 0
+
+        batch_ids = matrix.user_ids
+        position = {int(user_id): i for i, user_id in enumerate(batch_ids)}
+        history = _applied_categories(list(position))
+        category_masks = defaultdict(lambda: np.zeros(len(batch_ids), dtype=bool))
+        for user_id, categories in history.items():
+            for category in categories:
+                category_masks[category][position[user_id]] = True
+        applied = defaultdict(list)
+        for user_id, job_id in JobApplication.objects.filter(applicant_id__in=list(position)).values_list("applicant_id", "job_id"):
+            applied[job_id].append(position[user_id])
+
+        best_scores = np.full((0, len(batch_ids)), -1.0)
+        best_jobs = np.zeros((0, len(batch_ids)), dtype=np.int64)
+        jobs = Job.objects.open().only(*JOB_FIELDS).iterator(chunk_size=JOB_BLOCK)
+        while block := list(islice(jobs, JOB_BLOCK)):
+            scores = np.empty((len(block), len(batch_ids)))
+            for row, job in enumerate(block):
+                scores[row] = matrix.score(job)
+                if job.category in category_masks:
+                    scores[row] += HISTORY_BONUS * category_masks[job.category]
+                if job.id in applied:
+                    scores[row, applied[job.id]] = -1.0
+            job_ids = np.repeat(np.array([job.id for job in block], dtype=np.int64)[:, None], len(batch_ids), axis=1)
+            best_scores = np.vstack((best_scores, scores))
+            best_jobs = np.vstack((best_jobs, job_ids))
+            if len(best_scores) > top:
+                keep = np.argpartition(-best_scores, top - 1, axis=0)[:top]
+                best_scores = np.take_along_axis(best_scores, keep, axis=0)
+                best_jobs = np.take_along_axis(best_jobs, keep, axis=0)
+
+        rows = [
+            JobRecommendation(user_id=int(batch_ids[col]), job_id=int(best_jobs[row, col]), score=round(float(best_scores[row, col]), 4))
+            for col in range(len(batch_ids))
+            for row in range(len(best_scores))
+            if best_scores[row, col] >= 0
+        ]
+        _save_rows(rows)
+        written = len(rows)
+    return written
+
+
+# ----------------------------
+# Per-job refresh
+# ----------------------------
+def refresh_jobs(job_ids: Sequence[int], top: int = RECOMMENDATIONS_PER_USER) -> int:
+    """
+    Fold changed jobs into existing lists: drop closed or deleted jobs,
+    re-score open ones against every candidate, and insert them only for
+    users whose current list they would enter, then trim those lists.
+    """
+    jobs = list(Job.objects.open().filter(id__in=job_ids).only(*JOB_FIELDS))
+    written = 0
+    with transaction.atomic():
+        JobRecommendation.objects.filter(job_id__in=job_ids).delete()
+        if not jobs:
+            return 0
+
+        matrix = CandidateMatrix.load(candidates())
+        if not len(matrix):
+            return 0
+        floor = np.full(len(matrix), -1.0)  # score a job must beat to enter each list
+        position = {int(user_id): i for i, user_id in enumerate(matrix.user_ids)}
+        lists = JobRecommendation.objects.values("user_id").annotate(size=Count("id"), low=Min("score")).order_by()
+        for entry in lists:
+            if entry["size"] >= top and entry["user_id"] in position:
+                floor[position[entry["user_id"]]] = entry["low"]
+
+        touched = set()
+        for job in jobs:
+            scores = matrix.score(job)
+            history = JobApplication.objects.filter(job__category=job.category).values_list("applicant_id", flat=True).distinct()
+            bonus = [position[user_id] for user_id in history if user_id in position]
+            scores[bonus] += HISTORY_BONUS
+            applied = [position[user_id] for user_id in JobApplication.objects.filter(job=job).values_list("applicant_id", flat=True) if user_id in position]
+            scores[applied] = -1.0
+
+            entering = np.nonzero(scores > floor)[0]
+            _save_rows([
+                JobRecommendation(user_id=int(matrix.user_ids[i]), job_id=job.id, score=round(float(scores[i]), 4))
+                for i in entering
+            ])
+            touched.update(int(matrix.user_ids[i]) for i in entering)
+            written += len(entering)
+
+        touched = list(touched)
+        for start in range(0, len(touched), REFRESH_USER_BATCH):
+            _trim(touched[start:start + REFRESH_USER_BATCH], top)
+    return written
+
+
+# ----------------------------
+# Draining the queue
+# ----------------------------
+def refresh(batch_size: int = REFRESH_USER_BATCH, top: int = RECOMMENDATIONS_PER_USER) -> Dict[str, int]:
+    """
+    Process everything queued so far. Entries queued or re-queued while
+    this runs stay for the next run.
+    """
+    started = timezone.now()
+    last = RecommendationRefresh.objects.order_by("-id").values_list("id", flat=True).first()
+    if last is None:
+        return {"users": 0, "jobs": 0, "rows": 0}
+    # Only entries whose queued_at has not moved since `started` are done.
+    queued = RecommendationRefresh.objects.filter(id__lte=last, queued_at__lt=started)
+    job_ids = list(queued.filter(kind="job").values_list("object_id", flat=True))
+    user_ids = list(queued.filter(kind="user").values_list("object_id", flat=True))
+
+    rows = refresh_jobs(job_ids, top) if job_ids else 0
+    for start in range(0, len(user_ids), batch_size):
+        rows += refresh_users(user_ids[start:start + batch_size], top)
+    queued.delete()
+    return {"users": len(user_ids), "jobs": len(job_ids), "rows": rows}
+
+
+def recommended_jobs(user, limit: int = RECOMMENDATIONS_PER_USER):
+    """Open jobs recommended to `user`, best first, as card querysets."""
+    return (
+        Job.objects.open().cards()
+        .filter(recommendations__user=user)
+        .order_by("-recommendations__score", "-id")[:limit]
+    )
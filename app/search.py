@@ -0,0 +1,224 @@
+# search.py
+
+import re
+from typing import Any, List
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, Q
+from django.utils import timezone
+
+from app.models import Job
+
+SEARCH_RESULTS_PER_PAGE = 20
+SEARCH_MAX_PAGE = 50
+
+# Column order matters: it is the FTS5 column order and the bm25() weight order.
+SEARCH_FIELDS = (
+    "name", "post", "category", "subcategory", "location",
+    "skills_required", "qualifications", "description",
+)
+SEARCH_WEIGHTS = (10.0, 8.0, 4.0, 4.0, 2.0, 4.0, 2.0, 1.0)
+
+
+# ----------------------------
+# Index maintenance
+# ----------------------------
+# PostgreSQL keeps Job.search_vector up to date with a trigger and serves it
+# from a GIN index. SQLite (local development and tests) gets an external
+# content FTS5 table kept in sync by triggers. Both are created by migration
+# 0005 (from its own frozen copy of this SQL) and re-checked after every
+# migrate that leaves 0005 applied: SQLite drops a table's triggers whenever
+# Django rebuilds that table to alter a column.
+
+PG_INSTALL_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION app_job_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.name, '') || ' ' || coalesce(NEW.post, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.category, '') || ' ' || coalesce(NEW.subcategory, '')
+                                              || ' ' || coalesce(NEW.skills_required, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.location, '') || ' ' || coalesce(NEW.qualifications, '')), 'C') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'D');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS app_job_search_vector_trigger ON app_job",
+    """
+    CREATE TRIGGER app_job_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF name, post, category, subcategory, location,
+                               skills_required, qualifications, description
+    ON app_job FOR EACH ROW EXECUTE FUNCTION app_job_search_vector_update()
+    """,
+    "UPDATE app_job SET name = name WHERE search_vector IS NULL",
+    "CREATE INDEX IF NOT EXISTS app_job_search_vector_gin ON app_job USING gin (search_vector)",
+]
+
+PG_UNINSTALL_SQL = [
+    "DROP INDEX IF EXISTS app_job_search_vector_gin",
+    "DROP TRIGGER IF EXISTS app_job_search_vector_trigger ON app_job",
+    "DROP FUNCTION IF EXISTS app_job_search_vector_update()",
+]
+
+_columns = ", ".join(SEARCH_FIELDS)
+_new_values = ", ".join(f"new.{field}" for field in SEARCH_FIELDS)
+_old_values = ", ".join(f"old.{field}" for field in SEARCH_FIELDS)
+
+SQLITE_TRIGGERS = {
+    "app_job_fts_ai": f"""
+        CREATE TRIGGER IF NOT EXISTS app_job_fts_ai AFTER INSERT ON app_job BEGIN
+            INSERT INTO app_job_fts(rowid, {_columns}) VALUES (new.id, {_new_values});
+        END
+    """,
+    "app_job_fts_ad": f"""
+        CREATE TRIGGER IF NOT EXISTS app_job_fts_ad AFTER DELETE ON app_job BEGIN
+            INSERT INTO app_job_fts(app_job_fts, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+        END
+    """,
+    "app_job_fts_au": f"""
+        CREATE TRIGGER IF NOT EXISTS app_job_fts_au AFTER UPDATE ON app_job BEGIN
+            INSERT INTO app_job_fts(app_job_fts, rowid, {_columns}) VALUES ('delete', old.id, {_old_values});
+            INSERT INTO app_job_fts(rowid, {_columns}) VALUES (new.id, {_new_values});
+        END
+    """,
+}
+
+
+def install_search_backend(conn=connection) -> None:
+    """
+    Create (or repair) the full-text index for the active database backend.
+    Safe to call repeatedly.
+    """
+    with conn.cursor() as cursor:
+        if conn.vendor == "postgresql":
+            for sql in PG_INSTALL_SQL:
+                cursor.execute(sql)
+        elif conn.vendor == "sqlite":
+            cursor.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS app_job_fts USING fts5("
+                f"{_columns}, content='app_job', content_rowid='id', tokenize='porter unicode61')"
+            )
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = 'app_job'"
+            )
+            existing = {row[0] for row in cursor.fetchall()}
+            missing = [name for name in SQLITE_TRIGGERS if name not in existing]
+            for name in missing:
+                cursor.execute(SQLITE_TRIGGERS[name])
+            if missing:
+                # Rows written while the triggers were absent are not indexed.
+                cursor.execute("INSERT INTO app_job_fts(app_job_fts) VALUES ('rebuild')")
+
+
+def uninstall_search_backend(conn=connection) -> None:
+    with conn.cursor() as cursor:
+        if conn.vendor == "postgresql":
+            for sql in PG_UNINSTALL_SQL:
+                cursor.execute(sql)
+        elif conn.vendor == "sqlite":
+            for name in SQLITE_TRIGGERS:
+                cursor.execute(f"DROP TRIGGER IF EXISTS {name}")
+            cursor.execute("DROP TABLE IF EXISTS app_job_fts")
+
+
+# ----------------------------
+# Querying
+# ----------------------------
+class SearchPage:
+    def __init__(self, object_list: List[Any], number: int, has_next: bool):
+        self.object_list = object_list
+        self.number = number
+        self.has_next = has_next
+
+    @property
+    def has_previous(self) -> bool:
+        return self.number > 1
+
+    @property
+    def next_page_number(self) -> int:
+        return self.number + 1
+
+    @property
+    def previous_page_number(self) -> int:
+        return self.number - 1
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+
+def _terms(query: str) -> List[str]:
+    return re.findall(r"\w+", query.lower())
+
+
+def _search_postgres(query: str, offset: int, limit: int) -> List[Job]:
+    search_query = SearchQuery(query, search_type="websearch", config="english")
+    jobs = (
+        Job.objects.open().cards()
+        .filter(search_vector=search_query)
+        .annotate(rank=SearchRank(F("search_vector"), search_query))
+        .order_by("-rank", "-id")
+    )
+    return list(jobs[offset:offset + limit])
+
+
+def _search_sqlite(query: str, offset: int, limit: int) -> List[Job]:
+    # Quote every term so user input can never be parsed as FTS5 syntax;
+    # the last term is a prefix match to support type-ahead.
+    terms = [f'"{term}"' for term in _terms(query)]
+    terms[-1] += "*"
+    weights = ", ".join(str(weight) for weight in SEARCH_WEIGHTS)
+    sql = f"""
+        SELECT app_job_fts.rowid
+        FROM app_job_fts
+        JOIN app_job ON app_job.id = app_job_fts.rowid
+        WHERE app_job_fts MATCH %s
+          AND app_job.is_active
+          AND app_job.application_deadline >= %s
+        ORDER BY bm25(app_job_fts, {weights}), app_job.id DESC
+        LIMIT %s OFFSET %s
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(sql, [" ".join(terms), timezone.localdate().isoformat(), limit, offset])
+        ids = [row[0] for row in cursor.fetchall()]
+    jobs = Job.objects.cards().in_bulk(ids)
+    return [jobs[pk] for pk in ids if pk in jobs]
+
+
+def _search_fallback(query: str, offset: int, limit: int) -> List[Job]:
+    condition = Q()
+    for term in _terms(query):
+        term_condition = Q()
+        for field in SEARCH_FIELDS:
+            term_condition |= Q(**{f"{field}__icontains": term})
+        condition &= term_condition
+    jobs = Job.objects.open().cards().filter(condition).order_by("-timestamp", "-id")
+    return list(jobs[offset:offset + limit])
+
+
+def search_jobs(query: str, page: int = 1, per_page: int = SEARCH_RESULTS_PER_PAGE) -> SearchPage:
+    """
+    Return one page of open jobs matching `query`, best match first.
+    """
+    page = min(max(page, 1), SEARCH_MAX_PAGE)
+    if not _terms(query):
+        return SearchPage([], page, False)
+
+    if connection.vendor == "postgresql":
+        backend = _search_postgres
+    elif connection.vendor == "sqlite":
+        backend = _search_sqlite
+    else:
+        backend = _search_fallback
+
+    # Fetch one extra row to learn whether a next page exists without a COUNT.
+    rows = backend(query, (page - 1) * per_page, per_page + 1)
+    has_next = len(rows) > per_page and page < SEARCH_MAX_PAGE
+    return SearchPage(rows[:per_page], page, has_next)
@@ -1,27 +1,115 @@
 from rest_framework import serializers
-from .models import *
-
-class UserSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = User
-        fields = '__all__'
-        
-class JobPostSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = JobPost
-        fields = '__all__'
-
-class OrganizationSerializer(serializers.ModelSerializer):
-    class Meta:
-        model = Organization
-        fields = '__all__'
-
-class JobCategorySerializer(serializers.ModelSerializer):
-    class Meta:
-        model = JobCategory
-        fields = '__all__'
-
-class JobSubCategorySerializer(serializers.ModelSerializer):
-    class Meta:
-        model = JobSubCategory
-        fields = '__all__'
+
+from .models import Job
+
+
+# ----------------------------
+# Sparse fieldsets
+# ----------------------------
+# `?fields=id,name` trims the response to those fields. The API viewsets
+# use sparse_columns() to load only the matching columns as well.
+
+def requested_fields(request):
+    if request is None:
+        return None
+    fields = request.query_params.get("fields", "")
+    fields = {name.strip() for name in fields.split(",") if name.strip()}
+    return fields or None
+
+
+class SparseFieldsMixin:
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        wanted = requested_fields(self.context.get("request"))
+        if wanted:
+            for name in set(self.fields) - wanted:
+                self.fields.pop(name)
+
+
+def sparse_columns(serializer):
+    """Model columns (for only()) behind the serializer's remaining fields."""
+    columns = {"id"}
+    for field in serializer.fields.values():
+        if field.source != "*":
+            columns.add(field.source.replace(".", "__"))
+    return columns
+
+
+# ----------------------------
+# Read serializers
+# ----------------------------
+# Plain Serializers with explicit read-only fields: no model introspection
+# and no per-row relation lookups on the list endpoints.
+
+class InstitutionSerializer(SparseFieldsMixin, serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    category = serializers.CharField(read_only=True)
+    city = serializers.CharField(read_only=True)
+    district = serializers.CharField(read_only=True)
+    state = serializers.CharField(read_only=True)
+    board = serializers.CharField(read_only=True)
+    website = serializers.URLField(read_only=True)
+    is_omeiat_member = serializers.BooleanField(read_only=True)
+
+
+class InstitutionDetailSerializer(InstitutionSerializer):
+    address = serializers.CharField(read_only=True)
+    email = serializers.EmailField(read_only=True)
+    phone = serializers.CharField(read_only=True)
+    country = serializers.CharField(read_only=True)
+    pincode = serializers.IntegerField(read_only=True)
+    year_established = serializers.IntegerField(read_only=True)
+    no_of_students = serializers.IntegerField(read_only=True)
+    recruitment_contact = serializers.CharField(read_only=True)
+    principal_name = serializers.CharField(read_only=True)
+
+
+class JobSerializer(SparseFieldsMixin, serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    name = serializers.CharField(read_only=True)
+    post = serializers.CharField(read_only=True)
+    job_type = serializers.CharField(read_only=True)
+    category = serializers.CharField(read_only=True)
+    experience_needed = serializers.IntegerField(read_only=True)
+    location = serializers.CharField(read_only=True)
+    salary_min = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    salary_max = serializers.DecimalField(max_digits=10, decimal_places=2, read_only=True)
+    application_deadline = serializers.DateField(read_only=True)
+    timestamp = serializers.DateTimeField(read_only=True)
+    institution_id = serializers.IntegerField(source="posted_by_id", read_only=True)
+    institution_name = serializers.CharField(source="posted_by.name", read_only=True)
+
+
+class JobDetailSerializer(JobSerializer):
+    subcategory = serializers.CharField(read_only=True)
+    description = serializers.CharField(read_only=True)
+    skills_required = serializers.CharField(read_only=True)
+    qualifications = serializers.CharField(read_only=True)
+
+
+class JobApplicationSerializer(SparseFieldsMixin, serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    status = serializers.CharField(read_only=True)
+    applied_at = serializers.DateTimeField(read_only=True)
+    job_id = serializers.IntegerField(read_only=True)
+    job_name = serializers.CharField(source="job.name", read_only=True)
+    job_category = serializers.CharField(source="job.category", read_only=True)
+    institution_id = serializers.IntegerField(read_only=True)
+    institution_name = serializers.CharField(source="institution.name", read_only=True)
+
+
+class NotificationSerializer(SparseFieldsMixin, serializers.Serializer):
+    id = serializers.IntegerField(read_only=True)
+    notification_type = serializers.CharField(read_only=True)
+    message = serializers.CharField(read_only=True)
+    url = serializers.CharField(read_only=True)
+    is_read = serializers.BooleanField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+
+
+# ----------------------------
+# Write serializers
+# ----------------------------
+class ApplySerializer(serializers.Serializer):
+    job = serializers.PrimaryKeyRelatedField(queryset=Job.objects.filter(is_active=True).only("id", "posted_by_id"))
@@ -0,0 +1,155 @@
+from collections import Counter
+
+from django.db.models.signals import m2m_changed, post_delete, post_init, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from app.application_counters import adjust_counters, status_changed
+from app.caching import bump_institution_version, bump_jobs_version
+from app.notifications import adjust_unread, application_status_changed
+from app.models import Institution, Job, JobApplication, JobRecommendation, JobShortlist, Notification, User
+from app.profile_completion import completion_fields
+from app.recommendations import queue_refresh
+
+
+# ----------------------------
+# Job listing caches
+# ----------------------------
+# Cards show institution names, so institution edits that change one
+# invalidate too; other profile edits leave listings and their ETags alone.
+JOB_PAGE_INSTITUTION_FIELDS = ("name",)
+
+
+def _job_page_values(institution):
+    # Deferred fields read as None rather than costing a query.
+    return tuple(institution.__dict__.get(field) for field in JOB_PAGE_INSTITUTION_FIELDS)
+
+
+@receiver([post_save, post_delete], sender=Job)
+@receiver(post_delete, sender=Institution)
+def job_listing_changed(sender, **kwargs):
+    bump_jobs_version()
+
+
+@receiver(post_init, sender=Institution)
+def remember_job_page_values(sender, instance, **kwargs):
+    instance._job_page_values = _job_page_values(instance)
+
+
+@receiver(post_save, sender=Institution)
+def institution_changed(sender, instance, created, update_fields=None, **kwargs):
+    shown = _job_page_values(instance)
+    changed = shown != instance._job_page_values
+    instance._job_page_values = shown
+    if created or not changed:
+        return
+    if update_fields is not None and set(update_fields).isdisjoint(JOB_PAGE_INSTITUTION_FIELDS):
+        return
+    # Job pages show the institution, so their Last-Modified/ETag must move.
+    Job.objects.filter(posted_by=instance).update(updated_at=timezone.now())
+    bump_jobs_version()
+
+
+# ----------------------------
+# Institution dashboard
+# ----------------------------
+@receiver([post_save, post_delete], sender=Job)
+def institution_jobs_changed(sender, instance, **kwargs):
+    bump_institution_version(instance.posted_by_id)
+
+
+@receiver([post_save, post_delete], sender=JobApplication)
+@receiver([post_save, post_delete], sender=JobShortlist)
+def institution_pipeline_changed(sender, instance, **kwargs):
+    bump_institution_version(instance.institution_id)
+
+
+@receiver(m2m_changed, sender=JobShortlist.users.through)
+def shortlist_users_changed(sender, instance, action, reverse, model, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith("post_"):
+            bump_institution_version(instance.institution_id)
+        return
+    # user.shortlisted_jobs.<action>(...): pk_set holds shortlist ids, except
+    # for clear(), whose shortlists are looked up before they are unlinked.
+    if action == "pre_clear":
+        instance._cleared_institutions = set(
+            JobShortlist.objects.filter(users=instance).values_list("institution_id", flat=True)
+        )
+    elif action == "post_clear":
+        for institution_id in instance.__dict__.pop("_cleared_institutions", ()):
+            bump_institution_version(institution_id)
+    elif action in ("post_add", "post_remove"):
+        for institution_id in set(model.objects.filter(pk__in=pk_set).values_list("institution_id", flat=True)):
+            bump_institution_version(institution_id)
+
+
+# ----------------------------
+# Application status counters
+# ----------------------------
+@receiver(post_save, sender=JobApplication)
+def application_saved(sender, instance, created, **kwargs):
+    old_status = None if created else getattr(instance, "_loaded_status", None)
+    status_changed(instance, old_status)
+
+
+@receiver(post_delete, sender=JobApplication)
+def application_deleted(sender, instance, **kwargs):
+    status = getattr(instance, "_loaded_status", None) or instance.status
+    adjust_counters(instance.applicant_id, instance.job_id, {status: -1})
+
+
+# ----------------------------
+# Notifications
+# ----------------------------
+@receiver(post_save, sender=JobApplication)
+def notify_status_change(sender, instance, created, **kwargs):
+    # Runs before JobApplication.save() refreshes _loaded_status.
+    if not created and getattr(instance, "_loaded_status", None) not in (None, instance.status):
+        application_status_changed([instance.id])
+
+
+# Single saves/deletes; bulk fan-out adjusts the counters itself.
+@receiver(post_save, sender=Notification)
+def notification_created(sender, instance, created, **kwargs):
+    if created and not instance.is_read:
+        adjust_unread(Counter({instance.recipient_id: 1}))
+
+
+@receiver(post_delete, sender=Notification)
+def notification_deleted(sender, instance, **kwargs):
+    if not instance.is_read:
+        adjust_unread(Counter({instance.recipient_id: -1}))
+
+
+# ----------------------------
+# Recommendations
+# ----------------------------
+# Only queue work here; `manage.py refresh_recommendations` does it.
+@receiver(post_save, sender=User)
+def profile_changed(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or not completion_fields(User).isdisjoint(update_fields):
+        queue_refresh("user", [instance.pk])
+
+
+@receiver(post_save, sender=Job)
+def job_changed(sender, instance, **kwargs):
+    queue_refresh("job", [instance.pk])
+
+
+@receiver(pre_delete, sender=Job)
+def job_removed(sender, instance, **kwargs):
+    # The cascade takes the rows with it; refill the lists they were on.
+    queue_refresh("user", JobRecommendation.objects.filter(job=instance).values_list("user_id", flat=True))
+
+
+@receiver(post_save, sender=JobApplication)
+def application_changes_history(sender, instance, created, **kwargs):
+    if created:
+        JobRecommendation.objects.filter(user_id=instance.applicant_id, job_id=instance.job_id).delete()
+        queue_refresh("user", [instance.applicant_id])
+
+
+@receiver(post_delete, sender=JobApplication)
+def application_withdrawn(sender, instance, **kwargs):
+    queue_refresh("user", [instance.applicant_id])
@@ -0,0 +1,237 @@
+# synthetic.py
+
+import random
+from datetime import timedelta
+from itertools import islice
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from django.db import transaction
+from django.utils import timezone
+
+from app.models import Institution, Job, JobApplication, Notification, OmeiatZones, User, WorkExperience
+from app.profile_completion import profile_completion
+
+# ----------------------------
+# Synthetic data for benchmarks
+# ----------------------------
+SUBJECTS = [
+    "Mathematics", "Physics", "Chemistry", "Biology", "English", "Tamil", "Urdu",
+    "Arabic", "History", "Geography", "Economics", "Commerce", "Accountancy",
+    "Computer Science", "Physical Education", "Art", "Music", "Islamic Studies",
+]
+POSTS = ["PGT", "TGT", "PRT", "Lecturer", "Assistant Professor", "Lab Assistant", "Librarian", "Coordinator"]
+CATEGORIES = ["Teaching", "Administration", "Support Staff", "Management"]
+SUBCATEGORIES = ["Primary", "Secondary", "Higher Secondary", "Undergraduate", "Postgraduate"]
+CITIES = [
+    "Chennai", "Coimbatore", "Madurai", "Tiruchirappalli", "Salem", "Vellore",
+    "Tirunelveli", "Erode", "Thanjavur", "Ambur", "Vaniyambadi", "Kayalpatnam",
+]
+SKILLS = [
+    "lesson planning", "classroom management", "smart board", "lab safety",
+    "curriculum design", "assessment", "mentoring", "spoken english", "ms office",
+    "python", "tally", "counselling", "sports coaching", "event management",
+]
+QUALIFICATIONS = ["B.Ed", "M.Ed", "M.Sc", "M.A", "M.Com", "Ph.D", "NET", "SET", "TET", "B.P.Ed", "MCA"]
+JOB_TYPES = [choice for choice, _ in Job.JOB_TYPE_CHOICES]
+
+
+def make_zones(count: int, prefix: str = "Synthetic") -> List[OmeiatZones]:
+    return OmeiatZones.objects.bulk_create([OmeiatZones(zone_name=f"{prefix} Zone {i}") for i in range(count)])
+
+
+def make_institutions(count: int, rng: random.Random, prefix: str = "Synthetic",
+                      zones: Optional[Sequence[OmeiatZones]] = None) -> List[Institution]:
+    institutions = [
+        Institution(
+            name=f"{prefix} {rng.choice(['Crescent', 'Islamiah', 'Hilal', 'Noor', 'Iqra'])} School {i}",
+            address=f"{i} Main Road", category=rng.choice(Institution.CATEGORY_CHOICES)[0],
+            email=f"{prefix.lower()}-{i}@example.com", phone="0440000000",
+            city=rng.choice(CITIES), state="Tamil Nadu", district=rng.choice(CITIES),
+            country="India", pincode=600001, year_established=rng.randint(1900, 2020),
+            omeiat_member_since=rng.randint(1990, 2024), board=rng.choice(["State", "CBSE", "Matriculation"]),
+            no_of_students=0, no_of_boys=0, no_of_girls=0, no_of_gents_staff=0,
+            no_of_ladies_staff=0, no_of_non_teaching_staff=0, recruitment_contact="HR",
+            principal_name="Principal", coordinator_name="Coordinator",
+            correspondent_name="Correspondent", founder_name="Founder",
+            omeiat_zone=rng.choice(zones) if zones else None,
+        )
+        for i in range(count)
+    ]
+    return Institution.objects.bulk_create(institutions)
+
+
+def iter_jobs(institutions: List[Institution], count: int, rng: random.Random) -> Iterator[Job]:
+    today = timezone.localdate()
+    for _ in range(count):
+        subject = rng.choice(SUBJECTS)
+        post = rng.choice(POSTS)
+        city = rng.choice(CITIES)
+        salary_min = rng.randrange(10000, 80000, 1000)
+        skills = ", ".join(rng.sample(SKILLS, 3))
+        yield Job(
+            name=f"{subject} {post}",
+            category=rng.choice(CATEGORIES),
+            post=post,
+            job_type=rng.choice(JOB_TYPES),
+            experience_needed=rng.randint(0, 15),
+            posted_by=rng.choice(institutions),
+            description=(
+                f"We are hiring a {subject.lower()} {post} in {city}. "
+                f"The candidate should be strong in {skills} and committed to student growth."
+            ),
+            location=city,
+            salary_min=salary_min,
+            salary_max=salary_min + rng.randrange(5000, 40000, 1000),
+            skills_required=skills,
+            qualifications=", ".join(rng.sample(QUALIFICATIONS, 2)),
+            subcategory=rng.choice(SUBCATEGORIES),
+            application_deadline=today + timedelta(days=rng.randint(-10, 90)),
+            is_active=rng.random() > 0.05,
+        )
+
+
+def iter_applicants(count: int, rng: random.Random, prefix: str = "synthetic") -> Iterator[User]:
+    for i in range(count):
+        user = User(
+            username=f"{prefix}-applicant-{i}", password="!", email=f"{prefix}-applicant-{i}@example.com",
+            first_name=rng.choice(["Ayesha", "Fathima", "Imran", "Yusuf", "Zainab", "Rahul", "Priya"]),
+            last_name=rng.choice(["Khan", "Begum", "Ahmed", "Kumar", "Raj"]),
+            phone=9000000000 + i, age=rng.randint(22, 55), address=f"{i} Market Street, {rng.choice(CITIES)}",
+            qualification=", ".join(rng.sample(QUALIFICATIONS, 2)), languages_known="Tamil, English, Urdu",
+            working_experience_years=rng.randint(0, 20),
+            describing_experience=f"Taught {rng.choice(SUBJECTS).lower()} for several years.",
+            expected_salary=rng.randrange(15000, 90000, 1000),
+        )
+        # bulk_create skips User.save(), which normally keeps this current.
+        user.profile_percentage = profile_completion(user)
+        yield user
+
+
+def iter_experiences(users: List[User], rng: random.Random) -> Iterator[WorkExperience]:
+    today = timezone.localdate()
+    for user in users:
+        for _ in range(rng.randint(0, 3)):
+            start = today - timedelta(days=rng.randint(400, 6000))
+            yield WorkExperience(
+                user=user, name=f"{rng.choice(['Crescent', 'Noor', 'Iqra'])} School",
+                from_date=start, to_date=start + timedelta(days=rng.randint(180, 1500)),
+                post_assigned=rng.choice(POSTS),
+            )
+
+
+def iter_applications(users: List[User], job: Job, rng: random.Random) -> Iterator[JobApplication]:
+    statuses = [status for status, _label in JobApplication.STATUS_CHOICES]
+    for user in users:
+        yield JobApplication(applicant=user, job=job, institution_id=job.posted_by_id, status=rng.choice(statuses))
+
+
+def iter_user_applications(user_ids: Iterable[int], jobs: Sequence[Tuple[int, int]], per_user: int,
+                           rng: random.Random) -> Iterator[JobApplication]:
+    """Between 0 and 2 * per_user applications per user; `jobs` is (id, posted_by_id) pairs."""
+    statuses = [status for status, _label in JobApplication.STATUS_CHOICES]
+    for user_id in user_ids:
+        for job_id, institution_id in rng.sample(jobs, min(len(jobs), rng.randint(0, 2 * per_user))):
+            yield JobApplication(
+                applicant_id=user_id, job_id=job_id, institution_id=institution_id,
+                status=rng.choices(statuses, weights=[6, 2, 1, 3])[0],
+            )
+
+
+def iter_notifications(user_ids: Iterable[int], per_user: int, rng: random.Random) -> Iterator[Notification]:
+    types = [kind for kind, _label in Notification.NOTIFICATION_TYPES]
+    for user_id in user_ids:
+        for _ in range(rng.randint(0, 2 * per_user)):
+            yield Notification(
+                recipient_id=user_id, notification_type=rng.choice(types),
+                message=f"New {rng.choice(SUBJECTS)} {rng.choice(POSTS)} opening in {rng.choice(CITIES)}.",
+                is_read=rng.random() < 0.7,
+            )
+
+
+def sample_queries(rng: random.Random, count: int) -> List[str]:
+    vocab = SUBJECTS + POSTS + CITIES + SKILLS
+    return [
+        " ".join(rng.sample(vocab, rng.choice([1, 1, 2]))).lower()
+        for _ in range(count)
+    ]
+
+
+# ----------------------------
+# Seeding a database
+# ----------------------------
+# Volumes for `manage.py seed_data --scale`. Per-user values are averages.
+
+SCALES = {
+    "small": dict(zones=5, institutions=50, users=1000, jobs=2000, applications_per_user=3, notifications_per_user=5),
+    "medium": dict(zones=20, institutions=500, users=20000, jobs=20000, applications_per_user=5, notifications_per_user=10),
+    "large": dict(zones=40, institutions=2000, users=100000, jobs=100000, applications_per_user=5, notifications_per_user=20),
+}
+SEED_BATCH_SIZE = 5000
+
+
+class Rollback(Exception):
+    """Raised inside transaction.atomic() to throw a benchmark's seeded rows away."""
+
+
+def bulk_insert(model, rows: Iterable, batch_size: int = SEED_BATCH_SIZE) -> int:
+    """
+    bulk_create `rows` batch_size at a time, consuming the iterable lazily so
+    only one batch is in memory. Backends that return ids set them on the
+    objects. Returns the number of rows inserted.
+    """
+    inserted = 0
+    rows = iter(rows)
+    while batch := list(islice(rows, batch_size)):
+        inserted += len(model.objects.bulk_create(batch))
+    return inserted
+
+
+def seed_database(zones: int, institutions: int, users: int, jobs: int, applications_per_user: int,
+                  notifications_per_user: int, seed: int = 1, prefix: str = "seed",
+                  progress=lambda model, count: None) -> Dict[str, int]:
+    """
+    Insert a realistic data set with bulk_create, then rebuild what the
+    skipped signals would have maintained (status counters, unread badges,
+    listing caches) and queue recommendations for the new applicants. The
+    same seed and prefix always produce the same rows.
+    """
+    from app.application_counters import reconcile_counters
+    from app.caching import bump_jobs_version
+    from app.notifications import recount_unread
+    from app.recommendations import queue_refresh
+
+    rng = random.Random(seed)
+    counts = {}
+    with transaction.atomic():
+        zone_rows = make_zones(zones, prefix=prefix.title())
+        institution_rows = make_institutions(institutions, rng, prefix=prefix.title(), zones=zone_rows)
+        counts["zones"], counts["institutions"] = len(zone_rows), len(institution_rows)
+        progress(Institution, len(institution_rows))
+
+        counts["jobs"] = bulk_insert(Job, iter_jobs(institution_rows, jobs, rng))
+        progress(Job, counts["jobs"])
+        job_pairs = list(
+            Job.objects.filter(posted_by__in=institution_rows).values_list("id", "posted_by_id").iterator()
+        )
+
+        user_ids = []
+        experiences = 0
+        applicants = iter_applicants(users, rng, prefix=prefix)
+        while batch := list(islice(applicants, SEED_BATCH_SIZE)):
+            batch = User.objects.bulk_create(batch)
+            user_ids.extend(user.pk for user in batch)
+            experiences += bulk_insert(WorkExperience, iter_experiences(batch, rng))
+        counts["users"], counts["experiences"] = len(user_ids), experiences
+        progress(User, counts["users"])
+
+        applications = iter_user_applications(user_ids, job_pairs, applications_per_user, rng)
+        counts["applications"] = bulk_insert(JobApplication, applications)
+        progress(JobApplication, counts["applications"])
+        counts["notifications"] = bulk_insert(Notification, iter_notifications(user_ids, notifications_per_user, rng))
+        progress(Notification, counts["notifications"])
+
+        reconcile_counters()
+        recount_unread()
+        queue_refresh("user", user_ids)
+    bump_jobs_version()
+    return counts
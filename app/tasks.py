@@ -0,0 +1,64 @@
+# tasks.py
+
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable
+
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+
+logger = logging.getLogger(__name__)
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+# ----------------------------
+# Background execution
+# ----------------------------
+# Work that must not hold up a response (notification fan-out and the like)
+# is handed to a small in-process thread pool once the surrounding
+# transaction commits, so the worker always sees the rows it was told about.
+# BACKGROUND_TASKS = "sync" runs the work inline on commit instead, which is
+# what the tests use.
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(
+                max_workers=settings.BACKGROUND_TASK_WORKERS,
+                thread_name_prefix="omeiat-task",
+            )
+        return _executor
+
+
+def _run(func: Callable, args, kwargs) -> None:
+    # Inline ("sync") runs share the caller's connection, possibly inside its
+    # atomic block, so only worker threads may close connections.
+    worker = settings.BACKGROUND_TASKS != "sync"
+    if worker:
+        close_old_connections()
+    try:
+        func(*args, **kwargs)
+    except Exception:
+        logger.exception("Background task %s failed", getattr(func, "__name__", func))
+    finally:
+        if worker:
+            # Worker threads own their connections; don't leak them.
+            connections.close_all()
+
+
+def run_in_background(func: Callable, *args, **kwargs) -> None:
+    """
+    Call func(*args, **kwargs) after the current transaction commits, on a
+    worker thread (or inline when BACKGROUND_TASKS is "sync").
+    """
+    def submit():
+        if settings.BACKGROUND_TASKS == "sync":
+            _run(func, args, kwargs)
+        else:
+            _get_executor().submit(_run, func, args, kwargs)
+
+    transaction.on_commit(submit)
@@ -0,0 +1,32 @@
+# test_runner.py
+
+from django.test.runner import DiscoverRunner
+from django.test.utils import override_settings
+
+
+# ----------------------------
+# Test settings
+# ----------------------------
+# Every test login would otherwise pay for PASSWORD_HASH_ITERATIONS rounds
+# of PBKDF2, which also pushes ordinary requests past
+# PERFORMANCE_SLOW_REQUEST_MS and floods the output with slow_request lines.
+# Tests that exercise either one override these again themselves.
+
+TEST_SETTINGS = {
+    "PASSWORD_HASHERS": ["django.contrib.auth.hashers.MD5PasswordHasher"],
+    "PASSWORD_HASH_ITERATIONS": 1000,
+    # Metrics stay on (PerformanceMetricsTests reads them); only the
+    # slow-request log is silenced.
+    "PERFORMANCE_SLOW_REQUEST_MS": 10**9,
+}
+
+
+class OmeiatTestRunner(DiscoverRunner):
+    def setup_test_environment(self, **kwargs):
+        super().setup_test_environment(**kwargs)
+        self._test_settings = override_settings(**TEST_SETTINGS)
+        self._test_settings.enable()
+
+    def teardown_test_environment(self, **kwargs):
+        self._test_settings.disable()
+        super().teardown_test_environment(**kwargs)
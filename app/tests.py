@@ -1,3 +1,1625 @@
-from django.test import TestCase
+from contextlib import contextmanager
+import csv
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+from io import BytesIO, StringIO
+from unittest import mock
 
-# Create your tests here.
+from django.contrib.auth.hashers import check_password, make_password
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db import IntegrityError, OperationalError, connection, connections
+from django.http import QueryDict, StreamingHttpResponse
+from django.test import Client, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from PIL import Image as PILImage
+
+from app import matching, notifications
+from app.benchmarks import compare
+from app.models import (
+    Institution, Job, JobApplication, JobRecommendation, JobShortlist, Notification, OmeiatZones,
+    RecommendationRefresh, UploadTask, User, WorkExperience,
+)
+from app.application_counters import reconcile_counters
+from app.caching import check_shared_cache, get_jobs_version
+from app.exports import APPLICANT_COLUMNS, HEADER
+from app.facets import apply_filters, facet_counts, parse_filters
+from app.importers import Importer, InstitutionImporter
+from app.matching import CandidateMatrix, rank_candidates
+from app.metrics import DURATION_BUCKETS, Histogram, registry
+from app.recommendations import queue_refresh, recommended_jobs, refresh, refresh_jobs
+from app.profile_completion import completion_fields, profile_completion
+from app.query_inspector import NPlusOneError, fingerprint, inspect_queries
+from app.pagination import decode_cursor, encode_cursor, paginate_keyset
+from app.search import search_jobs
+from app.transitions import TransitionError, set_shortlist, transition_applications
+from app.upload_queue import _finish, claim, requeue_stale
+from app.uploads import process_file
+
+
+def make_institution(**overrides):
+    fields = dict(
+        name="Crescent School", address="1 Main Road", category="High School",
+        email="school@example.com", phone="044000000", city="Chennai",
+        state="Tamil Nadu", district="Chennai", country="India", pincode=600001,
+        year_established=1990, omeiat_member_since=2000, board="State",
+        no_of_students=500, no_of_boys=250, no_of_girls=250,
+        no_of_gents_staff=20, no_of_ladies_staff=20, no_of_non_teaching_staff=5,
+        recruitment_contact="HR", principal_name="P", coordinator_name="C",
+        correspondent_name="C", founder_name="F",
+    )
+    fields.update(overrides)
+    return Institution.objects.create(**fields)
+
+
+def make_job(institution, **overrides):
+    fields = dict(
+        name="Maths Teacher", category="Teaching", post="PGT", job_type="Full-time",
+        experience_needed=2, posted_by=institution, description="Teach maths",
+        location="Chennai", salary_min=20000, salary_max=30000,
+        skills_required="Algebra", qualifications="B.Ed", subcategory="Secondary",
+        application_deadline=timezone.localdate() + timedelta(days=30),
+    )
+    fields.update(overrides)
+    return Job.objects.create(**fields)
+
+
+def make_user(username="applicant", **overrides):
+    return User.objects.create_user(username=username, password="pass12345", **overrides)
+
+
+class QueryCountMixin:
+    @contextmanager
+    def assertMaxQueries(self, ceiling):
+        """
+        Fail if the wrapped block runs more than `ceiling` queries. Unlike
+        assertNumQueries, this leaves headroom for session/auth lookups so
+        only row-proportional (N+1) regressions trip it.
+        """
+        with CaptureQueriesContext(connection) as ctx:
+            yield ctx
+        executed = len(ctx.captured_queries)
+        if executed > ceiling:
+            queries = "\n".join(q["sql"] for q in ctx.captured_queries)
+            self.fail(f"{executed} queries executed, ceiling is {ceiling}:\n{queries}")
+
+
+# ----------------------------
+# Keyset pagination
+# ----------------------------
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.institution = make_institution()
+        self.jobs = [make_job(self.institution, name=f"Job {i}") for i in range(5)]
+        # Share one timestamp across several rows so the id tie-breaker matters.
+        stamp = timezone.now()
+        Job.objects.update(timestamp=stamp)
+
+    def test_cursor_round_trip(self):
+        stamp = timezone.now()
+        self.assertEqual(decode_cursor(encode_cursor(stamp, 42)), (stamp, 42))
+        self.assertIsNone(decode_cursor("not-a-cursor"))
+
+    def test_pages_cover_every_row_once(self):
+        seen, cursor = [], None
+        while True:
+            page = paginate_keyset(Job.objects.all(), cursor, 2)
+            seen.extend(job.id for job in page)
+            if not page.has_next:
+                break
+            cursor = page.next_cursor
+        self.assertEqual(seen, sorted((job.id for job in self.jobs), reverse=True))
+
+    def test_job_list_defers_large_text_fields(self):
+        response = self.client.get(reverse("jobs"))
+        self.assertEqual(response.status_code, 200)
+        job = response.context["jobs"].object_list[0]
+        self.assertIn("description", job.get_deferred_fields())
+
+
+# ----------------------------
+# Listing query ceilings
+# ----------------------------
+class ListingQueryCountTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = make_user()
+        for i in range(6):
+            institution = make_institution(name=f"School {i}", email=f"s{i}@example.com")
+            job = make_job(institution, name=f"Job {i}")
+            JobApplication.objects.create(applicant=self.user, job=job, institution=institution)
+
+    def test_job_list(self):
+        # Jobs page + facet cube on a cold cache.
+        with self.assertMaxQueries(3):
+            response = self.client.get(reverse("jobs"))
+        self.assertContains(response, "School 5")
+
+    def test_dashboard_anonymous(self):
+        with self.assertMaxQueries(2):
+            response = self.client.get(reverse("home"))
+        self.assertContains(response, "School 5")
+
+    def test_applied_jobs(self):
+        self.client.force_login(self.user)
+        with self.assertMaxQueries(5):
+            response = self.client.get(reverse("applied_jobs"))
+        self.assertContains(response, "School 5")
+
+
+# ----------------------------
+# Index usage
+# ----------------------------
+class ExplainQueriesCommandTests(TestCase):
+    def test_every_listing_query_uses_an_index(self):
+        institution = make_institution()
+        make_job(institution)
+        make_user()
+        out = StringIO()
+        call_command("explain_queries", "--strict", stdout=out)
+        self.assertNotIn("[no index]", out.getvalue())
+
+
+# ----------------------------
+# Applying for jobs
+# ----------------------------
+class ApplyJobTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.job = make_job(make_institution())
+        self.client.force_login(self.user)
+
+    def test_apply_records_institution_from_job(self):
+        response = self.client.post(reverse("apply_job", args=[self.job.id]))
+        self.assertRedirects(response, reverse("applied_jobs"), fetch_redirect_response=False)
+        application = JobApplication.objects.get()
+        self.assertEqual(application.institution_id, self.job.posted_by_id)
+
+    def test_second_application_is_rejected_by_constraint(self):
+        self.client.post(reverse("apply_job", args=[self.job.id]))
+        response = self.client.post(reverse("apply_job", args=[self.job.id]))
+        self.assertRedirects(response, reverse("job_detail", args=[self.job.id]), fetch_redirect_response=False)
+        self.assertEqual(JobApplication.objects.count(), 1)
+
+
+class ConcurrentApplyJobTests(TransactionTestCase):
+    workers = 8
+
+    def test_parallel_applications_create_exactly_one_row(self):
+        user = make_user()
+        job = make_job(make_institution())
+        self.client.force_login(user)
+        cookies = self.client.cookies
+        barrier = threading.Barrier(self.workers, timeout=10)
+        outcomes = []
+        applications = JobApplication.objects.filter(applicant=user, job=job)
+
+        def landed():
+            try:
+                return applications.exists()
+            except OperationalError:
+                return False
+
+        def apply():
+            client = Client()
+            client.cookies = cookies
+            try:
+                barrier.wait()
+                # SQLite's shared-cache test database reports table locks
+                # instead of blocking; retry those so only the constraint decides.
+                # A COMMIT can report the lock after it landed, so once the row
+                # exists a retry could only see the duplicate: record the lost
+                # response as None instead.
+                for _ in range(50):
+                    try:
+                        response = client.post(reverse("apply_job", args=[job.id]))
+                    except OperationalError:
+                        if landed():
+                            outcomes.append(None)
+                            break
+                        time.sleep(0.01)
+                        continue
+                    outcomes.append(response.url)
+                    break
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=apply) for _ in range(self.workers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(applications.count(), 1)
+        self.assertEqual(len(outcomes), self.workers)
+        # The one committed insert either got its success redirect or is
+        # among the lost (None) responses; no other request may succeed.
+        succeeded = outcomes.count(reverse("applied_jobs"))
+        if not succeeded and None in outcomes:
+            succeeded = 1
+        self.assertEqual(succeeded, 1)
+
+
+# ----------------------------
+# Job search
+# ----------------------------
+class JobSearchTests(TestCase):
+    def setUp(self):
+        self.institution = make_institution()
+
+    def test_title_match_ranks_above_description_match(self):
+        in_description = make_job(self.institution, name="Lab Assistant", description="Supports physics practicals")
+        in_title = make_job(self.institution, name="Physics Teacher", description="Teach grade 11")
+        results = list(search_jobs("physics"))
+        self.assertEqual(results, [in_title, in_description])
+
+    def test_index_is_only_repaired_when_migration_0005_is_applied(self):
+        from app.apps import ensure_search_backend
+
+        with mock.patch("app.search.install_search_backend") as install:
+            with mock.patch("django.db.migrations.recorder.MigrationRecorder.applied_migrations", return_value={}):
+                ensure_search_backend(sender=None, using="default")
+            install.assert_not_called()
+            ensure_search_backend(sender=None, using="default")
+            install.assert_called_once()
+
+    def test_closed_jobs_are_excluded(self):
+        make_job(self.institution, name="Chemistry Teacher", is_active=False)
+        make_job(
+            self.institution, name="Chemistry Lecturer",
+            application_deadline=timezone.localdate() - timedelta(days=1),
+        )
+        self.assertEqual(list(search_jobs("chemistry")), [])
+
+    def test_index_follows_updates_and_deletes(self):
+        job = make_job(self.institution, name="Tamil Teacher")
+        job.name = "Urdu Teacher"
+        job.save()
+        self.assertEqual(list(search_jobs("tamil")), [])
+        self.assertEqual(list(search_jobs("urdu")), [job])
+        job.delete()
+        self.assertEqual(list(search_jobs("urdu")), [])
+
+    def test_pagination(self):
+        for i in range(3):
+            make_job(self.institution, name=f"Biology Teacher {i}")
+        first = search_jobs("biology", page=1, per_page=2)
+        second = search_jobs("biology", page=2, per_page=2)
+        self.assertTrue(first.has_next)
+        self.assertFalse(second.has_next)
+        self.assertEqual(len({*first, *second}), 3)
+
+    def test_search_view_tolerates_query_syntax(self):
+        make_job(self.institution, name="English Teacher")
+        response = self.client.get(reverse("job_search"), {"q": 'english ("teacher'})
+        self.assertContains(response, "English Teacher")
+
+
+# ----------------------------
+# Facets
+# ----------------------------
+class FacetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        institution = make_institution()
+        make_job(institution, job_type="Full-time", category="Teaching", experience_needed=0, salary_min=15000)
+        make_job(institution, job_type="Full-time", category="Administration", experience_needed=3, salary_min=25000)
+        make_job(institution, job_type="Part-time", category="Teaching", experience_needed=12, salary_min=65000)
+        make_job(institution, job_type="Part-time", category="Teaching", is_active=False)
+
+    def test_counts_without_filters(self):
+        counts = facet_counts({})
+        self.assertEqual(counts["job_type"], {"Full-time": 2, "Part-time": 1})
+        self.assertEqual(counts["experience"], {"0-1": 1, "2-4": 1, "10+": 1})
+        self.assertEqual(counts["salary"], {"0-20000": 1, "20000-40000": 1, "60000+": 1})
+
+    def test_fractional_salaries_fall_into_a_bucket(self):
+        institution = Institution.objects.get()
+        make_job(institution, salary_min=Decimal("19999.50"))
+        make_job(institution, salary_min=Decimal("39999.99"))
+        counts = facet_counts({})
+        self.assertEqual(counts["salary"], {"0-20000": 2, "20000-40000": 2, "60000+": 1})
+        jobs = apply_filters(Job.objects.open(), {"salary": ["0-20000"]})
+        self.assertEqual(sorted(jobs.values_list("salary_min", flat=True)), [Decimal("15000"), Decimal("19999.50")])
+
+    def test_unknown_range_keys_are_dropped(self):
+        filters = parse_filters(QueryDict("salary=bogus&salary=60000%2B&experience=nope&job_type=Full-time"))
+        self.assertEqual(filters, {"job_type": ["Full-time"], "salary": ["60000+"]})
+        self.assertEqual(parse_filters(QueryDict("salary=bogus")), {})
+
+    def test_each_facet_ignores_its_own_selection(self):
+        counts = facet_counts({"job_type": ["Full-time"]})
+        self.assertEqual(counts["job_type"], {"Full-time": 2, "Part-time": 1})
+        self.assertEqual(counts["category"], {"Teaching": 1, "Administration": 1})
+
+        counts = facet_counts({"job_type": ["Full-time"], "category": ["Teaching"]})
+        self.assertEqual(counts["job_type"], {"Full-time": 1, "Part-time": 1})
+        self.assertEqual(counts["salary"], {"0-20000": 1})
+
+    def test_one_grouped_query_then_cached(self):
+        with self.assertNumQueries(1):
+            facet_counts({"job_type": ["Part-time"], "experience": ["10+"]})
+        with self.assertNumQueries(0):
+            facet_counts({"category": ["Teaching"]})
+
+    def test_job_changes_invalidate_counts(self):
+        self.assertEqual(facet_counts({})["job_type"]["Full-time"], 2)
+        job = make_job(Institution.objects.get(), job_type="Full-time")
+        self.assertEqual(facet_counts({})["job_type"]["Full-time"], 3)
+        job.job_type = "Contract"
+        job.save()
+        self.assertEqual(facet_counts({})["job_type"]["Contract"], 1)
+        job.delete()
+        self.assertNotIn("Contract", facet_counts({})["job_type"])
+
+    def test_job_list_applies_filters(self):
+        response = self.client.get(reverse("jobs"), {"job_type": "Part-time"})
+        self.assertEqual(len(response.context["jobs"]), 1)
+        self.assertContains(response, "Full-time (2)")
+
+
+# ----------------------------
+# Listing caches
+# ----------------------------
+class ListingCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.institution = make_institution(name="Hilal School")
+        self.job = make_job(self.institution, name="Arabic Teacher")
+
+    def test_repeat_anonymous_hits_skip_the_database(self):
+        for url in (reverse("home"), reverse("jobs")):
+            self.client.get(url)
+            with self.assertNumQueries(0):
+                response = self.client.get(url)
+            self.assertContains(response, "Arabic Teacher")
+
+    def test_job_save_and_delete_invalidate(self):
+        self.client.get(reverse("jobs"))
+        self.job.name = "Urdu Teacher"
+        self.job.save()
+        self.assertContains(self.client.get(reverse("jobs")), "Urdu Teacher")
+        self.assertContains(self.client.get(reverse("home")), "Urdu Teacher")
+        self.job.delete()
+        self.assertNotContains(self.client.get(reverse("jobs")), "Urdu Teacher")
+
+    def test_institution_save_invalidates(self):
+        self.client.get(reverse("home"))
+        self.institution.name = "Noor School"
+        self.institution.save()
+        self.assertContains(self.client.get(reverse("home")), "Noor School")
+
+    def test_filters_and_cursors_are_cached_separately(self):
+        make_job(self.institution, name="Music Teacher", job_type="Part-time")
+        self.client.get(reverse("jobs"))
+        response = self.client.get(reverse("jobs"), {"job_type": "Part-time"})
+        self.assertContains(response, "Music Teacher")
+        self.assertNotContains(response, "Arabic Teacher")
+
+    def test_anonymous_cards_carry_no_csrf_token(self):
+        response = self.client.get(reverse("home"))
+        self.assertNotContains(response, "csrfmiddlewaretoken")
+
+    def test_local_memory_cache_is_flagged_outside_debug(self):
+        locmem = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        redis = {"default": {"BACKEND": "django.core.cache.backends.redis.RedisCache"}}
+        with override_settings(DEBUG=False, CACHES=locmem):
+            self.assertEqual([error.id for error in check_shared_cache(None)], ["app.W001"])
+        with override_settings(DEBUG=True, CACHES=locmem):
+            self.assertEqual(check_shared_cache(None), [])
+        with override_settings(DEBUG=False, CACHES=redis):
+            self.assertEqual(check_shared_cache(None), [])
+
+
+# ----------------------------
+# Profile completion
+# ----------------------------
+class ProfileCompletionTests(TestCase):
+    def test_excludes_account_fields(self):
+        fields = completion_fields(User)
+        self.assertIn("qualification", fields)
+        self.assertNotIn("username", fields)
+        self.assertNotIn("profile_percentage", fields)
+
+    def test_save_keeps_percentage_current(self):
+        user = make_user()
+        empty = user.profile_percentage
+        user.qualification = "M.Sc"
+        user.save()
+        self.assertGreater(user.profile_percentage, empty)
+        user.refresh_from_db()
+        self.assertEqual(user.profile_percentage, profile_completion(user))
+
+    def test_partial_save_of_profile_field_persists_percentage(self):
+        user = make_user()
+        user.qualification = "M.Sc"
+        user.save(update_fields=["qualification"])
+        user.refresh_from_db()
+        self.assertEqual(user.profile_percentage, profile_completion(user))
+
+    def test_unrelated_partial_save_skips_recompute(self):
+        user = make_user()
+        User.objects.filter(pk=user.pk).update(profile_percentage=42)
+        user.refresh_from_db()
+        user.last_login = timezone.now()
+        user.save(update_fields=["last_login"])
+        user.refresh_from_db()
+        self.assertEqual(user.profile_percentage, 42)
+
+    def test_dashboard_reads_stored_value_without_writing(self):
+        user = make_user(qualification="M.Sc")
+        self.client.force_login(user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("home"))
+        self.assertEqual(response.context["completion"], user.profile_percentage)
+        self.assertFalse([q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")])
+
+
+# ----------------------------
+# Application status counters
+# ----------------------------
+class ApplicationCounterTests(TestCase):
+    def setUp(self):
+        self.user = make_user()
+        self.institution = make_institution()
+        self.job = make_job(self.institution)
+
+    def counts(self, obj):
+        obj.refresh_from_db()
+        return obj.application_status_counts
+
+    def test_create_status_change_and_delete(self):
+        application = JobApplication.objects.create(applicant=self.user, job=self.job, institution=self.institution)
+        self.assertEqual(self.counts(self.user)["pending"], 1)
+        self.assertEqual(self.counts(self.job)["pending"], 1)
+
+        application = JobApplication.objects.get(pk=application.pk)
+        application.status = "shortlisted"
+        application.save()
+        application.save()
+        self.assertEqual(self.counts(self.user), {"pending": 0, "shortlisted": 1, "hired": 0, "rejected": 0})
+
+        application.delete()
+        self.assertEqual(self.counts(self.job), {"pending": 0, "shortlisted": 0, "hired": 0, "rejected": 0})
+
+    def test_cascade_delete_decrements_applicant(self):
+        JobApplication.objects.create(applicant=self.user, job=self.job, institution=self.institution)
+        self.job.delete()
+        self.assertEqual(self.counts(self.user)["pending"], 0)
+
+    def test_reconcile_fixes_drift(self):
+        JobApplication.objects.create(applicant=self.user, job=self.job, institution=self.institution)
+        User.objects.filter(pk=self.user.pk).update(applications_pending=7, applications_hired=2)
+        out = StringIO()
+        call_command("reconcile_application_counters", stdout=out)
+        self.assertIn("User: fixed 1 row(s)", out.getvalue())
+        self.assertEqual(self.counts(self.user), {"pending": 1, "shortlisted": 0, "hired": 0, "rejected": 0})
+
+    def test_dashboard_reads_counters_without_aggregating(self):
+        JobApplication.objects.create(applicant=self.user, job=self.job, institution=self.institution, status="hired")
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("home"))
+        self.assertEqual(response.context["data"], [0, 0, 1, 0])
+        self.assertFalse([q for q in ctx.captured_queries if "app_jobapplication" in q["sql"]])
+
+
+# ----------------------------
+# Bulk import
+# ----------------------------
+INSTITUTION_ROW = dict(
+    name="Hilal School", address="2 Beach Road", category="High School",
+    email="Hilal@Example.com", phone="044111111", website="", omeiat_zone="Chennai",
+    city="Chennai", state="Tamil Nadu", district="Chennai", country="India",
+    pincode="600002", year_established="1995", omeiat_member_since="2001",
+    board="CBSE", no_of_students="300", no_of_boys="150", no_of_girls="150",
+    no_of_gents_staff="10", no_of_ladies_staff="12", no_of_non_teaching_staff="4",
+    recruitment_contact="HR", principal_name="P", coordinator_name="C",
+    correspondent_name="C", founder_name="F", password="",
+)
+
+
+class ImportTests(TestCase):
+    def write_csv(self, rows):
+        handle = tempfile.NamedTemporaryFile("w", suffix=".csv", newline="", delete=False)
+        self.addCleanup(os.remove, handle.name)
+        with handle:
+            writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+        return handle.name
+
+    def import_file(self, kind, path, *args):
+        out, err = StringIO(), StringIO()
+        call_command("import_records", kind, path, *args, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_institutions_resolve_zones_and_report_bad_rows(self):
+        OmeiatZones.objects.create(zone_name="Chennai")
+        make_institution(email="taken@example.com")
+        rows = [
+            INSTITUTION_ROW,
+            {**INSTITUTION_ROW, "email": "hilal@example.com"},
+            {**INSTITUTION_ROW, "email": "TAKEN@example.com"},
+            {**INSTITUTION_ROW, "email": "zone@example.com", "omeiat_zone": "Nowhere"},
+            {**INSTITUTION_ROW, "email": "pin@example.com", "pincode": "abc"},
+        ]
+        out, err = self.import_file("institutions", self.write_csv(rows), "--batch-size", "2")
+        self.assertIn("Imported 1 institutions; 4 row(s) rejected.", out)
+        self.assertIn("line 3: email: hilal@example.com already exists.", err)
+        self.assertIn("line 5: omeiat_zone: unknown zone 'Nowhere'.", err)
+        self.assertIn("line 6: pincode:", err)
+        institution = Institution.objects.get(email="hilal@example.com")
+        self.assertEqual(institution.omeiat_zone.zone_name, "Chennai")
+
+    def test_jobs_bulk_insert_and_invalidate_listings(self):
+        institution = make_institution()
+        job = dict(
+            institution_email="SCHOOL@example.com", name="Physics Teacher", category="Teaching",
+            subcategory="Science", post="PGT", job_type="Full-time", experience_needed="3",
+            description="Teach physics", location="Chennai", salary_min="20000", salary_max="30000",
+            skills_required="Physics", qualifications="M.Sc",
+            application_deadline=(timezone.localdate() + timedelta(days=30)).isoformat(),
+        )
+        rows = [job] * 5 + [{**job, "institution_email": "nobody@example.com"}]
+        version = get_jobs_version()
+        with CaptureQueriesContext(connection) as ctx:
+            out, err = self.import_file("jobs", self.write_csv(rows), "--batch-size", "2")
+        self.assertIn("Imported 5 jobs; 1 row(s) rejected.", out)
+        self.assertIn("line 7: institution_email:", err)
+        self.assertEqual(Job.objects.filter(posted_by=institution, is_active=True).count(), 5)
+        self.assertEqual(len([q for q in ctx.captured_queries if q["sql"].startswith("INSERT")]), 3)
+        self.assertNotEqual(get_jobs_version(), version)
+
+    def test_job_is_active_is_parsed_explicitly(self):
+        make_institution()
+        job = dict(
+            institution_email="school@example.com", name="Physics Teacher", category="Teaching",
+            subcategory="Science", post="PGT", job_type="Full-time", experience_needed="3",
+            description="Teach physics", location="Chennai", salary_min="20000", salary_max="30000",
+            skills_required="Physics", qualifications="M.Sc",
+            application_deadline=(timezone.localdate() + timedelta(days=30)).isoformat(),
+        )
+        flags = ["0", "no", "false", "FALSE", "1", "yes", "", "maybe"]
+        out, err = self.import_file("jobs", self.write_csv([{**job, "is_active": flag} for flag in flags]))
+        self.assertIn("Imported 7 jobs; 1 row(s) rejected.", out)
+        self.assertIn("line 9: is_active:", err)
+        self.assertEqual(Job.objects.filter(is_active=False).count(), 4)
+        self.assertEqual(Job.objects.filter(is_active=True).count(), 3)
+
+    def test_emails_of_a_rejected_batch_can_be_imported_again(self):
+        rows = [{**INSTITUTION_ROW, "omeiat_zone": "", "email": f"school{i}@example.com"} for i in range(2)]
+        importer = InstitutionImporter(batch_size=2)
+        with mock.patch.object(Institution.objects, "bulk_create", side_effect=IntegrityError("locked")):
+            result = importer.run(enumerate(rows, start=2))
+        self.assertEqual((result.created, result.failed), (0, 2))
+        result = importer.run(enumerate(rows, start=2))
+        self.assertEqual(result.created, 2)
+        self.assertEqual(Institution.objects.count(), 2)
+
+    def test_passwords_are_hashed_per_batch_in_worker_processes(self):
+        rows = [{**INSTITUTION_ROW, "omeiat_zone": "", "email": f"school{i}@example.com", "password": f"secret{i}"}
+                for i in range(3)]
+        rows.append({**INSTITUTION_ROW, "omeiat_zone": "", "email": "nopass@example.com"})
+        self.import_file("institutions", self.write_csv(rows), "--batch-size", "2", "--processes", "2")
+        for i in range(3):
+            institution = Institution.objects.get(email=f"school{i}@example.com")
+            self.assertTrue(check_password(f"secret{i}", institution.password))
+        self.assertIsNone(Institution.objects.get(email="nopass@example.com").password)
+
+    def test_importers_must_define_build(self):
+        with self.assertRaises(TypeError):
+            Importer()
+
+    def test_dry_run_writes_nothing(self):
+        out, _err = self.import_file("institutions", self.write_csv([{**INSTITUTION_ROW, "omeiat_zone": ""}]), "--dry-run")
+        self.assertIn("Validated 1 institutions", out)
+        self.assertFalse(Institution.objects.exists())
+
+    def test_admin_imports_xlsx_upload(self):
+        from openpyxl import Workbook
+
+        workbook = Workbook()
+        row = {**INSTITUTION_ROW, "omeiat_zone": ""}
+        workbook.active.append(list(row))
+        workbook.active.append(list(row.values()))
+        buffer = BytesIO()
+        workbook.save(buffer)
+        upload = SimpleUploadedFile("institutions.xlsx", buffer.getvalue())
+
+        self.client.force_login(User.objects.create_superuser("admin", "admin@example.com", "pass12345"))
+        response = self.client.post(reverse("admin:app_institution_import"), {"file": upload}, follow=True)
+        self.assertContains(response, "Imported 1 row(s); 0 rejected.")
+        self.assertTrue(Institution.objects.filter(email="hilal@example.com").exists())
+
+
+# ----------------------------
+# Applicant export
+# ----------------------------
+class ApplicantExportTests(TestCase):
+    def setUp(self):
+        self.institution = make_institution()
+        self.job = make_job(self.institution)
+        for i in range(5):
+            user = make_user(f"applicant{i}", first_name=f"Name{i}", qualification="B.Ed")
+            WorkExperience.objects.create(
+                user=user, name="Noor School", post_assigned="TGT",
+                from_date=date(2015, 6, 1), to_date=date(2018, 5, 31),
+            )
+            JobApplication.objects.create(applicant=user, job=self.job, institution=self.institution)
+        session = self.client.session
+        session["institution_id"] = self.institution.id
+        session.save()
+
+    def test_csv_streams_every_applicant_in_constant_queries(self):
+        url = reverse("export_applicants", args=[self.job.id, "csv"])
+        response = self.client.get(url)
+        self.assertIsInstance(response, StreamingHttpResponse)
+        with CaptureQueriesContext(connection) as ctx:
+            body = b"".join(response.streaming_content).decode("utf-8-sig")
+        # One query for applications + applicants, one for their experiences.
+        self.assertEqual(len(ctx.captured_queries), 2)
+        rows = list(csv.reader(StringIO(body)))
+        self.assertEqual(len(rows), 6)
+        self.assertEqual(rows[1][1], "pending")
+        self.assertIn("TGT at Noor School (2015-06-01 to 2018-05-31)", rows[1][-1])
+
+    def test_xlsx_opens_in_openpyxl(self):
+        from openpyxl import load_workbook
+
+        response = self.client.get(reverse("export_applicants", args=[self.job.id, "xlsx"]))
+        workbook = load_workbook(BytesIO(b"".join(response.streaming_content)), read_only=True)
+        rows = list(workbook.active.iter_rows(values_only=True))
+        self.assertEqual(rows[0][0], "Application id")
+        self.assertEqual(len(rows), 6)
+
+    def test_formula_cells_are_neutralised(self):
+        payloads = ["=HYPERLINK(\"http://evil.example\")", "+1+1", "-2+3", "@SUM(A1)", "\tx", "\rx"]
+        attrs = ("first_name", "last_name", "address", "qualification", "spouse_name", "mother_tongue")
+        applicant = User.objects.get(username="applicant0")
+        for attr, payload in zip(attrs, payloads):
+            setattr(applicant, attr, payload)
+        applicant.save()
+        headers = {attr: header for header, attr in APPLICANT_COLUMNS}
+        columns = [HEADER.index(headers[attr]) for attr in attrs]
+
+        response = self.client.get(reverse("export_applicants", args=[self.job.id, "csv"]))
+        rows = list(csv.reader(StringIO(b"".join(response.streaming_content).decode("utf-8-sig"))))
+        from openpyxl import load_workbook
+
+        response = self.client.get(reverse("export_applicants", args=[self.job.id, "xlsx"]))
+        workbook = load_workbook(BytesIO(b"".join(response.streaming_content)), read_only=True)
+        sheets = list(workbook.active.iter_rows(values_only=True))
+        self.assertEqual([rows[1][i] for i in columns], ["'" + payload for payload in payloads])
+        # XML parsers turn a bare CR into LF, so only the apostrophe is compared.
+        self.assertEqual([sheets[1][i][0] for i in columns], ["'"] * len(payloads))
+
+    def test_other_institutions_are_refused(self):
+        other = make_institution(email="other@example.com")
+        session = self.client.session
+        session["institution_id"] = other.id
+        session.save()
+        response = self.client.get(reverse("export_applicants", args=[self.job.id, "csv"]))
+        self.assertEqual(response.status_code, 403)
+
+
+# ----------------------------
+# Notification fan-out
+# ----------------------------
+@override_settings(BACKGROUND_TASKS="sync")
+class NotificationFanOutTests(TestCase):
+    def setUp(self):
+        self.institution = make_institution()
+        self.job = make_job(self.institution, experience_needed=3)
+        for i, years in enumerate([1, 3, 5, 8, 10]):
+            make_user(f"candidate{i}", working_experience_years=years)
+        make_user("hidden", working_experience_years=9, profile_visibility=False)
+
+    def test_job_posted_waits_for_commit_then_batches_inserts(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            notifications.job_posted(self.job)
+        self.assertFalse(Notification.objects.exists())
+
+        with CaptureQueriesContext(connection) as ctx:
+            for callback in callbacks:
+                callback()
+        recipients = set(Notification.objects.values_list("recipient__username", flat=True))
+        self.assertEqual(recipients, {"candidate1", "candidate2", "candidate3", "candidate4"})
+        # Job, recipient ids, then one INSERT and one counter UPDATE per batch.
+        statements = [q["sql"].split()[0] for q in ctx.captured_queries if not q["sql"].startswith(("SAVEPOINT", "RELEASE"))]
+        self.assertEqual(statements, ["SELECT", "SELECT", "INSERT", "UPDATE"])
+
+    def test_batch_size_bounds_each_insert(self):
+        created = notifications.fan_out_job_posted(self.job.id, batch_size=3)
+        self.assertEqual(created, 4)
+
+    def test_status_change_notifies_applicant(self):
+        user = User.objects.get(username="candidate0")
+        application = JobApplication.objects.create(applicant=user, job=self.job, institution=self.institution)
+        with self.captureOnCommitCallbacks(execute=True):
+            application.status = "shortlisted"
+            application.save()
+            application.save()
+        notification = Notification.objects.get(recipient=user)
+        self.assertEqual(notification.notification_type, "shortlisted")
+        self.assertIn("Maths Teacher", notification.message)
+
+    def test_sync_tasks_leave_the_callers_connection_alone(self):
+        with mock.patch("app.tasks.close_old_connections") as close_old, \
+                mock.patch("app.tasks.connections") as worker_connections:
+            with self.captureOnCommitCallbacks(execute=True):
+                notifications.job_posted(self.job)
+        close_old.assert_not_called()
+        worker_connections.close_all.assert_not_called()
+        self.assertEqual(Notification.objects.count(), 4)
+
+
+# ----------------------------
+# Unread notification badge
+# ----------------------------
+@override_settings(BACKGROUND_TASKS="sync")
+class UnreadNotificationTests(TestCase):
+    def setUp(self):
+        self.user = make_user(working_experience_years=5)
+        self.job = make_job(make_institution())
+
+    def unread(self):
+        self.user.refresh_from_db()
+        return self.user.unread_notifications
+
+    def test_counter_follows_fan_out_create_and_delete(self):
+        notifications.fan_out_job_posted(self.job.id)
+        notification = Notification.objects.create(recipient=self.user, notification_type="system", message="Hi")
+        self.assertEqual(self.unread(), 2)
+        notification.delete()
+        self.assertEqual(self.unread(), 1)
+
+    def test_poll_returns_304_when_unchanged(self):
+        Notification.objects.create(recipient=self.user, notification_type="system", message="Hi")
+        self.client.force_login(self.user)
+        url = reverse("notifications_unread")
+        response = self.client.get(url)
+        self.assertEqual(response.json(), {"unread": 1})
+
+        # Session + user lookups only; the count rides on the user row.
+        with self.assertNumQueries(2):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(response.status_code, 304)
+
+        Notification.objects.create(recipient=self.user, notification_type="system", message="Again")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 200)
+
+    def test_mark_all_read_is_one_update(self):
+        for i in range(3):
+            Notification.objects.create(recipient=self.user, notification_type="system", message=str(i))
+        with CaptureQueriesContext(connection) as ctx:
+            changed = notifications.mark_all_read(self.user)
+        self.assertEqual(changed, 3)
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 2)  # the counter and the notifications
+        self.assertEqual(self.unread(), 0)
+        self.assertFalse(Notification.objects.filter(is_read=False).exists())
+
+    def test_navbar_badge_needs_no_count_query(self):
+        Notification.objects.create(recipient=self.user, notification_type="system", message="Hi")
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("home"))
+        self.assertContains(response, 'id="unread-badge"')
+        self.assertFalse([q for q in ctx.captured_queries if "app_notification" in q["sql"]])
+
+
+# ----------------------------
+# Candidate matching
+# ----------------------------
+class MatchingTests(TestCase):
+    def setUp(self):
+        self.job = make_job(
+            make_institution(), experience_needed=4, salary_min=20000, salary_max=30000,
+            skills_required="Physics, Mathematics", qualifications="M.Sc, B.Ed", location="Chennai",
+        )
+
+    def matrix(self, *rows):
+        return CandidateMatrix([(i, *row) for i, row in enumerate(rows, start=1)])
+
+    def test_best_profile_ranks_first(self):
+        matrix = self.matrix(
+            (6, 25000, "M.Sc Physics, Mathematics, B.Ed", "English", "Anna Salai, Chennai"),  # ideal
+            (1, 25000, "M.Sc Physics", "English", "Madurai"),                        # junior, elsewhere
+            (8, 60000, "B.Com", "Tamil", "Chennai"),                                 # wrong field, pricey
+            (None, None, None, None, None),                                           # empty profile
+        )
+        ranked = matrix.top(self.job, k=4)
+        self.assertEqual([user_id for user_id, _score in ranked], [1, 2, 3, 4])
+        self.assertEqual(ranked[0][1], 1.0)
+
+    def test_top_k_and_exclusions(self):
+        matrix = self.matrix(*[(years, 25000, "M.Sc", "", "Chennai") for years in range(10)])
+        self.assertEqual(len(matrix.top(self.job, k=3)), 3)
+        self.assertNotIn(10, [user_id for user_id, _score in matrix.top(self.job, k=10, exclude=[10])])
+
+    def test_rank_candidates_loads_matrix_from_profiles(self):
+        make_user("strong", working_experience_years=5, qualification="M.Sc Physics B.Ed", address="Chennai")
+        make_user("weak", working_experience_years=0, qualification="B.Com", address="Delhi")
+        make_user("staff", is_staff=True, working_experience_years=9, qualification="M.Sc Physics B.Ed")
+        with mock.patch("app.matching._matrix", None):
+            ranked = rank_candidates(self.job, k=5)
+        self.assertEqual([user.username for user, _score in ranked], ["strong", "weak"])
+
+    def test_institution_sees_candidates_who_have_not_applied(self):
+        make_user("strong", working_experience_years=5, qualification="M.Sc Physics B.Ed", address="Chennai")
+        applied = make_user("applied", working_experience_years=6, qualification="M.Sc Physics B.Ed")
+        JobApplication.objects.create(applicant=applied, job=self.job, institution=self.job.posted_by)
+        session = self.client.session
+        session["institution_id"] = self.job.posted_by_id
+        session.save()
+        with mock.patch("app.matching._matrix", None):
+            response = self.client.get(reverse("job_candidates", args=[self.job.id]))
+        self.assertEqual([user.username for user, _score in response.context["candidates"]], ["strong"])
+        self.assertContains(response, "strong")
+
+        other = make_job(make_institution(email="other@example.com"))
+        self.assertEqual(self.client.get(reverse("job_candidates", args=[other.id])).status_code, 404)
+
+    def test_matrix_is_built_outside_the_lock(self):
+        stale = CandidateMatrix([])
+        stale.built_at -= 3600
+
+        def load(*args):
+            # Another request must still be able to take the lock meanwhile.
+            self.assertTrue(matching._matrix_lock.acquire(blocking=False))
+            matching._matrix_lock.release()
+            return CandidateMatrix([])
+
+        with mock.patch("app.matching._matrix", stale), mock.patch.object(CandidateMatrix, "load", side_effect=load):
+            fresh = matching.get_candidate_matrix()
+            self.assertIsNot(fresh, stale)
+            self.assertIs(matching.get_candidate_matrix(), fresh)
+
+
+# ----------------------------
+# Recommendations
+# ----------------------------
+class RecommendationTests(TestCase):
+    def setUp(self):
+        self.institution = make_institution()
+        self.physics = make_job(self.institution, name="Physics", skills_required="Physics, Lab work", qualifications="M.Sc")
+        self.commerce = make_job(self.institution, name="Commerce", skills_required="Accounts", qualifications="B.Com")
+        self.user = make_user("teacher", qualification="M.Sc Physics", address="Chennai", working_experience_years=5)
+
+    def recommended(self, user):
+        return list(JobRecommendation.objects.filter(user=user).order_by("-score").values_list("job__name", flat=True))
+
+    def test_refresh_ranks_jobs_for_queued_users(self):
+        RecommendationRefresh.objects.all().delete()
+        queue_refresh("user", [self.user.id])
+        result = refresh()
+        self.assertEqual(result["users"], 1)
+        self.assertEqual(self.recommended(self.user), ["Physics", "Commerce"])
+        self.assertFalse(RecommendationRefresh.objects.exists())
+
+    def test_change_during_refresh_is_kept_for_next_run(self):
+        RecommendationRefresh.objects.all().delete()
+        queue_refresh("user", [self.user.id])
+        time.sleep(0.001)  # queued_at must be earlier than refresh()'s start
+
+        def changed_meanwhile(user_ids, top):
+            queue_refresh("user", [self.user.id])
+            return 0
+
+        with mock.patch("app.recommendations.refresh_users", side_effect=changed_meanwhile):
+            self.assertEqual(refresh()["users"], 1)
+        self.assertTrue(RecommendationRefresh.objects.filter(kind="user", object_id=self.user.id).exists())
+        time.sleep(0.001)
+        self.assertEqual(refresh()["users"], 1)
+        self.assertFalse(RecommendationRefresh.objects.exists())
+
+    def test_applied_jobs_are_not_recommended(self):
+        refresh()
+        JobApplication.objects.create(applicant=self.user, job=self.physics, institution=self.institution)
+        self.assertNotIn("Physics", self.recommended(self.user))
+        refresh()
+        self.assertEqual(self.recommended(self.user), ["Commerce"])
+
+    def test_new_job_only_enters_lists_it_beats(self):
+        refresh(top=1)
+        other = make_user("accountant", qualification="B.Com Accounts", address="Chennai", working_experience_years=5)
+        refresh(top=1)
+        self.assertEqual(self.recommended(self.user), ["Physics"])
+        self.assertEqual(self.recommended(other), ["Commerce"])
+
+        make_job(self.institution, name="Senior Physics", skills_required="Physics", qualifications="M.Sc Physics")
+        RecommendationRefresh.objects.filter(kind="user").delete()
+        refresh(top=1)
+        self.assertEqual(self.recommended(self.user), ["Senior Physics"])
+        self.assertEqual(self.recommended(other), ["Commerce"])
+
+    def test_closed_job_is_dropped(self):
+        refresh()
+        self.physics.is_active = False
+        self.physics.save()
+        refresh_jobs([self.physics.id])
+        self.assertEqual(self.recommended(self.user), ["Commerce"])
+
+    def test_dashboard_reads_precomputed_list(self):
+        refresh()
+        self.client.force_login(self.user)
+        with CaptureQueriesContext(connection) as ctx:
+            jobs = list(recommended_jobs(self.user))
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual([job.name for job in jobs], ["Physics", "Commerce"])
+        response = self.client.get(reverse("home"))
+        self.assertContains(response, "Recommended for You")
+
+
+# ----------------------------
+# REST API
+# ----------------------------
+class ApiTests(QueryCountMixin, TestCase):
+    def setUp(self):
+        self.institution = make_institution()
+        self.jobs = [make_job(self.institution, name=f"Job {i}") for i in range(5)]
+        self.user = make_user()
+
+    def test_job_list_is_cursor_paginated(self):
+        response = self.client.get(reverse("api-job-list"), {"page_size": 2})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("count", response.data)
+        self.assertEqual([job["name"] for job in response.data["results"]], ["Job 4", "Job 3"])
+        names = []
+        url = response.data["next"]
+        while url:
+            page = self.client.get(url).data
+            names += [job["name"] for job in page["results"]]
+            url = page["next"]
+        self.assertEqual(names, ["Job 2", "Job 1", "Job 0"])
+
+    def test_job_list_query_count_does_not_grow(self):
+        for i in range(20):
+            make_job(self.institution, name=f"Extra {i}")
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("api-job-list"), {"page_size": 25})
+        self.assertEqual(response.data["results"][0]["institution_name"], "Crescent School")
+
+    def test_sparse_fields_trim_response_and_columns(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("api-job-list"), {"fields": "id,name"})
+        self.assertEqual(set(response.data["results"][0]), {"id", "name"})
+        sql = ctx.captured_queries[0]["sql"]
+        self.assertNotIn("app_institution", sql)
+        self.assertNotIn('"description"', sql)
+
+    def test_job_detail_includes_description(self):
+        response = self.client.get(reverse("api-job-detail", args=[self.jobs[0].id]))
+        self.assertEqual(response.data["description"], "Teach maths")
+
+    def test_applications_require_login_and_are_scoped(self):
+        self.assertEqual(self.client.get(reverse("api-application-list")).status_code, 403)
+        other = make_user("other")
+        JobApplication.objects.create(applicant=other, job=self.jobs[0], institution=self.institution)
+        self.client.force_login(self.user)
+
+        response = self.client.post(reverse("api-application-list"), {"job": self.jobs[1].id})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["job_name"], "Job 1")
+        duplicate = self.client.post(reverse("api-application-list"), {"job": self.jobs[1].id})
+        self.assertEqual(duplicate.status_code, 400)
+
+        listed = self.client.get(reverse("api-application-list")).data["results"]
+        self.assertEqual([app["job_id"] for app in listed], [self.jobs[1].id])
+
+    def test_notifications_read_all(self):
+        Notification.objects.create(recipient=self.user, notification_type="system", message="Hi")
+        self.client.force_login(self.user)
+        unread = self.client.get(reverse("api-notification-list"), {"unread": "1"}).data["results"]
+        self.assertEqual(len(unread), 1)
+        response = self.client.post(reverse("api-notification-read-all"))
+        self.assertEqual(response.data["marked"], 1)
+        self.assertEqual(self.client.get(reverse("api-notification-list"), {"unread": "1"}).data["results"], [])
+
+
+# ----------------------------
+# Conditional GET
+# ----------------------------
+class ConditionalGetTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.institution = make_institution()
+        self.job = make_job(self.institution)
+        self.detail_url = reverse("job_detail", args=[self.job.id])
+
+    def test_job_detail_304_skips_render(self):
+        response = self.client.get(self.detail_url)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("no-cache", response["Cache-Control"])
+        with self.assertNumQueries(1), mock.patch("app.views.job.jobs.render") as render:
+            again = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+        render.assert_not_called()
+
+        with self.assertNumQueries(1):
+            since = self.client.get(self.detail_url, HTTP_IF_MODIFIED_SINCE=response["Last-Modified"])
+        self.assertEqual(since.status_code, 304)
+
+    def test_job_edit_changes_validators(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.job.description = "Teach algebra"
+        self.job.save()
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_institution_edit_changes_job_etag(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        self.institution.name = "Noor School"
+        self.institution.save()
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_unrelated_institution_edit_keeps_etags(self):
+        detail_etag = self.client.get(self.detail_url)["ETag"]
+        listing_etag = self.client.get(reverse("jobs"))["ETag"]
+        institution = Institution.objects.get(pk=self.institution.pk)
+        institution.phone = "044999999"
+        institution.save()
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=detail_etag).status_code, 304)
+        self.assertEqual(self.client.get(reverse("jobs"), HTTP_IF_NONE_MATCH=listing_etag).status_code, 304)
+
+    def test_etag_varies_by_viewer(self):
+        etag = self.client.get(self.detail_url)["ETag"]
+        user = make_user()
+        self.client.force_login(user)
+        response = self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("private", response["Cache-Control"])
+        Notification.objects.create(recipient=user, notification_type="system", message="Hi")
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 200)
+
+    def test_new_avatar_changes_etag(self):
+        user = make_user()
+        self.client.force_login(user)
+        etag = self.client.get(self.detail_url)["ETag"]
+        User.objects.filter(pk=user.pk).update(profile_picture_thumbnail="profiles/thumbnails/new.webp")
+        self.assertEqual(self.client.get(self.detail_url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_listing_304_keyed_on_newest_job(self):
+        response = self.client.get(reverse("jobs"))
+        with self.assertNumQueries(0):
+            again = self.client.get(reverse("jobs"), HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(again.status_code, 304)
+
+        other = make_job(self.institution, name="Physics Teacher")
+        self.assertEqual(self.client.get(reverse("jobs"), HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 200)
+        etag = self.client.get(reverse("jobs"))["ETag"]
+        other.delete()
+        self.assertEqual(self.client.get(reverse("jobs"), HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_filters_have_their_own_etag(self):
+        etag = self.client.get(reverse("jobs"))["ETag"]
+        response = self.client.get(reverse("jobs"), {"job_type": "Part-time"}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+
+# ----------------------------
+# Performance metrics
+# ----------------------------
+class PerformanceMetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.job = make_job(make_institution())
+
+    def test_records_per_view_stats(self):
+        self.client.get(reverse("job_detail", args=[self.job.id]))
+        self.client.get(reverse("job_detail", args=[self.job.id]))
+        stats = registry.summary()["job_detail"]
+        self.assertEqual(stats["requests"], 2)
+        self.assertEqual(stats["metrics"]["db_queries"]["max"], 2)
+        self.assertGreater(stats["metrics"]["template_duration_seconds"]["max"], 0)
+        self.assertGreater(stats["metrics"]["response_size_bytes"]["avg"], 1000)
+
+    def test_endpoints_are_staff_only(self):
+        self.assertEqual(self.client.get(reverse("metrics")).status_code, 403)
+        self.client.force_login(make_user("ops", is_staff=True))
+        self.client.get(reverse("jobs"))
+        response = self.client.get(reverse("metrics"))
+        self.assertEqual(response.status_code, 200)
+        body = response.content.decode()
+        self.assertIn('omeiat_requests_total{view="jobs",method="GET",status="200"} 1', body)
+        self.assertIn('omeiat_db_queries_bucket{view="jobs",le="+Inf"} 1', body)
+        self.assertIn("jobs", self.client.get(reverse("metrics_summary")).json()["views"])
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_scraper_token(self):
+        response = self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(reverse("metrics"), HTTP_AUTHORIZATION="Bearer nope").status_code, 403)
+
+    @override_settings(PERFORMANCE_SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_as_json(self):
+        with self.assertLogs("app.performance", "WARNING") as logs:
+            self.client.get(reverse("jobs"))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["view"], "jobs")
+        self.assertIn("db_queries", record)
+
+    def test_histogram_quantiles(self):
+        histogram = Histogram(DURATION_BUCKETS)
+        for _ in range(99):
+            histogram.observe(0.004)
+        histogram.observe(3.0)
+        self.assertLessEqual(histogram.quantile(0.5), 0.005)
+        self.assertGreater(histogram.quantile(0.999), 2.5)
+
+
+# ----------------------------
+# Query inspector
+# ----------------------------
+class QueryInspectorTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.institutions = [make_institution(email=f"school{i}@example.com", name=f"School {i}") for i in range(4)]
+        self.jobs = [make_job(institution) for institution in self.institutions]
+        self.user = make_user()
+        for job in self.jobs:
+            JobApplication.objects.create(applicant=self.user, job=job, institution_id=job.posted_by_id)
+
+    def test_fingerprint_normalizes_values(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id = 3 AND name = 'x' AND pk IN (%s, %s, %s)"),
+            fingerprint("SELECT * FROM t WHERE id = 17 AND name = 'y''s' AND pk IN (%s)"),
+        )
+        self.assertNotEqual(fingerprint("SELECT a FROM t"), fingerprint("SELECT b FROM t"))
+
+    def test_detects_n_plus_one_with_call_site(self):
+        with self.assertRaises(NPlusOneError) as caught, self.assertLogs("app.queries", "WARNING") as logs:
+            with inspect_queries("loop", strict=True, duplicate_threshold=2):
+                [job.posted_by.name for job in Job.objects.all()]
+        self.assertIn("4x SELECT", str(caught.exception))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertEqual(record["event"], "duplicate_query")
+        self.assertTrue(any("app/tests.py" in frame for frame in record["stack"]["python"]))
+
+    def test_template_call_site(self):
+        from django.template import Context, Template
+        template = Template("{% for job in jobs %}{{ job.posted_by.name }}{% endfor %}")
+        with self.assertLogs("app.queries", "WARNING") as logs:
+            with inspect_queries("template", strict=False, duplicate_threshold=2):
+                template.render(Context({"jobs": Job.objects.all()}))
+        record = json.loads(logs.records[0].getMessage())
+        self.assertTrue(record["stack"]["templates"])
+
+    def test_slow_queries_are_logged(self):
+        with self.assertLogs("app.queries", "WARNING") as logs:
+            with inspect_queries("slow", strict=False, slow_ms=0):
+                Job.objects.count()
+        self.assertEqual(json.loads(logs.records[0].getMessage())["event"], "slow_query")
+
+    @override_settings(QUERY_INSPECTOR_SAMPLE_RATE=1.0, QUERY_INSPECTOR_STRICT=True, QUERY_INSPECTOR_DUPLICATE_THRESHOLD=2)
+    def test_hot_views_have_no_n_plus_one(self):
+        self.client.force_login(self.user)
+        for url in (reverse("jobs"), reverse("applied_jobs"), reverse("home")):
+            self.assertEqual(self.client.get(url).status_code, 200, url)
+
+
+# ----------------------------
+# Seeding and benchmarks
+# ----------------------------
+class SeedAndBenchmarkTests(TestCase):
+    def seed(self, **overrides):
+        options = dict(zones=2, institutions=3, users=10, jobs=20, applications_per_user=2, notifications_per_user=2)
+        options.update(overrides)
+        call_command("seed_data", stdout=StringIO(), **options)
+
+    def test_seed_data_is_deterministic_and_consistent(self):
+        self.seed()
+        self.assertEqual(Job.objects.count(), 20)
+        self.assertEqual(User.objects.count(), 10)
+        applications = JobApplication.objects.count()
+        self.assertGreater(applications, 0)
+        self.assertEqual(sum(User.objects.values_list("applications_pending", flat=True)),
+                         JobApplication.objects.filter(status="pending").count())
+        user = User.objects.filter(notifications__is_read=False).first()
+        self.assertEqual(user.unread_notifications, user.notifications.filter(is_read=False).count())
+        for user in User.objects.all():
+            self.assertEqual(user.profile_percentage, profile_completion(user))
+        self.assertEqual(
+            set(RecommendationRefresh.objects.filter(kind="user").values_list("object_id", flat=True)),
+            set(User.objects.values_list("id", flat=True)),
+        )
+
+        self.seed(prefix="again")
+        self.assertEqual(JobApplication.objects.count(), 2 * applications)
+        with self.assertRaises(CommandError):
+            self.seed()
+
+    def test_benchmark_reports_and_compares(self):
+        self.seed()
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = os.path.join(directory, "baseline.json")
+            args = ["--requests", "3", "--warmup", "1", "--baseline", baseline]
+            call_command("benchmark", *args, "--save-baseline", stdout=StringIO(), stderr=StringIO())
+            stdout = StringIO()
+            call_command("benchmark", *args, stdout=stdout, stderr=StringIO())
+        report = json.loads(stdout.getvalue())
+        self.assertEqual(set(report["scenarios"]), {"home", "jobs", "job_detail", "login", "apply", "applied_jobs"})
+        self.assertIn("p99_ms", report["scenarios"]["jobs"])
+        self.assertEqual(set(report["comparison"]), set(report["scenarios"]))
+        self.assertFalse(User.objects.filter(username="bench-user").exists())
+
+    def test_compare_flags_extra_queries(self):
+        row = {"p95_ms": 10.0, "throughput_rps": 100.0, "queries_max": 3}
+        baseline = {"scenarios": {"jobs": row}}
+        current = {"scenarios": {"jobs": dict(row, queries_max=4)}}
+        self.assertTrue(compare(current, baseline)["jobs"]["regressed"])
+        current = {"scenarios": {"jobs": dict(row, p95_ms=11.0)}}
+        self.assertFalse(compare(current, baseline)["jobs"]["regressed"])
+
+
+# ----------------------------
+# Institution authentication
+# ----------------------------
+@override_settings(
+    PASSWORD_HASHERS=["app.hashers.PBKDF2PasswordHasher", "django.contrib.auth.hashers.MD5PasswordHasher"],
+    PASSWORD_HASH_ITERATIONS=1000,
+)
+class InstitutionAuthTests(TestCase):
+    def setUp(self):
+        self.institution = make_institution(password=make_password("school-pass"))
+
+    def login(self, password="school-pass", **extra):
+        return self.client.post(reverse("institution_login"), {"email": "SCHOOL@example.com", "password": password}, **extra)
+
+    def test_login_keeps_identity_in_session(self):
+        response = self.login()
+        self.assertRedirects(response, reverse("institution_dashboard"))
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("job_create"))
+        self.assertContains(response, "Crescent School")
+        self.assertFalse([q for q in ctx.captured_queries if '"app_institution"' in q["sql"]])
+
+    def test_wrong_password_and_anonymous_access(self):
+        self.login(password="nope")
+        self.assertNotIn("institution_id", self.client.session)
+        response = self.client.get(reverse("institution_jobs"))
+        self.assertRedirects(response, reverse("institution_login") + "?next=" + reverse("institution_jobs"),
+                             fetch_redirect_response=False)
+
+    def test_hash_is_upgraded_on_login(self):
+        Institution.objects.filter(pk=self.institution.pk).update(
+            password=make_password("school-pass", hasher="md5"),
+        )
+        self.login()
+        algorithm, iterations, *_ = Institution.objects.get(pk=self.institution.pk).password.split("$")
+        self.assertEqual((algorithm, iterations), ("pbkdf2_sha256", "1000"))
+        with self.settings(PASSWORD_HASH_ITERATIONS=1500):
+            self.client.post(reverse("institution_logout"))
+            self.login()
+        self.assertIn("$1500$", Institution.objects.get(pk=self.institution.pk).password)
+
+    @override_settings(INSTITUTION_SESSION_REVALIDATE=0)
+    def test_password_change_ends_session_on_revalidation(self):
+        self.login()
+        self.assertEqual(self.client.get(reverse("institution_jobs")).status_code, 200)
+        Institution.objects.filter(pk=self.institution.pk).update(password=make_password("changed"))
+        self.assertEqual(self.client.get(reverse("institution_jobs")).status_code, 302)
+
+    def test_institution_manages_own_jobs(self):
+        other = make_job(make_institution(email="other@example.com"))
+        self.login()
+        form = {
+            "name": "Science Teacher", "category": "Teaching", "post": "TGT", "job_type": "Full-time",
+            "experience_needed": 1, "description": "Teach science", "location": "Chennai",
+            "salary_min": 15000, "salary_max": 25000, "skills_required": "Physics", "qualifications": "B.Ed",
+            "subcategory": "Secondary", "application_deadline": timezone.localdate() + timedelta(days=10),
+            "is_active": "on",
+        }
+        self.assertRedirects(self.client.post(reverse("job_create"), form), reverse("institution_jobs"))
+        job = Job.objects.get(name="Science Teacher")
+        self.assertEqual(job.posted_by_id, self.institution.pk)
+        self.assertContains(self.client.get(reverse("institution_jobs")), "Science Teacher")
+        self.assertEqual(self.client.get(reverse("job_edit", args=[other.id])).status_code, 404)
+        self.client.post(reverse("job_delete", args=[job.id]))
+        self.assertFalse(Job.objects.filter(pk=job.pk).exists())
+
+
+class InstitutionDashboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.institution = make_institution(password=make_password("school-pass"))
+        self.client.post(reverse("institution_login"), {"email": "school@example.com", "password": "school-pass"})
+
+    def dashboard_queries(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(reverse("institution_dashboard"))
+        self.assertEqual(response.status_code, 200)
+        return response, len(ctx.captured_queries)
+
+    def test_pipeline_counts(self):
+        job = make_job(self.institution)
+        other = make_job(make_institution(email="other@example.com"), name="Other Job")
+        for i, status in enumerate(["pending", "pending", "hired", "rejected"]):
+            JobApplication.objects.create(applicant=make_user(f"a{i}"), job=job, institution=self.institution, status=status)
+        JobApplication.objects.create(applicant=make_user("b"), job=other, institution=other.posted_by)
+        shortlist = JobShortlist.objects.create(job=job, institution=self.institution)
+        shortlist.users.add(*User.objects.filter(username__in=["a0", "a1", "a2"]))
+
+        response, _ = self.dashboard_queries()
+        rows = response.context["pipeline_jobs"]
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(
+            {key: rows[0][key] for key in ("applicants", "pending", "shortlisted", "hired", "rejected", "shortlist_size")},
+            {"applicants": 4, "pending": 2, "shortlisted": 0, "hired": 1, "rejected": 1, "shortlist_size": 3},
+        )
+        self.assertEqual(response.context["totals"]["applicants"], 4)
+        self.assertNotContains(response, "Other Job")
+
+    def test_query_count_does_not_grow_with_jobs(self):
+        make_job(self.institution)
+        _, few = self.dashboard_queries()
+        for i in range(10):
+            job = make_job(self.institution, name=f"Job {i}")
+            JobApplication.objects.create(applicant=make_user(f"u{i}"), job=job, institution=self.institution)
+        _, many = self.dashboard_queries()
+        self.assertEqual(few, many)
+        # Served from cache until an application changes.
+        _, cached = self.dashboard_queries()
+        self.assertEqual(cached, many - 1)
+        application = JobApplication.objects.filter(job__posted_by=self.institution).first()
+        application.status = "hired"
+        application.save()
+        response, refreshed = self.dashboard_queries()
+        self.assertEqual(refreshed, many)
+        self.assertEqual(response.context["totals"]["hired"], 1)
+
+    def test_shortlist_changes_invalidate(self):
+        job = make_job(self.institution)
+        shortlist = JobShortlist.objects.create(job=job, institution=self.institution)
+        user = make_user()
+        self.dashboard_queries()
+        user.shortlisted_jobs.add(shortlist)
+        response, _ = self.dashboard_queries()
+        self.assertEqual(response.context["totals"]["shortlist_size"], 1)
+        user.shortlisted_jobs.clear()
+        response, _ = self.dashboard_queries()
+        self.assertEqual(response.context["totals"]["shortlist_size"], 0)
+
+
+@override_settings(BACKGROUND_TASKS="sync")
+class BulkTransitionTests(TestCase):
+    def setUp(self):
+        self.institution = make_institution(password=make_password("school-pass"))
+        self.job = make_job(self.institution)
+        self.applications = [
+            JobApplication.objects.create(applicant=make_user(f"a{i}"), job=self.job, institution=self.institution)
+            for i in range(6)
+        ]
+        self.ids = [application.id for application in self.applications]
+
+    def shortlist_users(self):
+        return set(JobShortlist.users.through.objects.filter(jobshortlist__job=self.job).values_list("user__username", flat=True))
+
+    def test_bulk_move_updates_statuses_counters_shortlist_and_notifies(self):
+        targets = {pk: "shortlisted" for pk in self.ids[:4]}
+        targets.update({pk: "rejected" for pk in self.ids[4:]})
+        with self.captureOnCommitCallbacks(execute=True), CaptureQueriesContext(connection) as ctx:
+            moved = transition_applications(self.institution.pk, targets)
+        self.assertEqual(moved, {"shortlisted": 4, "rejected": 2})
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith('UPDATE "app_jobapplication"')]
+        self.assertEqual(len(updates), 2)
+        self.assertEqual(set(JobApplication.objects.filter(id__in=self.ids[:4]).values_list("status", flat=True)), {"shortlisted"})
+        self.assertEqual(self.shortlist_users(), {"a0", "a1", "a2", "a3"})
+        self.assertEqual(Notification.objects.filter(notification_type="shortlisted").count(), 4)
+        self.assertEqual(Notification.objects.filter(notification_type="rejected").count(), 2)
+        self.assertEqual(reconcile_counters(dry_run=True), {"User": 0, "Job": 0})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            transition_applications(self.institution.pk, {self.ids[0]: "hired", self.ids[1]: "pending"})
+        self.assertEqual(self.shortlist_users(), {"a2", "a3"})
+        self.assertEqual(reconcile_counters(dry_run=True), {"User": 0, "Job": 0})
+
+    def test_invalid_transition_changes_nothing(self):
+        transition_applications(self.institution.pk, {self.ids[0]: "hired"})
+        other = make_job(make_institution(email="other@example.com"))
+        foreign = JobApplication.objects.create(applicant=make_user("b"), job=other, institution=other.posted_by)
+        with self.assertRaises(TransitionError) as raised:
+            transition_applications(self.institution.pk, {
+                self.ids[0]: "pending", self.ids[1]: "shortlisted", self.ids[2]: "archived", foreign.id: "hired",
+            })
+        self.assertEqual(set(raised.exception.errors), {self.ids[0], self.ids[2], foreign.id})
+        self.assertEqual(JobApplication.objects.get(id=self.ids[1]).status, "pending")
+        self.assertEqual(self.shortlist_users(), set())
+
+    def test_set_shortlist_syncs_membership(self):
+        users = list(User.objects.filter(username__in=["a0", "a1", "a2"]).values_list("id", flat=True))
+        self.assertEqual(set_shortlist(self.institution.pk, self.job.id, users), {"added": 3, "removed": 0})
+        self.assertEqual(set_shortlist(self.institution.pk, self.job.id, users[1:]), {"added": 0, "removed": 1})
+        self.assertEqual(self.shortlist_users(), {"a1", "a2"})
+        self.assertEqual(JobShortlist.objects.filter(job=self.job).count(), 1)
+
+    def test_view(self):
+        self.client.post(reverse("institution_login"), {"email": "school@example.com", "password": "school-pass"})
+        response = self.client.post(reverse("application_status_bulk"), {"application": self.ids[:3], "status": "hired"})
+        self.assertRedirects(response, reverse("institution_dashboard"), fetch_redirect_response=False)
+        self.assertEqual(JobApplication.objects.filter(status="hired").count(), 3)
+        response = self.client.post(reverse("application_status_bulk"), {"application": self.ids[:1], "status": "pending"}, follow=True)
+        self.assertTrue(any("No applications were updated" in str(m) for m in response.context["messages"]))
+        self.assertEqual(response.context["totals"]["hired"], 3)
+
+    def test_applicants_page_posts_bulk_form(self):
+        self.client.post(reverse("institution_login"), {"email": "school@example.com", "password": "school-pass"})
+        self.assertContains(self.client.get(reverse("institution_dashboard")), reverse("job_applicants", args=[self.job.id]))
+        url = reverse("job_applicants", args=[self.job.id]) + "?status=pending"
+        response = self.client.get(url)
+        self.assertContains(response, f'action="{reverse("application_status_bulk")}"')
+        self.assertContains(response, 'name="application"', count=6)
+        self.assertContains(response, f'name="next" value="{url}"')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse("application_status_bulk"), {"application": self.ids[:2], "status": "shortlisted", "next": url},
+            )
+        self.assertRedirects(response, url, fetch_redirect_response=False)
+        self.assertContains(self.client.get(url), 'name="application"', count=4)
+
+        other = make_job(make_institution(email="other@example.com"))
+        self.assertEqual(self.client.get(reverse("job_applicants", args=[other.id])).status_code, 404)
+
+
+def make_image_upload(name="photo.jpg", size=(800, 600), image_format="JPEG", **save_options):
+    buffer = BytesIO()
+    PILImage.new("RGB", size, "teal").save(buffer, image_format, **save_options)
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type=f"image/{image_format.lower()}")
+
+
+class UploadPipelineTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        self.media_root = media.name
+        override = override_settings(MEDIA_ROOT=self.media_root)
+        override.enable()
+        self.addCleanup(override.disable)
+        self.user = make_user()
+        self.client.force_login(self.user)
+
+    def upload(self, **files):
+        return self.client.post(reverse("update_profile"), files)
+
+    def process(self, processes=0):
+        with self.captureOnCommitCallbacks(execute=True):
+            call_command("process_uploads", "--once", "--processes", str(processes), stdout=StringIO())
+        self.user.refresh_from_db()
+
+    def test_request_only_queues_the_raw_file(self):
+        self.upload(profile_picture=make_image_upload())
+        task = UploadTask.objects.get(user=self.user)
+        self.assertEqual((task.field, task.status), ("profile_picture", "queued"))
+        self.assertTrue(os.path.exists(task.source.path))
+        self.user.refresh_from_db()
+        self.assertFalse(self.user.profile_picture)
+        self.assertContains(self.client.get(reverse("profile")), "is being processed")
+
+    def test_profile_picture_is_reencoded_and_thumbnailed(self):
+        exif = PILImage.Exif()
+        exif[0x010F] = "PhoneMaker"  # Make
+        exif[0x0112] = 6  # Orientation: rotate 90
+        upload = make_image_upload(size=(2400, 1600), exif=exif.tobytes())
+        self.upload(profile_picture=upload)
+        self.process()
+
+        task = UploadTask.objects.get(user=self.user)
+        self.assertEqual(task.status, "done")
+        upload.seek(0)
+        self.assertEqual(task.checksum, hashlib.sha256(upload.read()).hexdigest())
+        self.assertFalse(os.path.exists(task.source.path))
+        with PILImage.open(self.user.profile_picture_thumbnail.path) as thumbnail:
+            self.assertEqual((thumbnail.format, thumbnail.size), ("WEBP", (160, 160)))
+            self.assertFalse(thumbnail.getexif())
+        with PILImage.open(self.user.profile_picture.path) as picture:
+            self.assertEqual(picture.size, (683, 1024))  # rotated upright, longest side capped
+            self.assertFalse(picture.getexif())
+        self.assertContains(self.client.get(reverse("home")), self.user.profile_picture_thumbnail.url)
+        self.assertNotContains(self.client.get(reverse("profile")), "is being processed")
+
+        old_paths = [self.user.profile_picture.path, self.user.profile_picture_thumbnail.path]
+        self.upload(profile_picture=make_image_upload(image_format="PNG", name="new.png"))
+        self.process()
+        self.assertFalse(any(os.path.exists(path) for path in old_paths))
+
+    def test_worker_process_pool(self):
+        self.upload(
+            profile_picture=make_image_upload(),
+            sslc_marksheet=SimpleUploadedFile("sslc.pdf", b"%PDF-1.4 marks"),
+        )
+        self.process(processes=2)
+        self.assertEqual(set(UploadTask.objects.values_list("status", flat=True)), {"done"})
+        self.assertTrue(self.user.profile_picture_thumbnail)
+        self.assertTrue(self.user.sslc_marksheet.name.endswith(".pdf"))
+
+    def test_older_upload_finishing_last_does_not_replace_newer_one(self):
+        self.upload(profile_picture=make_image_upload(name="old.jpg"))
+        self.upload(profile_picture=make_image_upload(name="new.png", image_format="PNG"))
+        older, newer = claim()
+        with tempfile.TemporaryDirectory() as workdir:
+            results = {task.pk: process_file(task.field, task.source.path, workdir) for task in (older, newer)}
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(_finish(newer, results[newer.pk]), "done")
+            self.user.refresh_from_db()
+            kept = self.user.profile_picture.name
+            with self.captureOnCommitCallbacks(execute=True):
+                self.assertEqual(_finish(older, results[older.pk]), "superseded")
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_picture.name, kept)
+        self.assertTrue(os.path.exists(self.user.profile_picture.path))
+        self.assertFalse(os.path.exists(older.source.path))
+        self.assertNotContains(self.client.get(reverse("profile")), "is being processed")
+
+    @override_settings(UPLOAD_MAX_IMAGE_SIZE=1024)
+    def test_oversized_upload_is_refused_by_the_request(self):
+        self.upload(profile_picture=make_image_upload(), qualification="M.Sc")
+        self.assertFalse(UploadTask.objects.exists())
+        self.assertFalse(os.listdir(self.media_root))
+        self.user.refresh_from_db()
+        self.assertIsNone(self.user.qualification)
+
+    def test_invalid_uploads_fail_without_touching_the_profile(self):
+        self.upload(
+            profile_picture=SimpleUploadedFile("fake.jpg", b"not an image"),
+            sslc_marksheet=SimpleUploadedFile("marks.pdf", b"<html><script></script>"),
+            hss_marksheet=SimpleUploadedFile("hss.pdf", b"%PDF-1.4 << /OpenAction << /S /JavaScript >> >>"),
+        )
+        self.process()
+        self.assertEqual(set(UploadTask.objects.values_list("status", flat=True)), {"failed"})
+        self.assertFalse(self.user.profile_picture or self.user.sslc_marksheet or self.user.hss_marksheet)
+        self.assertContains(self.client.get(reverse("profile")), "was not accepted")
+        self.assertFalse(os.listdir(os.path.join(self.media_root, "uploads", "pending")))
+
+    def test_marksheet_scan_is_reencoded(self):
+        self.upload(hss_marksheet=make_image_upload(name="hss.jpg"))
+        self.process()
+        with PILImage.open(self.user.hss_marksheet.path) as scan:
+            self.assertEqual(scan.size, (800, 600))
+            self.assertFalse(scan.getexif())
+
+    @override_settings(UPLOAD_TASK_TIMEOUT=60, UPLOAD_TASK_MAX_ATTEMPTS=2)
+    def test_stale_tasks_are_requeued_then_failed(self):
+        self.upload(profile_picture=make_image_upload())
+        long_ago = timezone.now() - timedelta(minutes=5)
+        UploadTask.objects.update(status="processing", started_at=long_ago, attempts=1)
+        self.assertEqual(requeue_stale(), 1)
+        self.assertEqual(UploadTask.objects.get().status, "queued")
+        UploadTask.objects.update(status="processing", started_at=long_ago, attempts=2)
+        requeue_stale()
+        self.assertEqual(UploadTask.objects.get().status, "failed")
+
+    def test_move_legacy_media_relocates_files_saved_before_media_root(self):
+        legacy = tempfile.TemporaryDirectory()
+        self.addCleanup(legacy.cleanup)
+        os.makedirs(os.path.join(legacy.name, "profiles"))
+        with open(os.path.join(legacy.name, "profiles", "old.png"), "wb") as picture:
+            picture.write(make_image_upload(image_format="PNG").read())
+        User.objects.filter(pk=self.user.pk).update(profile_picture="profiles/old.png", sslc_marksheet="sslc_marksheets/gone.pdf")
+
+        err = StringIO()
+        call_command("move_legacy_media", "--source", legacy.name, stdout=StringIO(), stderr=err)
+        self.user.refresh_from_db()
+        self.assertEqual(self.user.profile_picture.name, "profiles/old.png")
+        self.assertTrue(os.path.exists(os.path.join(self.media_root, "profiles", "old.png")))
+        self.assertFalse(os.path.exists(os.path.join(legacy.name, "profiles", "old.png")))
+        self.assertIn("Missing sslc_marksheets/gone.pdf", err.getvalue())
+
+    def test_build_thumbnails_backfills_existing_pictures(self):
+        self.user.profile_picture.save("legacy.png", make_image_upload(image_format="PNG"), save=True)
+        call_command("build_thumbnails", stdout=StringIO())
+        self.user.refresh_from_db()
+        with PILImage.open(self.user.profile_picture_thumbnail.path) as thumbnail:
+            self.assertEqual(thumbnail.size, (160, 160))
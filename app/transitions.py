@@ -0,0 +1,146 @@
+# transitions.py
+
+from collections import defaultdict
+from typing import Dict, Iterable, Mapping, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Q
+
+from app.application_counters import adjust_counters_bulk
+from app.caching import bump_institution_version
+from app.models import JobApplication, JobShortlist
+from app.notifications import application_status_changed
+
+# Current status -> statuses an institution may move it to. Hiring is final.
+ALLOWED_TRANSITIONS = {
+    "pending": {"shortlisted", "hired", "rejected"},
+    "shortlisted": {"pending", "hired", "rejected"},
+    "rejected": {"pending", "shortlisted"},
+    "hired": set(),
+}
+
+
+class TransitionError(ValueError):
+    """Raised with every rejected application id; nothing was changed."""
+
+    def __init__(self, errors: Dict[int, str]):
+        self.errors = errors
+        super().__init__("; ".join(f"application {pk}: {reason}" for pk, reason in sorted(errors.items())))
+
+
+# ----------------------------
+# Shortlist membership
+# ----------------------------
+# Bulk paths write the M2M through table directly, which skips m2m_changed,
+# so they bump the institution's dashboard version themselves.
+
+def _update_shortlists(institution_id: int, add: Iterable[Tuple[int, int]], remove: Iterable[Tuple[int, int]]) -> None:
+    """Add/remove (job_id, user_id) pairs on the institution's shortlists."""
+    through = JobShortlist.users.through
+    add, remove = set(add), set(remove)
+    if remove:
+        users_by_job = defaultdict(set)
+        for job_id, user_id in remove:
+            users_by_job[job_id].add(user_id)
+        pairs = Q()
+        for job_id, user_ids in users_by_job.items():
+            pairs |= Q(jobshortlist__job_id=job_id, user_id__in=user_ids)
+        through.objects.filter(pairs, jobshortlist__institution_id=institution_id).delete()
+    if add:
+        job_ids = {job_id for job_id, _user_id in add}
+        shortlists = {}
+        rows = JobShortlist.objects.filter(job_id__in=job_ids, institution_id=institution_id).order_by("-id")
+        for shortlist_id, job_id in rows.values_list("id", "job_id"):
+            shortlists[job_id] = shortlist_id  # oldest wins
+        created = JobShortlist.objects.bulk_create([
+            JobShortlist(job_id=job_id, institution_id=institution_id)
+            for job_id in job_ids - shortlists.keys()
+        ])
+        shortlists.update((shortlist.job_id, shortlist.pk) for shortlist in created)
+        through.objects.bulk_create(
+            [through(jobshortlist_id=shortlists[job_id], user_id=user_id) for job_id, user_id in add],
+            ignore_conflicts=True,
+        )
+    if add or remove:
+        transaction.on_commit(lambda: bump_institution_version(institution_id))
+
+
+def set_shortlist(institution_id: int, job_id: int, user_ids: Iterable[int]) -> Dict[str, int]:
+    """
+    Make `user_ids` the shortlist of one job with a bulk insert and a single
+    DELETE, rather than .add()/.remove() per user.
+    """
+    wanted = set(user_ids)
+    with transaction.atomic():
+        current = set(
+            JobShortlist.users.through.objects.filter(
+                jobshortlist__job_id=job_id, jobshortlist__institution_id=institution_id,
+            ).values_list("user_id", flat=True)
+        )
+        added, removed = wanted - current, current - wanted
+        _update_shortlists(
+            institution_id,
+            add=((job_id, user_id) for user_id in added),
+            remove=((job_id, user_id) for user_id in removed),
+        )
+    return {"added": len(added), "removed": len(removed)}
+
+
+# ----------------------------
+# Status transitions
+# ----------------------------
+def transition_applications(institution_id: int, targets: Mapping[int, str]) -> Dict[str, int]:
+    """
+    Move the institution's applications to new statuses, `targets` mapping
+    application id -> status. Either every move is allowed and all are
+    applied in one transaction, or TransitionError is raised and none are.
+
+    Writes one UPDATE per target status, adjusts the status counters in
+    bulk, keeps shortlists in step (applicants moved to "shortlisted" join
+    the job's shortlist, those moved out leave it) and publishes a single
+    status-change event for the notifications. Returns moves per status.
+    """
+    targets = {int(pk): status for pk, status in targets.items()}
+    with transaction.atomic():
+        rows = (
+            JobApplication.objects.select_for_update()
+            .filter(id__in=list(targets), institution_id=institution_id)
+            .values_list("id", "applicant_id", "job_id", "status")
+        )
+        current = {pk: (applicant_id, job_id, status) for pk, applicant_id, job_id, status in rows}
+
+        errors = {}
+        for pk, status in targets.items():
+            if pk not in current:
+                errors[pk] = "not found"
+            elif status not in ALLOWED_TRANSITIONS:
+                errors[pk] = f"unknown status {status!r}"
+            elif status != current[pk][2] and status not in ALLOWED_TRANSITIONS[current[pk][2]]:
+                errors[pk] = f"cannot move from {current[pk][2]} to {status}"
+        if errors:
+            raise TransitionError(errors)
+
+        moved = defaultdict(list)
+        joined: Set[Tuple[int, int]] = set()
+        left: Set[Tuple[int, int]] = set()
+        for pk, (applicant_id, job_id, old_status) in current.items():
+            status = targets[pk]
+            if status == old_status:
+                continue
+            moved[status].append(pk)
+            if status == "shortlisted":
+                joined.add((job_id, applicant_id))
+            elif old_status == "shortlisted":
+                left.add((job_id, applicant_id))
+
+        for status, ids in moved.items():
+            JobApplication.objects.filter(id__in=ids).update(status=status)
+        adjust_counters_bulk(
+            (applicant_id, job_id, old_status, targets[pk])
+            for pk, (applicant_id, job_id, old_status) in current.items()
+        )
+        _update_shortlists(institution_id, add=joined, remove=left)
+        application_status_changed(pk for ids in moved.values() for pk in ids)
+        if moved:
+            transaction.on_commit(lambda: bump_institution_version(institution_id))
+    return {status: len(ids) for status, ids in moved.items()}
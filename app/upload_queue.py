@@ -0,0 +1,196 @@
+# upload_queue.py
+
+import logging
+import os
+import tempfile
+import uuid
+from collections import Counter
+from concurrent.futures import Executor, as_completed
+from datetime import timedelta
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.core.files import File
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from app.models import UploadTask, User
+from app.uploads import UPLOAD_FIELDS, process_file, size_limit, validate_upload_size
+
+logger = logging.getLogger(__name__)
+
+UPLOAD_BATCH_SIZE = 20
+
+
+# ----------------------------
+# Queueing
+# ----------------------------
+# The request only streams the raw file to storage and records a task;
+# `manage.py process_uploads` does the rest (app/uploads.py process_file).
+
+def validate_uploads(files) -> None:
+    """
+    Check the size of every profile upload in `files` (request.FILES);
+    raises ValidationError for the first one over its limit.
+    """
+    for field in UPLOAD_FIELDS:
+        if field in files:
+            validate_upload_size(files[field], size_limit(field))
+
+
+def queue_uploads(user: User, files) -> List[UploadTask]:
+    """
+    Store every profile upload in `files` (request.FILES) for the upload
+    worker. Only sizes are checked here; nothing is stored unless every
+    file is within its limit.
+    """
+    validate_uploads(files)
+    uploads = {field: files[field] for field in UPLOAD_FIELDS if field in files}
+    tasks = []
+    for field, upload in uploads.items():
+        task = UploadTask(user=user, field=field, original_name=upload.name[:255])
+        extension = os.path.splitext(upload.name)[1].lower()[:10]
+        task.source.save(uuid.uuid4().hex + extension, upload, save=False)
+        task.save()
+        tasks.append(task)
+    return tasks
+
+
+def upload_states(user: User) -> Dict[str, UploadTask]:
+    """
+    The latest task per field when it is still running or was rejected,
+    for the profile page.
+    """
+    latest = {}
+    recent = user.upload_tasks.only("id", "user_id", "field", "status", "error", "original_name").order_by("-id")
+    for task in recent[:20]:
+        latest.setdefault(task.field, task)
+    return {field: task for field, task in latest.items() if task.status not in ("done", "superseded")}
+
+
+# ----------------------------
+# Claiming
+# ----------------------------
+# Workers claim tasks with a conditional UPDATE (still "queued"), so several
+# can share the table without row locks. A task left in "processing" by a
+# worker that died is requeued after UPLOAD_TASK_TIMEOUT seconds and failed
+# once it has been tried UPLOAD_TASK_MAX_ATTEMPTS times.
+
+def requeue_stale() -> int:
+    now = timezone.now()
+    stale = UploadTask.objects.filter(
+        status="processing", started_at__lt=now - timedelta(seconds=settings.UPLOAD_TASK_TIMEOUT),
+    )
+    exhausted = stale.filter(attempts__gte=settings.UPLOAD_TASK_MAX_ATTEMPTS)
+    for task in exhausted.only("id", "source"):
+        task.source.delete(save=False)
+    failed = exhausted.update(status="failed", error="Processing did not finish; please upload again.", finished_at=now)
+    return failed + stale.update(status="queued", claimed_by="")
+
+
+def claim(limit: int = UPLOAD_BATCH_SIZE) -> List[UploadTask]:
+    token = uuid.uuid4().hex
+    ids = list(UploadTask.objects.filter(status="queued").order_by("id").values_list("id", flat=True)[:limit])
+    if not ids:
+        return []
+    UploadTask.objects.filter(id__in=ids, status="queued").update(
+        status="processing", claimed_by=token, started_at=timezone.now(), attempts=F("attempts") + 1,
+    )
+    return list(UploadTask.objects.filter(id__in=ids, status="processing", claimed_by=token).order_by("id"))
+
+
+# ----------------------------
+# Processing
+# ----------------------------
+def _local_path(task: UploadTask, workdir: str) -> str:
+    """A local path to the raw upload, copied in chunks for remote storage."""
+    try:
+        return task.source.path
+    except NotImplementedError:
+        fd, path = tempfile.mkstemp(suffix=os.path.splitext(task.source.name)[1], dir=workdir)
+        with os.fdopen(fd, "wb") as local, task.source.open("rb") as remote:
+            for chunk in remote.chunks():
+                local.write(chunk)
+        return path
+
+
+def _finish(task: UploadTask, result: Dict) -> str:
+    """
+    Store the processed files on the user and close the task, in one
+    transaction. Replaced files and the raw upload are deleted on commit.
+    A task finishing after a newer upload for the same field is marked
+    superseded instead, so its files never replace the newer ones.
+    Returns the task's final status.
+    """
+    remove = [task.source.name]
+    with transaction.atomic():
+        claimed = UploadTask.objects.select_for_update().filter(
+            pk=task.pk, status="processing", claimed_by=task.claimed_by,
+        )
+        if not claimed.exists():
+            return "requeued"  # timed out and handed to another worker
+
+        # Lock the user first so finishes for one user run one at a time.
+        user = User.objects.select_for_update().get(pk=task.user_id)
+        task.finished_at = timezone.now()
+        newer = UploadTask.objects.filter(user_id=task.user_id, field=task.field, status="done", id__gt=task.pk)
+        if newer.exists():
+            # A later upload for this field finished first; keep its files.
+            task.status = "superseded"
+        elif "error" in result:
+            task.status, task.error = "failed", result["error"]
+        else:
+            fields = list(result["files"])
+            for field, path in result["files"].items():
+                field_file = getattr(user, field)
+                remove.append(field_file.name)
+                with open(path, "rb") as output:
+                    field_file.save(uuid.uuid4().hex + os.path.splitext(path)[1], File(output), save=False)
+            user.save(update_fields=fields)
+            task.status, task.checksum = "done", result["checksum"]
+        task.save(update_fields=["status", "error", "checksum", "finished_at"])
+
+        storage = task.source.storage
+        transaction.on_commit(lambda: [storage.delete(name) for name in remove if name])
+    return task.status
+
+
+def _crashed(task: UploadTask) -> Dict:
+    logger.exception("Processing upload task %s failed", task.pk)
+    return {"error": "This file could not be processed."}
+
+
+def process_pending(executor: Optional[Executor] = None, batch_size: int = UPLOAD_BATCH_SIZE) -> Counter:
+    """
+    Claim up to `batch_size` queued tasks and run process_file() for them on
+    `executor` (the worker's process pool), or inline without one. Returns
+    the number of tasks per final status.
+    """
+    requeue_stale()
+    counts = Counter()
+    tasks = claim(batch_size)
+    if not tasks:
+        return counts
+
+    with tempfile.TemporaryDirectory(prefix="omeiat-uploads-") as workdir:
+        futures = {}
+        for task in tasks:
+            try:
+                path = _local_path(task, workdir)
+                if executor is not None:
+                    futures[executor.submit(process_file, task.field, path, workdir)] = task
+                    continue
+                result = process_file(task.field, path, workdir)
+            except Exception:
+                result = _crashed(task)
+            counts[_finish(task, result)] += 1
+
+        for future in as_completed(futures):
+            task = futures[future]
+            try:
+                result = future.result()
+            except Exception:
+                result = _crashed(task)
+            counts[_finish(task, result)] += 1
+    return counts
@@ -0,0 +1,256 @@
+# uploads.py
+
+import hashlib
+import os
+import re
+import uuid
+from tempfile import SpooledTemporaryFile, mkstemp
+from typing import Dict, Tuple
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.files import File
+from PIL import Image, ImageOps, UnidentifiedImageError, features
+
+IMAGE_FORMATS = {"JPEG", "PNG", "WEBP", "GIF"}
+DOCUMENT_EXTENSIONS = {".pdf", ".jpg", ".jpeg", ".png", ".webp"}
+DOCUMENT_FIELDS = ("sslc_marksheet", "hss_marksheet", "consolidated_college_marksheet")
+UPLOAD_FIELDS = ("profile_picture", *DOCUMENT_FIELDS)
+CHUNK_SIZE = 1024 * 1024
+# Encoded output stays in memory up to this size, then spills to a temp file.
+SPOOL_SIZE = 1024 * 1024
+
+
+# ----------------------------
+# Validation
+# ----------------------------
+# Model field validators for admin and ModelForm uploads. Uploads over
+# FILE_UPLOAD_MAX_MEMORY_SIZE are already on disk by the time they get here,
+# so checking never loads them into memory. Files already in storage were
+# checked when uploaded and are skipped. Profile uploads are checked by the
+# upload worker instead (process_file() below).
+
+def validate_upload_size(upload, limit: int) -> None:
+    if upload.size > limit:
+        raise ValidationError(
+            f"File is too large ({upload.size // 1024} KB); the limit is {limit // 1024} KB.",
+            code="file_too_large",
+        )
+
+
+def size_limit(field: str) -> int:
+    return settings.UPLOAD_MAX_IMAGE_SIZE if field == "profile_picture" else settings.UPLOAD_MAX_DOCUMENT_SIZE
+
+
+def validate_image_upload(upload) -> None:
+    if getattr(upload, "_committed", False):
+        return
+    validate_upload_size(upload, settings.UPLOAD_MAX_IMAGE_SIZE)
+    _open_image(upload)  # only the header is read; closing it would close the upload
+
+
+def validate_document_upload(upload) -> None:
+    if getattr(upload, "_committed", False):
+        return
+    validate_upload_size(upload, settings.UPLOAD_MAX_DOCUMENT_SIZE)
+    extension = os.path.splitext(upload.name)[1].lower()
+    if extension not in DOCUMENT_EXTENSIONS:
+        raise ValidationError(
+            f"Unsupported file type {extension or '(none)'}; upload a PDF or an image.",
+            code="invalid_extension",
+        )
+    if extension == ".pdf":
+        upload.seek(0)
+        if upload.read(5) != b"%PDF-":
+            raise ValidationError("This file is not a valid PDF.", code="invalid_pdf")
+        upload.seek(0)
+    else:
+        _open_image(upload)
+
+
+# ----------------------------
+# Image processing
+# ----------------------------
+def _open_image(upload, bound: int = 0) -> Image.Image:
+    """
+    Open an upload with Pillow without decoding it. With `bound`, JPEGs are
+    decoded at the smallest scale still covering bound x bound pixels.
+    """
+    upload.seek(0)
+    try:
+        image = Image.open(upload)
+    except (UnidentifiedImageError, OSError, Image.DecompressionBombError):
+        raise ValidationError("Upload a valid JPEG, PNG, WebP or GIF image.", code="invalid_image")
+    if image.format not in IMAGE_FORMATS:
+        image.close()
+        raise ValidationError("Upload a valid JPEG, PNG, WebP or GIF image.", code="invalid_image")
+    if image.width * image.height > settings.UPLOAD_MAX_IMAGE_PIXELS:
+        image.close()
+        raise ValidationError("Image dimensions are too large.", code="image_too_large")
+    if bound:
+        image.draft("RGB", (bound, bound))
+    return image
+
+
+def _output_format() -> Tuple[str, str]:
+    if settings.THUMBNAIL_FORMAT == "WEBP" and features.check("webp"):
+        return "WEBP", ".webp"
+    return "JPEG", ".jpg"
+
+
+def _prepare(image: Image.Image, image_format: str) -> Image.Image:
+    """Apply EXIF orientation and convert to a mode the output format takes."""
+    image = ImageOps.exif_transpose(image)
+    has_alpha = image.mode in ("RGBA", "LA") or "transparency" in image.info
+    if has_alpha and image_format == "WEBP":
+        return image.convert("RGBA")
+    if has_alpha:
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", image.size, "white")
+        background.paste(rgba, mask=rgba.getchannel("A"))
+        return background
+    return image.convert("RGB")
+
+
+def _encode(image: Image.Image, image_format: str) -> File:
+    """
+    Re-encode `image`. No exif/icc/xmp is passed to save(), so the output
+    carries no metadata from the upload (camera, GPS and so on).
+    """
+    buffer = SpooledTemporaryFile(max_size=SPOOL_SIZE)
+    image.save(buffer, image_format, quality=settings.THUMBNAIL_QUALITY, optimize=image_format == "JPEG")
+    buffer.seek(0)
+    return File(buffer)
+
+
+def _store(field_file, name: str, content: File) -> None:
+    # Storage backends read `content` in chunks while writing.
+    try:
+        field_file.save(name, content, save=False)
+    finally:
+        content.close()
+
+
+def _write(image: Image.Image, image_format: str, extension: str, workdir: str) -> str:
+    # As in _encode(), nothing from the upload's metadata is written.
+    fd, path = mkstemp(suffix=extension, dir=workdir)
+    with os.fdopen(fd, "wb") as output:
+        image.save(output, image_format, quality=settings.THUMBNAIL_QUALITY, optimize=image_format == "JPEG")
+    return path
+
+
+# ----------------------------
+# Sniffing and checksums
+# ----------------------------
+SIGNATURES = (
+    (b"%PDF-", "pdf"),
+    (b"\xff\xd8\xff", "jpeg"),
+    (b"\x89PNG\r\n\x1a\n", "png"),
+    (b"GIF87a", "gif"),
+    (b"GIF89a", "gif"),
+)
+# PDF features that run code or carry other files. Names inside compressed
+# object streams are not seen; this is a cheap screen, not a virus scanner.
+ACTIVE_PDF_CONTENT = re.compile(rb"/(?:JavaScript|JS|Launch|EmbeddedFiles?|RichMedia)(?![A-Za-z])")
+
+
+def sniff(path: str) -> str:
+    """The file's real format from its first bytes, whatever its name says."""
+    with open(path, "rb") as upload:
+        head = upload.read(16)
+    for signature, kind in SIGNATURES:
+        if head.startswith(signature):
+            return kind
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "webp"
+    raise ValidationError("Unrecognised file format; upload a PDF or a JPEG, PNG, WebP or GIF image.", code="unknown_format")
+
+
+def checksum(path: str, kind: str) -> str:
+    """
+    SHA-256 of the file, read in chunks. PDFs are screened for active
+    content in the same pass.
+    """
+    digest = hashlib.sha256()
+    overlap = b""
+    with open(path, "rb") as upload:
+        while chunk := upload.read(CHUNK_SIZE):
+            digest.update(chunk)
+            if kind == "pdf" and ACTIVE_PDF_CONTENT.search(overlap + chunk):
+                raise ValidationError("PDFs with scripts, actions or attachments are not accepted.", code="active_pdf")
+            overlap = chunk[-32:]
+    return digest.hexdigest()
+
+
+# ----------------------------
+# Post-processing
+# ----------------------------
+# Runs in the upload worker's process pool (app/upload_queue.py): it takes
+# and returns file paths only and never touches the database.
+
+def _process_picture(path: str, workdir: str) -> Dict[str, str]:
+    bound = settings.PROFILE_PICTURE_MAX_DIMENSION
+    size = settings.AVATAR_THUMBNAIL_SIZE
+    image_format, extension = _output_format()
+    with open(path, "rb") as upload, _open_image(upload, bound=bound) as original:
+        image = _prepare(original, image_format)
+    picture = image.copy()
+    picture.thumbnail((bound, bound), Image.LANCZOS)
+    thumbnail = ImageOps.fit(image, (size, size), Image.LANCZOS)
+    return {
+        "profile_picture": _write(picture, image_format, extension, workdir),
+        "profile_picture_thumbnail": _write(thumbnail, image_format, extension, workdir),
+    }
+
+
+def _process_scan(path: str, workdir: str) -> str:
+    image_format, extension = _output_format()
+    with open(path, "rb") as upload, _open_image(upload) as original:
+        image = _prepare(original, image_format)
+    return _write(image, image_format, extension, workdir)
+
+
+def process_file(field: str, path: str, workdir: str) -> Dict:
+    """
+    Check the raw upload at `path` for `field` and write what should be
+    stored into `workdir`: a capped, metadata-free picture plus its square
+    AVATAR_THUMBNAIL_SIZE thumbnail, a re-encoded scan, or the PDF itself.
+    Returns {"checksum": ..., "files": {model field: path}}, or {"error":
+    message} for uploads that must be rejected.
+    """
+    try:
+        if os.path.getsize(path) > size_limit(field):
+            raise ValidationError(f"File is too large; the limit is {size_limit(field) // 1024} KB.")
+        kind = sniff(path)
+        digest = checksum(path, kind)
+        if field == "profile_picture":
+            if kind == "pdf":
+                raise ValidationError("Upload a valid JPEG, PNG, WebP or GIF image.")
+            files = _process_picture(path, workdir)
+        elif kind == "pdf":
+            files = {field: path}
+        else:
+            files = {field: _process_scan(path, workdir)}
+    except ValidationError as exc:
+        return {"error": " ".join(exc.messages)}
+    return {"checksum": digest, "files": files}
+
+
+# ----------------------------
+# Backfill
+# ----------------------------
+def build_thumbnail(user) -> bool:
+    """
+    Create the avatar thumbnail for a picture stored before thumbnails
+    existed. Returns False if the stored file is missing or unreadable.
+    """
+    image_format, extension = _output_format()
+    size = settings.AVATAR_THUMBNAIL_SIZE
+    try:
+        with user.profile_picture.open("rb") as stored, _open_image(stored, bound=size) as original:
+            thumbnail = ImageOps.fit(_prepare(original, image_format), (size, size), Image.LANCZOS)
+    except (OSError, ValidationError):
+        return False
+    _store(user.profile_picture_thumbnail, uuid.uuid4().hex + extension, _encode(thumbnail, image_format))
+    user.save(update_fields=["profile_picture_thumbnail"])
+    return True
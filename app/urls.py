@@ -1,31 +1,58 @@
-from django.urls import path
+from django.urls import include, path
 from django.contrib.auth import views as auth_views
-from django.views.generic import TemplateView
 from app.views.job import jobs as job_views
-from app.views.dashboard.dashboard import dashboard_view, latest_jobs_views
+from app.views.dashboard.dashboard import dashboard_view, institution_dashboard, latest_jobs_views
+from app.views.notification import notifications as notification_views
+from app.views.metrics import metrics as metrics_views
+from app.views.api import viewsets as api_views
+from rest_framework.routers import DefaultRouter
 from app.views.authentication.authentication import (
     user_login,
     user_logout,
     update_user,
+    profile_view,
     register_user,
     institution_register,
     institution_login,
     institution_logout
 )
 
+api_router = DefaultRouter()
+api_router.register("jobs", api_views.JobViewSet, basename="api-job")
+api_router.register("institutions", api_views.InstitutionViewSet, basename="api-institution")
+api_router.register("applications", api_views.JobApplicationViewSet, basename="api-application")
+api_router.register("notifications", api_views.NotificationViewSet, basename="api-notification")
+
 urlpatterns = [
     # Dashboard / Home
     path("", dashboard_view, name="home"),
 
     # Job-related URLs
     path("jobs/", job_views.job_list, name="jobs"),
+    path("jobs/search/", job_views.search_jobs, name="job_search"),
     path("jobs_detail/<int:job_id>/", job_views.get_job_detail, name="job_detail"),
     path("apply_job/<int:job_id>/", job_views.apply_job, name="apply_job"),
     path("applied_jobs/", job_views.get_applied_jobs, name="applied_jobs"),
     path("withdraw/<int:application_id>/", job_views.withdraw_application, name="withdraw_application"),
+    path("jobs/<int:job_id>/applicants.<str:fmt>", job_views.export_applicants, name="export_applicants"),
+
+    # Institution job management
+    path("institution/dashboard/", institution_dashboard, name="institution_dashboard"),
+    path("institution/jobs/", job_views.institution_jobs, name="institution_jobs"),
+    path("institution/jobs/new/", job_views.create_job, name="job_create"),
+    path("institution/jobs/<int:job_id>/edit/", job_views.update_job, name="job_edit"),
+    path("institution/jobs/<int:job_id>/delete/", job_views.delete_job, name="job_delete"),
+    path("institution/jobs/<int:job_id>/candidates/", job_views.job_candidates, name="job_candidates"),
+    path("institution/jobs/<int:job_id>/applicants/", job_views.job_applicants, name="job_applicants"),
+    path("institution/applications/status/", job_views.update_application_statuses, name="application_status_bulk"),
+
+    # Notifications
+    path("notifications/", notification_views.notification_list, name="notifications"),
+    path("notifications/unread/", notification_views.unread_count, name="notifications_unread"),
+    path("notifications/read-all/", notification_views.mark_all_notifications_read, name="notifications_read_all"),
 
     # Profile
-    path("profile/", TemplateView.as_view(template_name="profile.html"), name="profile"),
+    path("profile/", profile_view, name="profile"),
     path("update_profile/", update_user, name="update_profile"),
 
     # Authentication
@@ -35,4 +62,11 @@ urlpatterns = [
     path("ins-register/", institution_register, name="institution_register"),
     path("ins-login/", institution_login, name="institution_login"),
     path("ins-logout/", institution_logout, name="institution_logout"),
+
+    # Performance metrics (staff or METRICS_TOKEN)
+    path("metrics/", metrics_views.prometheus_metrics, name="metrics"),
+    path("metrics/summary/", metrics_views.metrics_summary, name="metrics_summary"),
+
+    # REST API (app/views/api)
+    path("api/", include(api_router.urls)),
 ]
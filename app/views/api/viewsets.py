@@ -0,0 +1,146 @@
+from django.db import IntegrityError, transaction
+from rest_framework import mixins, permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from app.models import Institution, Job, JobApplication, Notification
+from app.notifications import mark_all_read
+from app.serializers import (
+    ApplySerializer,
+    InstitutionDetailSerializer,
+    InstitutionSerializer,
+    JobApplicationSerializer,
+    JobDetailSerializer,
+    JobSerializer,
+    NotificationSerializer,
+    sparse_columns,
+)
+
+
+# ----------------------------
+# Shared behaviour
+# ----------------------------
+class SparseQuerysetMixin:
+    """
+    Load only the columns the response will contain (after `?fields=`),
+    joining a related table only when one of its columns is requested.
+    `ordering` is the cursor ordering, so those columns are always loaded.
+    """
+    detail_serializer_class = None
+    ordering = ("-id",)
+
+    def read_serializer_class(self):
+        if self.action == "retrieve" and self.detail_serializer_class:
+            return self.detail_serializer_class
+        return self.serializer_class
+
+    def get_serializer_class(self):
+        return self.read_serializer_class()
+
+    def get_queryset(self):
+        serializer = self.read_serializer_class()(context=self.get_serializer_context())
+        columns = sparse_columns(serializer) | {field.lstrip("-") for field in self.ordering}
+        related = {column.split("__", 1)[0] for column in columns if "__" in column}
+        queryset = super().get_queryset()
+        if related:
+            queryset = queryset.select_related(*related)
+        return queryset.only(*columns)
+
+
+# ----------------------------
+# Jobs
+# ----------------------------
+class JobViewSet(SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet):
+    """Open jobs, newest first. Filters: ?institution=<id>, ?category=."""
+    queryset = Job.objects.all()
+    serializer_class = JobSerializer
+    detail_serializer_class = JobDetailSerializer
+    permission_classes = [permissions.AllowAny]
+    ordering = ("-timestamp", "-id")
+
+    def get_queryset(self):
+        jobs = super().get_queryset().open()
+        params = self.request.query_params
+        if params.get("institution", "").isdigit():
+            jobs = jobs.filter(posted_by_id=params["institution"])
+        if params.get("category"):
+            jobs = jobs.filter(category=params["category"])
+        return jobs
+
+
+# ----------------------------
+# Institutions
+# ----------------------------
+class InstitutionViewSet(SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet):
+    queryset = Institution.objects.all()
+    serializer_class = InstitutionSerializer
+    detail_serializer_class = InstitutionDetailSerializer
+    permission_classes = [permissions.AllowAny]
+    ordering = ("id",)
+
+
+# ----------------------------
+# Applications (the signed-in applicant's own)
+# ----------------------------
+class JobApplicationViewSet(SparseQuerysetMixin,
+                            mixins.ListModelMixin,
+                            mixins.RetrieveModelMixin,
+                            mixins.CreateModelMixin,
+                            mixins.DestroyModelMixin,
+                            viewsets.GenericViewSet):
+    """
+    POST {"job": <id>} applies; DELETE withdraws. Filter: ?status=.
+    """
+    queryset = JobApplication.objects.all()
+    serializer_class = JobApplicationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    ordering = ("-applied_at", "-id")
+
+    def get_serializer_class(self):
+        if self.action == "create":
+            return ApplySerializer
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        applications = super().get_queryset().filter(applicant=self.request.user)
+        if self.request.query_params.get("status"):
+            applications = applications.filter(status=self.request.query_params["status"])
+        return applications
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = serializer.validated_data["job"]
+        # Same rule as the apply_job view: the unique constraint rejects duplicates.
+        try:
+            with transaction.atomic():
+                application = JobApplication.objects.create(
+                    applicant=request.user, job=job, institution_id=job.posted_by_id,
+                )
+        except IntegrityError:
+            raise ValidationError({"job": ["You have already applied for this job."]})
+        application = self.get_queryset().get(pk=application.pk)
+        return Response(JobApplicationSerializer(application).data, status=status.HTTP_201_CREATED)
+
+
+# ----------------------------
+# Notifications
+# ----------------------------
+class NotificationViewSet(SparseQuerysetMixin, viewsets.ReadOnlyModelViewSet):
+    """The signed-in user's notifications. Filter: ?unread=1."""
+    queryset = Notification.objects.all()
+    serializer_class = NotificationSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    ordering = ("-created_at", "-id")
+
+    def get_queryset(self):
+        notifications = super().get_queryset().filter(recipient=self.request.user)
+        if self.request.query_params.get("unread") in ("1", "true"):
+            notifications = notifications.filter(is_read=False)
+        return notifications
+
+    @action(detail=False, methods=["post"], url_path="read-all")
+    def read_all(self, request):
+        changed = mark_all_read(request.user)
+        return Response({"unread": 0, "marked": changed})
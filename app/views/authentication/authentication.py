@@ -1,9 +1,12 @@
 from django.contrib.auth import authenticate, login, logout
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
-from django.contrib.auth.hashers import check_password, make_password
+from django.contrib.auth.hashers import make_password
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.utils.http import url_has_allowed_host_and_scheme
+from app import institution_auth, upload_queue
 from app.models import Institution
 User = get_user_model()
 
@@ -68,6 +71,14 @@ def register_user(request):
     return render(request, "register.html")
 
 
+# ----------------------------
+# USER PROFILE
+# ----------------------------
+def profile_view(request):
+    upload_states = upload_queue.upload_states(request.user) if request.user.is_authenticated else {}
+    return render(request, "profile.html", {"upload_states": upload_states})
+
+
 # ----------------------------
 # UPDATE USER PROFILE
 # ----------------------------
@@ -75,6 +86,13 @@ def register_user(request):
 def update_user(request):
     if request.method == "POST":
         user = request.user
+        # Refuse oversized files before anything is saved, so a rejected
+        # upload leaves the rest of the form unsaved too.
+        try:
+            upload_queue.validate_uploads(request.FILES)
+        except ValidationError as exc:
+            messages.error(request, " ".join(exc.messages))
+            return redirect("profile")
 
         editable_fields = [
             "username", "spouse_name", "dob", "mother_tongue", "address",
@@ -89,27 +107,13 @@ def update_user(request):
                 value = request.POST.get(field)
                 setattr(user, field, value if value != "" else None)
 
-        if "profile_picture" in request.FILES:
-            user.profile_picture = request.FILES["profile_picture"]
-
-        # Profile completion %
-        exclude_fields = [
-            "id", "password", "last_login", "is_superuser", "is_staff", "is_active",
-            "date_joined", "groups", "user_permissions",
-            "profile_percentage", "profile_visibility", "is_deleted", "timestamp", "email"
-        ]
-        model_fields = [f.name for f in user._meta.get_fields() if hasattr(f, "attname")]
-        total_fields, filled_fields = 0, 0
-
-        for field_name in model_fields:
-            if field_name not in exclude_fields:
-                total_fields += 1
-                value = getattr(user, field_name, None)
-                if value not in [None, "", 0]:
-                    filled_fields += 1
+        user.save()  # recomputes profile_percentage
 
-        user.profile_percentage = int((filled_fields / total_fields) * 100) if total_fields > 0 else 0
-        user.save()
+        # Uploads are only stored here; `manage.py process_uploads` checks,
+        # re-encodes and thumbnails them (app/upload_queue.py).
+        queued = upload_queue.queue_uploads(user, request.FILES)
+        if queued:
+            messages.info(request, "Your files are being processed and will appear shortly.")
 
         messages.success(request, f"Profile updated successfully! ({user.profile_percentage}% complete)")
         return redirect("profile")
@@ -169,21 +173,17 @@ def institution_register(request):
 # ----------------------------
 def institution_login(request):
     if request.method == "POST":
-        email = request.POST.get("email").lower()
-        password = request.POST.get("password")
-
-        try:
-            institution = Institution.objects.get(email=email)
-            if check_password(password, institution.password):
-                # Save institution info in session
-                request.session["institution_id"] = institution.id
-                request.session["institution_name"] = institution.name
-                messages.success(request, f"Welcome back, {institution.name}!")
-                return redirect("institution_dashboard")
-            else:
-                messages.error(request, "Invalid email or password.")
-        except Institution.DoesNotExist:
-            messages.error(request, "Invalid email or password.")
+        institution = institution_auth.authenticate(
+            request, email=request.POST.get("email", ""), password=request.POST.get("password", ""),
+        )
+        if institution is not None:
+            institution_auth.login(request, institution)
+            messages.success(request, f"Welcome back, {institution.name}!")
+            next_url = request.GET.get("next")
+            if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+                next_url = "institution_dashboard"
+            return redirect(next_url)
+        messages.error(request, "Invalid email or password.")
 
     return render(request, "institution_login_form.html")
 
@@ -192,6 +192,6 @@ def institution_login(request):
 # INSTITUTION LOGOUT
 # ----------------------------
 def institution_logout(request):
-    request.session.flush()
+    institution_auth.logout(request)
     messages.success(request, "You have been logged out successfully.")
     return redirect("home")
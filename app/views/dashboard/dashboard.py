@@ -3,6 +3,13 @@ from django.shortcuts import render, redirect
 from django.contrib.auth.decorators import login_required
 from app.models import JobApplication, Job
 from django.utils import timezone
+from app.caching import LISTING_CACHE_TIMEOUT, cached_jobs_value, jobs_cache_key
+from app.pagination import paginate_keyset
+from app.institution_auth import institution_required
+from app.pipeline import institution_pipeline
+from app.recommendations import recommended_jobs
+
+HOME_JOBS_LIMIT = 12
 
 from django.db.models import Count
 from django.shortcuts import render
@@ -18,65 +25,51 @@ def dashboard_view(request):
         'rejected': 0
     }
     profile_completion = 0
+    recommended = []
 
     if request.user.is_authenticated:
-        # 1. Application status counts
-        status_counts = (
-            JobApplication.objects
-            .filter(applicant=request.user)
-            .values('status')
-            .annotate(count=Count('id'))
-        )
+        # 1. Application status counts (maintained on write, see app/signals.py)
+        status_map.update(request.user.application_status_counts)
 
-        for entry in status_counts:
-            key = entry['status']
-            if key in status_map:
-                status_map[key] = entry['count']
+        # 2. Profile completion (maintained by User.save())
+        profile_completion = request.user.profile_percentage
 
-        # 2. Profile completion
-        profile_completion = calculate_profile_completion(request.user)
+        # 3. Precomputed recommendations (app/recommendations.py)
+        recommended = recommended_jobs(request.user)
 
-        # Update profile_percentage only for authenticated users
-        if hasattr(request.user, 'profile_percentage') and request.user.profile_percentage != profile_completion:
-            request.user.profile_percentage = profile_completion
-            request.user.save(update_fields=['profile_percentage'])
-    
     context = {
         'labels': list(map(str.capitalize, status_map.keys())),
         'data': list(status_map.values()),
         'completion': profile_completion,
         'jobs': jobs,
+        'recommended_jobs': recommended,
+        'cache_timeout': LISTING_CACHE_TIMEOUT,
     }
+    if not request.user.is_authenticated:
+        # Anonymous cards carry no per-user state (no CSRF token), so the
+        # rendered grid can be shared between visitors.
+        context['cards_key'] = jobs_cache_key('home')
     return render(request, 'dashboard.html', context)
 
 
 
-def calculate_profile_completion(user):
-    exclude_fields = [
-        'id', 'password', 'last_login', 'is_superuser',
-        'username', 'email', 'is_staff', 'is_active',
-        'date_joined', 'groups', 'user_permissions',
-        'profile_percentage', 'profile_visibility',
-        'is_deleted', 'timestamp'
-    ]
-
-    model_fields = user._meta.get_fields()
-    total_fields = 0
-    filled_count = 0
-
-    for field in model_fields:
-        if hasattr(field, 'attname'):
-            field_name = field.attname
-            if field_name not in exclude_fields:
-                total_fields += 1
-                value = getattr(user, field_name, None)
-                if value not in [None, '', 0]:
-                    filled_count += 1
-
-    return int((filled_count / total_fields) * 100) if total_fields > 0 else 0
+def latest_jobs_views(request):
+    # The home page only ever shows the first page; the rest lives on /jobs/.
+    return cached_jobs_value(
+        ('home',),
+        lambda: paginate_keyset(Job.objects.open().cards(), None, HOME_JOBS_LIMIT),
+    )
 
 
-def latest_jobs_views(request):
-    today = timezone.localdate()
-    jobs = Job.objects.filter(is_active=True, application_deadline__gte=today).order_by("-timestamp")
-    return jobs
+# ----------------------------
+# Institution dashboard
+# ----------------------------
+@institution_required
+def institution_dashboard(request):
+    # Per-job applicant pipeline, one query per cache miss (app/pipeline.py).
+    pipeline = institution_pipeline(request.institution.pk)
+    return render(request, 'institution_dashboard.html', {
+        'pipeline_jobs': pipeline['jobs'],
+        'totals': pipeline['totals'],
+        'today': timezone.localdate(),
+    })
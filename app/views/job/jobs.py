@@ -1,32 +1,88 @@
 from django.utils import timezone
-from datetime import datetime
 from django.shortcuts import redirect, render, get_object_or_404
-from django.http import HttpResponseRedirect
+from django.db import IntegrityError, transaction
+from django.http import Http404, HttpResponseRedirect, StreamingHttpResponse
 from django.urls import reverse
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
 from django.core.paginator import Paginator
+from django.utils.http import url_has_allowed_host_and_scheme
+from django.views.decorators.http import require_POST
 from app.models import Job, JobApplication, Institution
 from app.form import JobForm   # <-- we will create this form
+from app import notifications
+from app.institution_auth import institution_required
+from app.exports import EXPORT_FORMATS, applications_for_export, iter_application_rows
+from app.conditional import (
+    conditional_page,
+    job_detail_etag,
+    job_detail_last_modified,
+    listing_etag,
+    listing_last_modified,
+)
+from app.caching import LISTING_CACHE_TIMEOUT, cached_jobs_value, jobs_cache_key
+from app.facets import apply_filters, facet_groups, parse_filters
+from app.matching import rank_candidates
+from app.pagination import paginate_keyset
+from app.search import search_jobs as run_job_search
+from app.transitions import TransitionError, transition_applications
+
+JOBS_PER_PAGE = 20
+CANDIDATES_PER_JOB = 20
+APPLICANTS_PER_PAGE = 25
 
 
 # ----------------------------
 # Job Listing
 # ----------------------------
+@conditional_page(listing_etag, listing_last_modified)
 def job_list(request):
-    today = timezone.localdate()
-    jobs = Job.objects.filter(is_active=True, application_deadline__gte=today).order_by(
-        "-timestamp"
+    filters = parse_filters(request.GET)
+    cursor = request.GET.get("cursor")
+    # Listing data and the rendered cards are shared by every visitor, so both
+    # are cached per filter set and cursor until the job table changes.
+    cache_parts = ("job_list", sorted(filters.items()), cursor)
+    page = cached_jobs_value(
+        cache_parts,
+        lambda: paginate_keyset(
+            apply_filters(Job.objects.open().cards(), filters), cursor, JOBS_PER_PAGE
+        ),
     )
-    return render(request, "jobs.html", {"jobs": jobs})
+
+    params = request.GET.copy()
+    params.pop("cursor", None)
+    context = {
+        "jobs": page,
+        "page": page,
+        "facets": facet_groups(filters),
+        "filter_query": params.urlencode(),
+        "cards_key": jobs_cache_key(*cache_parts),
+        "cache_timeout": LISTING_CACHE_TIMEOUT,
+    }
+    return render(request, "jobs.html", context)
+
+
+# ----------------------------
+# Job Search
+# ----------------------------
+@conditional_page(listing_etag, listing_last_modified)
+def search_jobs(request):
+    query = request.GET.get("q", "").strip()
+    try:
+        page_number = int(request.GET.get("page", 1))
+    except ValueError:
+        page_number = 1
+    page = run_job_search(query, page_number)
+    return render(request, "jobs.html", {"jobs": page, "page": page, "query": query})
 
 
 # ----------------------------
 # Job Detail
 # ----------------------------
+@conditional_page(job_detail_etag, job_detail_last_modified)
 def get_job_detail(request, job_id):
-    job = get_object_or_404(Job, id=job_id, is_active=True)
+    job = get_object_or_404(Job.objects.select_related("posted_by"), id=job_id, is_active=True)
     return render(request, "job_detail.html", {"job": job})
 
 
@@ -35,21 +91,22 @@ def get_job_detail(request, job_id):
 # ----------------------------
 @login_required
 def apply_job(request, job_id):
-    job = get_object_or_404(Job, id=job_id, is_active=True)
+    # posted_by_id is all the application needs; no need to fetch the Institution.
+    job = get_object_or_404(Job.objects.only("id", "posted_by_id"), id=job_id, is_active=True)
     if request.method == "POST":
-        # Check if the user has already applied for this job
-        if JobApplication.objects.filter(applicant=request.user, job=job).exists():
+        # The (applicant, job) unique constraint rejects duplicates, including
+        # concurrent double-submits, without a separate exists() check.
+        try:
+            with transaction.atomic():
+                JobApplication.objects.create(
+                    applicant=request.user,
+                    job=job,
+                    institution_id=job.posted_by_id,
+                )
+        except IntegrityError:
             messages.error(request, "You have already applied for this job.")
             return HttpResponseRedirect(reverse("job_detail", args=[job_id]))
 
-        # Create a new job application
-        application = JobApplication(
-            applicant=request.user,
-            job=job,
-            institution=job.posted_by,
-            applied_at=datetime.now(),
-        )
-        application.save()
         messages.success(request, "Your application has been submitted successfully.")
         return redirect("applied_jobs")
 
@@ -62,7 +119,7 @@ def apply_job(request, job_id):
 @login_required
 def get_applied_jobs(request):
     status_filter = request.GET.get("status", "")
-    applications = JobApplication.objects.filter(applicant=request.user).order_by(
+    applications = JobApplication.objects.listing().filter(applicant=request.user).order_by(
         "-applied_at"
     )
 
@@ -95,45 +152,42 @@ def withdraw_application(request, application_id):
 
 
 # ----------------------------
-# Institution Dashboard (list jobs posted by institution)
+# Institution Jobs (list jobs posted by institution)
 # ----------------------------
-
+@institution_required
 def institution_jobs(request):
-
-    jobs = Job.objects.filter(posted_by=request.user.institution).order_by("-timestamp")
-    return jobs
+    jobs = Job.objects.filter(posted_by=request.institution).cards().order_by("-timestamp", "-id")
+    return render(request, "institution_jobs/job_list.html", {"jobs": jobs})
 
 
 # ----------------------------
 # Create Job (Institution only)
 # ----------------------------
-@login_required
+@institution_required
 def create_job(request):
-    if not hasattr(request.user, "institution"):  # only institutions
-        raise PermissionDenied("Only institutions can post jobs.")
-        redirect('institution_login')
-
     if request.method == "POST":
         form = JobForm(request.POST)
         if form.is_valid():
             job = form.save(commit=False)
-            job.posted_by = request.user.institution
+            job.posted_by = request.institution
             job.timestamp = timezone.now()
             job.save()
+            if job.is_active:
+                notifications.job_posted(job)
             messages.success(request, "Job posted successfully.")
             return redirect("institution_jobs")
     else:
         form = JobForm()
 
-    return render(request, "jobs/create_job.html", {"form": form})
+    return render(request, "institution_jobs/job_form.html", {"form": form})
 
 
 # ----------------------------
 # Update Job (Institution only)
 # ----------------------------
-@login_required
+@institution_required
 def update_job(request, job_id):
-    job = get_object_or_404(Job, id=job_id, posted_by=request.user.institution)
+    job = get_object_or_404(Job, id=job_id, posted_by=request.institution)
 
     if request.method == "POST":
         form = JobForm(request.POST, instance=job)
@@ -144,19 +198,99 @@ def update_job(request, job_id):
     else:
         form = JobForm(instance=job)
 
-    return render(request, "jobs/update_job.html", {"form": form, "job": job})
+    return render(request, "institution_jobs/job_form.html", {"form": form, "job": job})
 
 
 # ----------------------------
 # Delete Job (Institution only)
 # ----------------------------
-@login_required
+@institution_required
 def delete_job(request, job_id):
-    job = get_object_or_404(Job, id=job_id, posted_by=request.user.institution)
+    job = get_object_or_404(Job.objects.only("id", "posted_by_id"), id=job_id, posted_by=request.institution)
 
     if request.method == "POST":
         job.delete()
         messages.success(request, "Job deleted successfully.")
-        return redirect("institution_jobs")
+    return redirect("institution_jobs")
+
+
+# ----------------------------
+# Matching Candidates (Institution only)
+# ----------------------------
+@institution_required
+def job_candidates(request, job_id):
+    job = get_object_or_404(Job, id=job_id, posted_by=request.institution)
+    # Scored against every visible profile (app/matching.py); people who
+    # already applied are left out, they are in the applications list.
+    candidates = rank_candidates(job, k=CANDIDATES_PER_JOB, exclude_applicants=True)
+    return render(request, "institution_jobs/candidates.html", {"job": job, "candidates": candidates})
+
 
-    return render(request, "jobs/delete_job.html", {"job": job})
+# ----------------------------
+# Job Applicants (Institution only)
+# ----------------------------
+@institution_required
+def job_applicants(request, job_id):
+    job = get_object_or_404(Job.objects.only("id", "name", "post", "posted_by_id"), id=job_id, posted_by=request.institution)
+    status_filter = request.GET.get("status", "")
+    applications = (
+        JobApplication.objects.filter(job=job)
+        .select_related("applicant")
+        .only("id", "status", "applied_at", "applicant__id", "applicant__username",
+              "applicant__first_name", "applicant__last_name", "applicant__qualification",
+              "applicant__working_experience_years")
+        .order_by("-applied_at", "-id")
+    )
+    if status_filter:
+        applications = applications.filter(status=status_filter)
+
+    paginator = Paginator(applications, APPLICANTS_PER_PAGE)
+    context = {
+        "job": job,
+        "page_obj": paginator.get_page(request.GET.get("page")),
+        "status_filter": status_filter,
+        "status_choices": JobApplication.STATUS_CHOICES,
+    }
+    return render(request, "institution_jobs/applicants.html", context)
+
+
+# ----------------------------
+# Bulk Application Status (Institution only)
+# ----------------------------
+@institution_required
+@require_POST
+def update_application_statuses(request):
+    status = request.POST.get("status", "")
+    application_ids = [int(pk) for pk in request.POST.getlist("application") if pk.isdigit()]
+    try:
+        moved = transition_applications(request.institution.pk, {pk: status for pk in application_ids})
+    except TransitionError as exc:
+        messages.error(request, f"No applications were updated. {exc}")
+    else:
+        messages.success(request, f"{sum(moved.values())} application(s) moved to {status}.")
+
+    next_url = request.POST.get("next")
+    if not url_has_allowed_host_and_scheme(next_url, allowed_hosts={request.get_host()}):
+        next_url = "institution_dashboard"
+    return redirect(next_url)
+
+
+# ----------------------------
+# Export Applicants (Institution only)
+# ----------------------------
+def export_applicants(request, job_id, fmt="csv"):
+    job = get_object_or_404(Job.objects.only("id", "posted_by_id"), id=job_id)
+    if getattr(request.institution, "pk", None) != job.posted_by_id and not request.user.is_staff:
+        raise PermissionDenied("Only the posting institution can export applicants.")
+    if fmt not in EXPORT_FORMATS:
+        raise Http404("Unknown export format.")
+
+    # Rows are read, encoded and sent chunk by chunk; the full export is
+    # never built in memory, whatever the number of applicants.
+    encode, content_type = EXPORT_FORMATS[fmt]
+    response = StreamingHttpResponse(
+        encode(iter_application_rows(applications_for_export(job.id))),
+        content_type=content_type,
+    )
+    response["Content-Disposition"] = f'attachment; filename="job-{job.id}-applicants.{fmt}"'
+    return response
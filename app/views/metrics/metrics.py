@@ -0,0 +1,34 @@
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
+from django.utils.crypto import constant_time_compare
+from django.views.decorators.cache import never_cache
+
+from app.metrics import registry
+
+
+# ----------------------------
+# Metrics endpoints
+# ----------------------------
+# Staff users can read them in the browser; a Prometheus scraper sends
+# "Authorization: Bearer <METRICS_TOKEN>".
+
+def _allowed(request):
+    if request.user.is_authenticated and request.user.is_staff:
+        return True
+    token = getattr(settings, "METRICS_TOKEN", "")
+    header = request.headers.get("Authorization", "")
+    return bool(token) and constant_time_compare(header, f"Bearer {token}")
+
+
+@never_cache
+def prometheus_metrics(request):
+    if not _allowed(request):
+        return HttpResponse(status=403)
+    return HttpResponse(registry.prometheus(), content_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@never_cache
+def metrics_summary(request):
+    if not _allowed(request):
+        return HttpResponse(status=403)
+    return JsonResponse({"views": registry.summary()})
@@ -0,0 +1,56 @@
+from django.contrib import messages
+from django.contrib.auth.decorators import login_required
+from django.http import JsonResponse
+from django.shortcuts import redirect, render
+from django.utils.cache import patch_cache_control
+from django.views.decorators.http import condition, require_POST
+
+from app.models import Notification
+from app.notifications import mark_all_read
+
+NOTIFICATIONS_PER_PAGE = 50
+
+
+# ----------------------------
+# Notification list
+# ----------------------------
+@login_required
+def notification_list(request):
+    notifications = (
+        Notification.objects.filter(recipient=request.user)
+        .only("id", "notification_type", "message", "url", "is_read", "created_at")
+        .order_by("-created_at")[:NOTIFICATIONS_PER_PAGE]
+    )
+    return render(request, "notification.html", {"notifications": notifications})
+
+
+# ----------------------------
+# Unread count (polled by the navbar badge)
+# ----------------------------
+def _unread_etag(request):
+    # The count lives on the user row the auth middleware already loaded,
+    # so answering a poll - 304 or not - costs no extra query.
+    if not request.user.is_authenticated:
+        return None
+    return f"{request.user.pk}-{request.user.unread_notifications}"
+
+
+@login_required
+@condition(etag_func=_unread_etag)
+def unread_count(request):
+    response = JsonResponse({"unread": request.user.unread_notifications})
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+# ----------------------------
+# Mark all read
+# ----------------------------
+@login_required
+@require_POST
+def mark_all_notifications_read(request):
+    changed = mark_all_read(request.user)
+    if request.headers.get("Accept", "").startswith("application/json"):
+        return JsonResponse({"unread": 0, "marked": changed})
+    messages.success(request, "All notifications marked as read.")
+    return redirect("notifications")
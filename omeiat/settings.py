@@ -41,12 +41,15 @@ INSTALLED_APPS = [
 # Middleware
 # ----------------------
 MIDDLEWARE = [
+    'app.middleware.PerformanceMiddleware',  # per-view timing/query stats, see app/metrics.py
+    'app.middleware.QueryInspectorMiddleware',  # N+1 and slow query logging, see app/query_inspector.py
     'django.middleware.security.SecurityMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',  # static files for production
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'app.middleware.InstitutionMiddleware',  # request.institution, see app/institution_auth.py
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
@@ -82,6 +85,20 @@ TEMPLATES = [
 # ----------------------
 AUTH_USER_MODEL = 'app.User'
 AUTHENTICATION_BACKENDS = ['django.contrib.auth.backends.ModelBackend']
+# Institutions sign in through app/institution_auth.py, not these backends.
+# Their identity is cached in the session and re-checked this often (seconds).
+INSTITUTION_SESSION_REVALIDATE = config("INSTITUTION_SESSION_REVALIDATE", default=300, cast=int)
+
+# PBKDF2 work factor for new hashes; stored hashes are re-encoded at this
+# cost on the next login. Lower it where login latency matters more.
+PASSWORD_HASH_ITERATIONS = config("PASSWORD_HASH_ITERATIONS", default=1_000_000, cast=int)
+PASSWORD_HASHERS = [
+    'app.hashers.PBKDF2PasswordHasher',
+    'django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher',
+    'django.contrib.auth.hashers.Argon2PasswordHasher',
+    'django.contrib.auth.hashers.BCryptSHA256PasswordHasher',
+    'django.contrib.auth.hashers.ScryptPasswordHasher',
+]
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/login/'
 LOGIN_URL = '/login/'
@@ -96,6 +113,66 @@ DATABASES = {
         ssl_require=True
     )
 }
+# ----------------------
+# Cache (local memory by default; CACHE_BACKEND=file|redis for shared caches)
+# ----------------------
+CACHE_BACKENDS = {
+    "locmem": "django.core.cache.backends.locmem.LocMemCache",
+    "file": "django.core.cache.backends.filebased.FileBasedCache",
+    "redis": "django.core.cache.backends.redis.RedisCache",
+}
+CACHE_BACKEND = config("CACHE_BACKEND", default="locmem")
+CACHE_LOCATION_DEFAULTS = {
+    "locmem": "omeiat",
+    "file": str(BASE_DIR / ".cache"),
+    "redis": "redis://127.0.0.1:6379/1",
+}
+CACHES = {
+    "default": {
+        "BACKEND": CACHE_BACKENDS[CACHE_BACKEND],
+        "LOCATION": config("CACHE_LOCATION", default=CACHE_LOCATION_DEFAULTS[CACHE_BACKEND]),
+        "TIMEOUT": config("CACHE_TIMEOUT", default=300, cast=int),
+        "KEY_PREFIX": "omeiat",
+    }
+}
+
+# ----------------------
+# Background tasks (in-process thread pool; "sync" runs them inline)
+# ----------------------
+BACKGROUND_TASKS = config("BACKGROUND_TASKS", default="thread")
+BACKGROUND_TASK_WORKERS = config("BACKGROUND_TASK_WORKERS", default=2, cast=int)
+
+# ----------------------
+# Performance metrics (app/middleware.py; served at /metrics/)
+# ----------------------
+PERFORMANCE_METRICS = config("PERFORMANCE_METRICS", default=True, cast=bool)
+PERFORMANCE_SLOW_REQUEST_MS = config("PERFORMANCE_SLOW_REQUEST_MS", default=500, cast=int)
+METRICS_TOKEN = config("METRICS_TOKEN", default="")
+
+# ----------------------
+# Query inspector (app/query_inspector.py)
+# ----------------------
+# Fraction of requests checked for repeated and slow queries (0 disables,
+# e.g. 0.01 in production). STRICT raises instead of logging; the tests use it.
+QUERY_INSPECTOR_SAMPLE_RATE = config("QUERY_INSPECTOR_SAMPLE_RATE", default=1.0 if DEBUG else 0.0, cast=float)
+QUERY_INSPECTOR_SLOW_MS = config("QUERY_INSPECTOR_SLOW_MS", default=100, cast=int)
+QUERY_INSPECTOR_DUPLICATE_THRESHOLD = config("QUERY_INSPECTOR_DUPLICATE_THRESHOLD", default=3, cast=int)
+QUERY_INSPECTOR_STRICT = config("QUERY_INSPECTOR_STRICT", default=False, cast=bool)
+
+# ----------------------
+# Tests (fast password hashing, no slow-request log; see app/test_runner.py)
+# ----------------------
+TEST_RUNNER = "app.test_runner.OmeiatTestRunner"
+
+# ----------------------
+# REST API (app/views/api)
+# ----------------------
+REST_FRAMEWORK = {
+    "DEFAULT_PAGINATION_CLASS": "app.pagination.ApiCursorPagination",
+    "DEFAULT_RENDERER_CLASSES": ["rest_framework.renderers.JSONRenderer"]
+    + (["rest_framework.renderers.BrowsableAPIRenderer"] if DEBUG else []),
+}
+
 # ----------------------
 # Password Validation
 # ----------------------
@@ -124,6 +201,27 @@ STATIC_ROOT = BASE_DIR / "staticfiles"    # production (Render)
 # Enable WhiteNoise for static file compression & caching
 STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 
+# ----------------------
+# Uploads (app/uploads.py)
+# ----------------------
+MEDIA_URL = '/media/'
+# Files uploaded before MEDIA_ROOT was set live under BASE_DIR (profiles/...);
+# `manage.py move_legacy_media` moves them here.
+MEDIA_ROOT = config("MEDIA_ROOT", default=str(BASE_DIR / "media"))
+# Larger uploads are streamed to a temporary file instead of held in memory.
+FILE_UPLOAD_MAX_MEMORY_SIZE = 512 * 1024
+UPLOAD_MAX_IMAGE_SIZE = config("UPLOAD_MAX_IMAGE_SIZE", default=5 * 1024 * 1024, cast=int)
+UPLOAD_MAX_DOCUMENT_SIZE = config("UPLOAD_MAX_DOCUMENT_SIZE", default=10 * 1024 * 1024, cast=int)
+UPLOAD_MAX_IMAGE_PIXELS = 40_000_000
+PROFILE_PICTURE_MAX_DIMENSION = 1024
+AVATAR_THUMBNAIL_SIZE = 160  # square; covers the 150px profile preview and 2x navbar avatars
+THUMBNAIL_FORMAT = config("THUMBNAIL_FORMAT", default="WEBP")  # JPEG if Pillow lacks WebP
+THUMBNAIL_QUALITY = 85
+# Upload worker (`manage.py process_uploads`, app/upload_queue.py).
+UPLOAD_WORKER_PROCESSES = config("UPLOAD_WORKER_PROCESSES", default=2, cast=int)
+UPLOAD_TASK_TIMEOUT = 60 * 10  # seconds in "processing" before a task is requeued
+UPLOAD_TASK_MAX_ATTEMPTS = 3
+
 # ----------------------
 # Messages
 # ----------------------
@@ -173,6 +271,12 @@ LOGGING = {
     "disable_existing_loggers": False,
     "handlers": {"console": {"class": "logging.StreamHandler"}},
     "root": {"handlers": ["console"], "level": "WARNING"},
+    "loggers": {
+        # One JSON object per slow request.
+        "app.performance": {"handlers": ["console"], "level": "INFO", "propagate": False},
+        # Repeated (N+1) and slow queries, with the code and template that ran them.
+        "app.queries": {"handlers": ["console"], "level": "INFO", "propagate": False},
+    },
 }
 
 # ----------------------